@@ -0,0 +1,89 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+
+from app.core.tools import logger
+
+
+class Subscription:
+    """Bounded mailbox of one subscriber.
+
+    When a slow consumer lets the mailbox fill up, its backlog is dropped and
+    replaced by a single `{"type": "resync"}` message: the client should
+    refetch the full state instead of replaying stale deltas.
+    """
+
+    def __init__(self, topic: str, maxsize: int):
+        self.topic = topic
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, message: dict) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait({"type": "resync"})
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Next message, or None when `timeout` seconds pass without one."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InProcessBroker:
+    """Topic pub/sub between coroutines of a single worker process.
+
+    Any object exposing the same `publish(topic, message)` coroutine and
+    `subscribe(topic)` async context manager (yielding something with an
+    async `get(timeout)`) can be installed with `set_broker`, e.g. a
+    Redis/Postgres LISTEN-backed broker when running several workers.
+    """
+
+    def __init__(self, queue_size: int = 256):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    async def publish(self, topic: str, message: dict) -> int:
+        subscribers = list(self._subscribers.get(topic, ()))
+        for sub in subscribers:
+            sub.deliver(message)
+        return len(subscribers)
+
+    @asynccontextmanager
+    async def subscribe(self, topic: str) -> AsyncIterator[Subscription]:
+        sub = Subscription(topic, self.queue_size)
+        self._subscribers.setdefault(topic, set()).add(sub)
+        try:
+            yield sub
+        finally:
+            subs = self._subscribers.get(topic)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[topic]
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._subscribers.get(topic, ()))
+
+
+_broker = InProcessBroker()
+
+
+def get_broker():
+    return _broker
+
+
+def set_broker(broker) -> None:
+    global _broker
+    _broker = broker
+
+
+async def publish(topic: str, message: dict) -> None:
+    """Publish without letting a broker failure break the caller's write path."""
+    try:
+        await _broker.publish(topic, message)
+    except Exception:
+        logger.exception(f"Failed to publish event on {topic}")
@@ -8,6 +8,8 @@ from app.models import (
 )
 
 from app.services import BanquetService
+from app.services.item_stock import ItemStockService
+from app.services.type_relation import compatibility_matrix
 from app.models import Service
 from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime, timedelta, timezone
@@ -58,6 +60,7 @@ async def seed_spirit_type_relations(session: AsyncSession):
             )
             session.add(type_relation)
     await session.commit()
+    compatibility_matrix.invalidate()
 
 
 async def seed_private_venue(venues: int, session: AsyncSession):
@@ -69,10 +72,9 @@ async def seed_private_venue(venues: int, session: AsyncSession):
 
 
 async def seed_banquet(tables: int, session: AsyncSession):
-    # Placeholder for seeding banquet data if needed in the future
-    for _ in range(tables):
-        await BanquetService.create_table(BanquetTableCreate(), session)
-    await session.commit()
+    await BanquetService.create_tables(
+        [BanquetTableCreate() for _ in range(tables)], session
+    )
 
 
 startTime = datetime.now()
@@ -357,6 +359,7 @@ async def seed_inventory_orders(session: AsyncSession):
             redeemed=(idx % 3 != 0),  # every 3rd stays pending to simulate shortages
         )
         session.add(io)
+    await ItemStockService.rebuild(session)
     await session.commit()
 
 
@@ -375,4 +378,5 @@ async def seed_item_intakes(session: AsyncSession):
         qty = 1 + (idx % 4)  # vary consumption; some higher to stress inventory
         intake = ItemIntake(quantity=qty, itemId=item.id, serviceId=svc.id)
         session.add(intake)
+    await ItemStockService.rebuild(session)
     await session.commit()
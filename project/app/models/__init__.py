@@ -5,6 +5,14 @@ from app.models.reservation import (
     ReservationCreate,
     ReservationUpdate,
     ReservationRead,
+    ReservationPage,
+    ReservationCompactRead,
+    ReservationCompactPage,
+    ReservationTombstone,
+    ReservationChangesRead,
+    ReservationCompactChangesRead,
+    ReservationConflictRead,
+    ReservationBulkRead,
 )
 from app.models.banquet_seat import (
     BanquetSeat,
@@ -12,6 +20,9 @@ from app.models.banquet_seat import (
     BanquetSeatUpdate,
     BanquetSeatRead,
     AvailableBanquetSeatRead,
+    BanquetSeatingRequest,
+    BanquetSeatingRead,
+    SeatAssignmentRead,
 )
 from app.models.banquet_table import (
     BanquetTable,
@@ -30,8 +41,16 @@ from app.models.venue_account import (
     VenueAccountUpdate,
     VenueAccountRead,
 )
-from app.models.utils import DateRequest, DateTimeRequest, DashboardRead, ServiceSummary, ServiceWithReservations
+from app.models.utils import (
+    DateRequest,
+    DateTimeRequest,
+    DashboardRead,
+    ServiceMatch,
+    ServiceSummary,
+    ServiceWithReservations,
+)
 from app.models.item import Item, ItemCreate, ItemUpdate, ItemRead
+from app.models.item_stock import ItemStock
 from app.models.item_intake import (
     ItemIntake,
     ItemIntakeCreate,
@@ -70,6 +89,14 @@ __all__ = [
     "ReservationCreate",
     "ReservationUpdate",
     "ReservationRead",
+    "ReservationPage",
+    "ReservationCompactRead",
+    "ReservationCompactPage",
+    "ReservationTombstone",
+    "ReservationChangesRead",
+    "ReservationCompactChangesRead",
+    "ReservationConflictRead",
+    "ReservationBulkRead",
     "BanquetSeat",
     "BanquetSeatCreate",
     "BanquetSeatUpdate",
@@ -91,10 +118,14 @@ __all__ = [
     "VenueAccountRead",
     "AvailableBanquetSeatRead",
     "AvailableBanquetTableRead",
+    "BanquetSeatingRequest",
+    "BanquetSeatingRead",
+    "SeatAssignmentRead",
     "Item",
     "ItemCreate",
     "ItemUpdate",
     "ItemRead",
+    "ItemStock",
     "ItemIntake",
     "ItemIntakeCreate",
     "ItemIntakeUpdate",
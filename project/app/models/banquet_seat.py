@@ -44,6 +44,20 @@ class AvailableBanquetSeatRead(BanquetSeatRead):
     available: bool = True
 
 
+class BanquetSeatingRequest(SQLModel):
+    spiritIds: List[int]
+    datetime: str
 
 
+class SeatAssignmentRead(SQLModel):
+    spiritId: int
+    seatId: int
+    tableId: int
+    seatNumber: int
+
 
+class BanquetSeatingRead(SQLModel):
+    assignments: List[SeatAssignmentRead] = []
+    unassigned: List[int] = []
+    # False when the search budget ran out before every option was tried
+    complete: bool = True
@@ -2,9 +2,12 @@ from sqlmodel import SQLModel, Field, Relationship
 from sqlalchemy import inspect
 from typing import Optional, List, TYPE_CHECKING
 
+from app.models.item_stock import DEFAULT_LOW_STOCK_THRESHOLD
+
 if TYPE_CHECKING:
     from app.models.item_intake import ItemIntake
     from app.models.inventory_order import InventoryOrder
+    from app.models.item_stock import ItemStock
 
 
 class ItemBase(SQLModel):
@@ -22,53 +25,38 @@ class Item(ItemBase, table=True):
     intakes: List["ItemIntake"] = Relationship(back_populates="item")
     inventory_orders: List["InventoryOrder"] = Relationship(back_populates="item")
 
+    # running counter kept by ItemStockService; no row means a stock of 0
+    stock: Optional["ItemStock"] = Relationship(
+        sa_relationship_kwargs={"uselist": False, "viewonly": True}
+    )
+
     @property
     def quantity(self) -> int | None:
+        """Current quantity in stock, read from the item's `ItemStock` counter.
+
+        None when `stock` was not loaded with the item: serialization must not
+        trigger a lazy load (MissingGreenlet).
         """
-        Calculate current quantity in stock.
-        Formula: sum(inventory_order.quantity WHERE redeemed=True) - sum(item_intake.quantity)
-        Only counts inventory orders that have been redeemed (received).
-        """
-        # Avoid triggering lazy loads while Pydantic/Response serialization runs.
-        # If the necessary relationships are not already loaded, return None so the
-        # response layer doesn't attempt IO here (which causes MissingGreenlet).
-        state = inspect(self)
-        if not (state.attrs.inventory_orders.loaded and state.attrs.intakes.loaded):
+        if "stock" in inspect(self).unloaded:
             return None
+        return self.stock.quantity if self.stock is not None else 0
 
-        ordered = sum(order.quantity for order in self.inventory_orders if getattr(order, "redeemed", False))
-
-        consumed = 0
-        for intake in self.intakes:
-            # if intake is tied to a service, we need that service and its reservations
-            if getattr(intake, "serviceId", None):
-                intake_state = inspect(intake)
-                # If the service relation or its reservations aren't loaded, assume 0 reservations
-                # (i.e. no consumption) to avoid triggering lazy loads during serialization.
-                if not intake_state.attrs.service.loaded:
-                    num_res = 0
-                else:
-                    svc = intake.service
-                    svc_state = inspect(svc)
-                    if not svc_state.attrs.reservations.loaded:
-                        num_res = 0
-                    else:
-                        num_res = len(svc.reservations) or 0
-                consumed += intake.quantity * num_res
-            else:
-                # seat-based or generic intake: counts once
-                consumed += intake.quantity
-
-        return ordered - consumed
+    @property
+    def lowStockThreshold(self) -> int | None:
+        """Low-stock level kept on the item's `ItemStock` row (None like `quantity`)."""
+        if "stock" in inspect(self).unloaded or self.stock is None:
+            return None
+        return self.stock.threshold
 
 
 class ItemCreate(ItemBase):
-    pass
+    lowStockThreshold: int = Field(default=DEFAULT_LOW_STOCK_THRESHOLD, ge=0)
 
 
 class ItemUpdate(SQLModel):
     name: Optional[str] = None
     image: Optional[str] = None
+    lowStockThreshold: Optional[int] = Field(default=None, ge=0)
 
 
 class ItemRead(SQLModel):
@@ -77,3 +65,4 @@ class ItemRead(SQLModel):
     image: Optional[str] = None
     quantity: Optional[int] = None
     unit: Optional[str] = None
+    lowStockThreshold: Optional[int] = None
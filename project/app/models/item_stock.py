@@ -0,0 +1,45 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, ForeignKey, Index, Integer, text
+
+# threshold of an item created without one
+DEFAULT_LOW_STOCK_THRESHOLD = 12
+
+
+class ItemStock(SQLModel, table=True):
+    """Running stock counter of an item (migration 2e7a9c4f1b60).
+
+    quantity = redeemed inventory orders of the item
+               - seat/generic intakes of the item
+               - service intakes of the item * bookings of their service
+
+    Kept by `ItemStockService` in the same transaction as the writes that
+    change one of the terms; an item without a row has a stock of 0.
+
+    `threshold` is the item's low-stock level (migration 4b8d2f6a1c93). The
+    partial index `ix_item_stock_low` holds exactly the items with
+    quantity < threshold: the database maintains that set as the counters
+    move, and reading it costs O(alerts).
+    """
+
+    __tablename__ = "item_stock"
+    __table_args__ = (
+        Index(
+            "ix_item_stock_low",
+            "itemId",
+            postgresql_where=text("quantity < threshold"),
+            sqlite_where=text("quantity < threshold"),
+        ),
+    )
+    itemId: int = Field(
+        sa_column=Column(
+            Integer, ForeignKey("item.id", ondelete="CASCADE"), primary_key=True
+        )
+    )
+    quantity: int = Field(default=0, nullable=False)
+    # server-side default only: the ledger upserts never name the column
+    threshold: int = Field(
+        default=DEFAULT_LOW_STOCK_THRESHOLD,
+        sa_column=Column(
+            Integer, nullable=False, server_default=str(DEFAULT_LOW_STOCK_THRESHOLD)
+        ),
+    )
@@ -1,10 +1,11 @@
 
 from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 from pydantic import model_validator
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, JSON, DateTime, func
+from sqlalchemy import Column, JSON, DateTime, Index, func, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 
 from app.models.service import Service
 from app.models.banquet_seat import BanquetSeat
@@ -33,8 +34,46 @@ class ReservationBase(SQLModel):
         return values
 
 
+# half-open booked interval: back-to-back reservations do not overlap
+BOOKED_RANGE = """tstzrange("startTime", "endTime", '[)')"""
+
+
 class Reservation(ReservationBase, table=True):
     __tablename__ = "reservation"
+    __table_args__ = (
+        # service agenda / slot availability: serviceId = ? AND startTime range
+        Index("ix_reservation_serviceId_startTime", "serviceId", "startTime"),
+        # seat occupancy: seatId IN (...) AND overlapping [startTime, endTime)
+        Index("ix_reservation_seatId_startTime_endTime", "seatId", "startTime", "endTime"),
+        Index("ix_reservation_accountId", "accountId"),
+        # changes feed: (updatedAt, id) > cursor ORDER BY updatedAt, id
+        Index("ix_reservation_updatedAt_id", "updatedAt", "id"),
+        # banquet day views: seatId IS NOT NULL AND startTime range
+        Index(
+            "ix_reservation_banquet_startTime",
+            "startTime",
+            postgresql_where=text('"seatId" IS NOT NULL'),
+            sqlite_where=text('"seatId" IS NOT NULL'),
+        ),
+        # no two overlapping bookings of a seat, nor of a seatless service slot;
+        # Postgres-only (needs btree_gist), see migration 9e4b1d7c2a58. Migrated
+        # databases partition the table by startTime month (5d1e8a3c9f26): the
+        # primary key becomes (id, startTime) and each partition carries these.
+        ExcludeConstraint(
+            ("seatId", "="),
+            (text(BOOKED_RANGE), "&&"),
+            name="reservation_seat_no_overlap",
+            using="gist",
+            where=text('"seatId" IS NOT NULL'),
+        ).ddl_if(dialect="postgresql"),
+        ExcludeConstraint(
+            ("serviceId", "="),
+            (text(BOOKED_RANGE), "&&"),
+            name="reservation_service_no_overlap",
+            using="gist",
+            where=text('"seatId" IS NULL AND "serviceId" IS NOT NULL'),
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     createdAt: datetime = Field(
@@ -52,6 +91,18 @@ class Reservation(ReservationBase, table=True):
     seat: Optional["BanquetSeat"] = Relationship(back_populates="reservations")
 
 
+class ReservationTombstone(SQLModel, table=True):
+    """Id of a deleted reservation, kept for `GET /reservation/changes`."""
+
+    __tablename__ = "reservation_tombstone"
+    __table_args__ = (Index("ix_reservation_tombstone_deletedAt", "deletedAt"),)
+
+    id: str = Field(primary_key=True)
+    deletedAt: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), server_default=func.now(), nullable=False),
+    )
+
+
 class ReservationCreate(ReservationBase):
     pass
 
@@ -82,4 +133,54 @@ class ReservationRead(SQLModel):
     updatedAt: datetime
     service: Optional["Service"]
     seat: Optional["BanquetSeat"]
-    account: Optional["VenueAccountRead"]
\ No newline at end of file
+    account: Optional["VenueAccountRead"]
+
+
+class ReservationCompactRead(SQLModel):
+    id: str
+    accountId: str
+    serviceId: Optional[str]
+    seatId: Optional[int]
+    startTime: datetime
+    endTime: datetime
+    isRedeemed: bool
+    updatedAt: datetime
+
+
+class ReservationPage(SQLModel):
+    items: List[ReservationRead] = []
+    # opaque token for the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class ReservationCompactPage(SQLModel):
+    items: List[ReservationCompactRead] = []
+    next_cursor: Optional[str] = None
+
+
+class ReservationChangesRead(SQLModel):
+    # rows created or modified after the cursor, oldest change first
+    changes: List[ReservationRead] = []
+    # ids of reservations deleted after the cursor
+    deleted: List[str] = []
+    # pass back as `cursor` on the next poll
+    next_cursor: str
+    has_more: bool = False
+
+
+class ReservationCompactChangesRead(SQLModel):
+    changes: List[ReservationCompactRead] = []
+    deleted: List[str] = []
+    next_cursor: str
+    has_more: bool = False
+
+
+class ReservationConflictRead(SQLModel):
+    # position of the rejected row in the request body
+    index: int
+    detail: str
+
+
+class ReservationBulkRead(SQLModel):
+    created: List[Reservation] = []
+    conflicts: List[ReservationConflictRead] = []
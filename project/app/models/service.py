@@ -2,7 +2,7 @@ from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, List, TYPE_CHECKING
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, JSON, DateTime, func
+from sqlalchemy import Column, JSON, DateTime, Index, func
 if TYPE_CHECKING:
     from app.models.reservation import Reservation
 
@@ -31,6 +31,16 @@ class Service(ServiceBase, table=True):
     )
 
 
+# catalog search: lower(name) LIKE '%q%'; Postgres-only
+# (needs pg_trgm), see migration 8f2c6b1e4d37
+Index(
+    "ix_service_name_trgm",
+    func.lower(Service.__table__.c.name).label("name_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"name_lower": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+
 class ServiceCreate(ServiceBase):
     pass
 
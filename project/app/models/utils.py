@@ -14,6 +14,13 @@ class ServiceSummary(BaseModel):
     description: Optional[str] = None
 
 
+class ServiceMatch(BaseModel):
+    id: str
+    name: str
+    eiltRate: float
+    image: Optional[str] = None
+
+
 class ServiceWithReservations(BaseModel):
     service: ServiceSummary
     reservations_count: int
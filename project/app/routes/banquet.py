@@ -1,10 +1,12 @@
 from datetime import date, datetime, time, timedelta, timezone
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi import Query
+from fastapi.responses import StreamingResponse
 
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import List
+from typing import Dict, List
 from fastapi import Body
 from app.models.utils import DateTimeRequest
 from app.db import get_session
@@ -18,26 +20,21 @@ from app.models import (
     BanquetTableRead,
     BanquetSeatRead,
     AvailableBanquetTableRead,
+    BanquetSeatingRequest,
+    BanquetSeatingRead,
 )
-from app.services import BanquetService
+from app.services import BanquetService, TypeRelationService
 from app.core.constants import TIME_SLOTS
+from app.core.events import get_broker
+from app.core.admin_auth import verify_admin
 
 BanquetRouter = APIRouter()
 
+# Seconds between keep-alive comments on the seat stream
+SSE_KEEPALIVE_SECONDS = 15
 
-@BanquetRouter.get("/table/", response_model=List[BanquetTableRead])
-async def list_tables(session: AsyncSession = Depends(get_session)):
-    return await BanquetService.list_tables(session)
 
-
-@BanquetRouter.post(
-    "/table/available/{spirit_id}", response_model=List[AvailableBanquetTableRead]
-)
-async def list_available_seats(
-    spirit_id: int,
-    payload: DateTimeRequest = Body(...),
-    session: AsyncSession = Depends(get_session),
-):
+def _parse_slot_start(payload) -> datetime:
     s = getattr(payload, "datetime", None) or getattr(payload, "date", None)
     if not s:
         raise ValueError("missing datetime")
@@ -57,10 +54,44 @@ async def list_available_seats(
         start_dt = start_dt.replace(tzinfo=timezone.utc)
     else:
         start_dt = start_dt.astimezone(timezone.utc)
+    return start_dt
+
+
+@BanquetRouter.get("/table/", response_model=List[BanquetTableRead])
+async def list_tables(session: AsyncSession = Depends(get_session)):
+    return await BanquetService.list_tables(session)
+
 
+@BanquetRouter.post(
+    "/table/available/{spirit_id}", response_model=List[AvailableBanquetTableRead]
+)
+async def list_available_seats(
+    spirit_id: int,
+    payload: DateTimeRequest = Body(...),
+    session: AsyncSession = Depends(get_session),
+):
+    start_dt = _parse_slot_start(payload)
     return await BanquetService.list_available_seats(spirit_id, start_dt, session)
 
 
+@BanquetRouter.post("/table/assign", response_model=BanquetSeatingRead)
+async def assign_seats(
+    payload: BanquetSeatingRequest = Body(...),
+    session: AsyncSession = Depends(get_session),
+):
+    """Plan a compatible seat for every spirit of a group in one request.
+
+    Nothing is booked; the caller creates the reservations for the returned seats.
+    """
+    if len(payload.spiritIds) > BanquetService.MAX_SEATING_GROUP:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A group cannot exceed {BanquetService.MAX_SEATING_GROUP} spirits",
+        )
+    start_dt = _parse_slot_start(payload)
+    return await BanquetService.assign_seats(payload.spiritIds, start_dt, session)
+
+
 @BanquetRouter.post(
     "/table/", response_model=BanquetTableRead, status_code=status.HTTP_201_CREATED
 )
@@ -70,6 +101,24 @@ async def create_table(
     return await BanquetService.create_table(table, session)
 
 
+@BanquetRouter.post(
+    "/table/bulk",
+    response_model=List[BanquetTableRead],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_tables(
+    tables: List[BanquetTableCreate] = Body(...),
+    session: AsyncSession = Depends(get_session),
+):
+    """Provision many tables (and their seats) in a single transaction."""
+    if len(tables) > BanquetService.MAX_BULK_TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot create more than {BanquetService.MAX_BULK_TABLES} tables at once",
+        )
+    return await BanquetService.create_tables(tables, session)
+
+
 @BanquetRouter.get("/table/{table_id}", response_model=BanquetTableRead)
 async def get_table(table_id: str, session: AsyncSession = Depends(get_session)):
     t = await BanquetService.get_table(table_id, session)
@@ -104,6 +153,12 @@ async def delete_table(table_id: str, session: AsyncSession = Depends(get_sessio
     return None
 
 
+@BanquetRouter.get("/compatibility/stats")
+async def compatibility_stats(admin_payload: dict = Depends(verify_admin)):
+    """Hit/reload counters of the in-memory spirit-type compatibility matrix."""
+    return TypeRelationService.compatibility_stats()
+
+
 @BanquetRouter.get("/seat/", response_model=List[BanquetSeatRead])
 async def list_seats(
     tableId: str | None = None, session: AsyncSession = Depends(get_session)
@@ -111,6 +166,33 @@ async def list_seats(
     return await BanquetService.list_seats(tableId, session)
 
 
+@BanquetRouter.get("/seat/stream")
+async def stream_seat_changes(request: Request):
+    """Server-sent events with seat occupied/freed deltas.
+
+    Each event is named after its `type` (`seat_occupied`, `seat_freed`) and
+    carries the reservation id, seat, table, seat number and time window. A
+    `resync` event means the client fell behind and should refetch the seating
+    chart. Comment lines are sent as keep-alives.
+    """
+
+    async def event_stream():
+        async with get_broker().subscribe(BanquetService.SEAT_EVENTS_TOPIC) as sub:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                message = await sub.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @BanquetRouter.get("/seat/{seat_id}", response_model=BanquetSeatRead)
 async def get_seat(seat_id: int, session: AsyncSession = Depends(get_session)):
     s = await BanquetService.get_seat(seat_id, session)
@@ -149,3 +231,38 @@ async def available_time_slots_for_spirit(
     # Delegate computation to service function that checks all slots for the date
     slots = await BanquetService.get_available_time_slots(spirit_id, d, session)
     return slots
+
+
+@BanquetRouter.get(
+    "/{spirit_id}/available_time_slots/range", response_model=Dict[str, List[str]]
+)
+async def available_time_slots_range_for_spirit(
+    spirit_id: int,
+    start: str = Query(..., description="First date (YYYY-MM-DD)"),
+    end: str = Query(..., description="Last date, inclusive (YYYY-MM-DD)"),
+    session: AsyncSession = Depends(get_session),
+):
+    """Return a date -> available TIME_SLOTS map for every day in [start, end]."""
+    try:
+        start_d = datetime.fromisoformat(start).date()
+        end_d = datetime.fromisoformat(end).date()
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid date format. Use YYYY-MM-DD or ISO datetime.",
+        )
+
+    if end_d < start_d:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="`end` must be on or after `start`",
+        )
+    if (end_d - start_d).days + 1 > BanquetService.MAX_CALENDAR_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {BanquetService.MAX_CALENDAR_DAYS} days",
+        )
+
+    return await BanquetService.get_available_time_slots_range(
+        spirit_id, start_d, end_d, session
+    )
@@ -4,6 +4,8 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.db import get_session
 from app.models import Item, ItemCreate, ItemUpdate, ItemRead
 from app.services import ItemService
+from app.services.item_stock import ItemStockService
+from app.core.admin_auth import verify_admin
 
 ItemRouter = APIRouter()
 
@@ -19,6 +21,26 @@ async def create_item(item: ItemCreate, session: AsyncSession = Depends(get_sess
     return await ItemService.create_item(item, session)
 
 
+@ItemRouter.get("/low-stock", response_model=list[ItemRead])
+async def list_low_stock(session: AsyncSession = Depends(get_session)):
+    """Items whose stock is under their `lowStockThreshold`."""
+    return await ItemService.list_low_stock(session)
+
+
+@ItemRouter.post("/stock/rebuild")
+async def rebuild_item_stock(
+    session: AsyncSession = Depends(get_session),
+    admin_payload: dict = Depends(verify_admin),
+):
+    """Recompute every item_stock counter from orders, intakes and bookings.
+
+    Only needed after writes that bypassed the services (seeding, manual SQL).
+    """
+    items = await ItemStockService.rebuild(session)
+    await session.commit()
+    return {"items": items}
+
+
 @ItemRouter.get("/{item_id}", response_model=ItemRead)
 async def get_item(item_id: int, session: AsyncSession = Depends(get_session)):
     itm = await ItemService.get_item(item_id, session)
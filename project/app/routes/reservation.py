@@ -1,27 +1,80 @@
+from datetime import datetime
+from typing import Literal
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.db import get_session
-from app.models import Reservation, ReservationCreate, ReservationUpdate, ReservationRead
+from app.models import (
+    Reservation,
+    ReservationCreate,
+    ReservationUpdate,
+    ReservationRead,
+    ReservationCompactRead,
+    ReservationPage,
+    ReservationCompactPage,
+    ReservationChangesRead,
+    ReservationCompactChangesRead,
+    ReservationBulkRead,
+)
 from fastapi import Body, Query
 
-from app.services import ReservationService
+from app.services import ReservationService, ReservationPartitionService
+from app.services.reservation_partition import ARCHIVE_AFTER_MONTHS, PARTITION_MONTHS_AHEAD
+from app.services.reservation import (
+    DEFAULT_PAGE_SIZE,
+    MAX_BULK_RESERVATIONS,
+    MAX_PAGE_SIZE,
+)
 from app.deps.device_cookie import get_device_config, DeviceConfig
+from app.core.admin_auth import verify_admin
 
 ReservationRouter = APIRouter()
 from app.models.utils import DateRequest
 
 
-@ReservationRouter.get("/", response_model=list[ReservationRead])
+@ReservationRouter.get(
+    "/",
+    response_model=list[ReservationRead]
+    | list[ReservationCompactRead]
+    | ReservationPage
+    | ReservationCompactPage,
+)
 async def list_reservations(
     accountId: str | None = Query(None, description="Account ID"),
     serviceId: str | None = Query(None, description="Service ID"),
     datetime: str | None = Query(None, description="Date (YYYY-MM-DD)"),
+    limit: int | None = Query(
+        None,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f"Page size (default {DEFAULT_PAGE_SIZE} when paging by `cursor`)",
+    ),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page"),
+    view: Literal["full", "compact"] = Query(
+        "full", description="`compact`: flat ids and times, no nested account/service/seat"
+    ),
     session: AsyncSession = Depends(get_session),
     device_config: DeviceConfig | None = Depends(get_device_config),
 ):
+    """List reservations.
+
+    Without `limit` and `cursor` every match is returned as a plain list, as
+    before paging existed. With either of them the result is one
+    `{items, next_cursor}` page ordered by (startTime, id).
+    """
     filters = {"accountId": accountId, "serviceId": serviceId, "datetime": datetime}
-    return await ReservationService.list_reservations(filters, session)
+    read = ReservationCompactRead if view == "compact" else ReservationRead
+    if limit is None and cursor is None:
+        rows = await ReservationService.list_reservations(filters, session, view=view)
+        return [read.model_validate(r) for r in rows]
+    try:
+        items, next_cursor = await ReservationService.list_reservations_page(
+            filters, session, limit=limit or DEFAULT_PAGE_SIZE, cursor=cursor, view=view
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    page = ReservationCompactPage if view == "compact" else ReservationPage
+    return page(items=items, next_cursor=next_cursor)
 
 
 @ReservationRouter.post(
@@ -34,6 +87,22 @@ async def create_reservation(
     return response
 
 
+@ReservationRouter.post(
+    "/bulk", response_model=ReservationBulkRead, status_code=status.HTTP_201_CREATED
+)
+async def create_reservations(
+    reservations: list[ReservationCreate] = Body(...),
+    session: AsyncSession = Depends(get_session),
+):
+    """Create many reservations in one transaction, reporting rejected rows by index."""
+    if len(reservations) > MAX_BULK_RESERVATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot create more than {MAX_BULK_RESERVATIONS} reservations at once",
+        )
+    return await ReservationService.create_reservations(reservations, session)
+
+
 @ReservationRouter.post("/banquet-by-date", response_model=list[ReservationRead])
 async def get_banquet_reservations_for_date(
     payload: DateRequest = Body(...), session: AsyncSession = Depends(get_session)
@@ -55,6 +124,60 @@ async def get_banquet_reservations_for_date(
         )
 
 
+@ReservationRouter.get(
+    "/changes", response_model=ReservationChangesRead | ReservationCompactChangesRead
+)
+async def list_reservation_changes(
+    since: datetime | None = Query(None, description="Return changes made after this time (first sync)"),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous poll"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    view: Literal["full", "compact"] = Query(
+        "full", description="`compact`: flat ids and times, no nested account/service/seat"
+    ),
+    session: AsyncSession = Depends(get_session),
+):
+    """Reservations created/updated and ids deleted since the last poll."""
+    try:
+        changes, deleted, next_cursor, has_more = await ReservationService.list_changes(
+            since, session, cursor=cursor, limit=limit, view=view
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    feed = ReservationCompactChangesRead if view == "compact" else ReservationChangesRead
+    return feed(changes=changes, deleted=deleted, next_cursor=next_cursor, has_more=has_more)
+
+
+@ReservationRouter.get("/partitions")
+async def list_reservation_partitions(
+    session: AsyncSession = Depends(get_session),
+    admin_payload: dict = Depends(verify_admin),
+):
+    """Monthly partitions of the reservation table (empty when not partitioned)."""
+    return await ReservationPartitionService.list_partitions(session)
+
+
+@ReservationRouter.post("/partitions/maintain")
+async def maintain_reservation_partitions(
+    months_ahead: int = Query(PARTITION_MONTHS_AHEAD, ge=0, le=24),
+    keep_months: int = Query(ARCHIVE_AFTER_MONTHS, ge=1),
+    session: AsyncSession = Depends(get_session),
+    admin_payload: dict = Depends(verify_admin),
+):
+    """Create upcoming monthly partitions and fold old ones into the archive.
+
+    Meant to run monthly (e.g. from a scheduler); both steps are idempotent.
+    """
+    created = await ReservationPartitionService.ensure_partitions(session, months_ahead)
+    archived = await ReservationPartitionService.archive_partitions(session, keep_months)
+    return {"partitions": created, "archived": archived}
+
+
+@ReservationRouter.get("/cache/stats")
+async def reservation_cache_stats(admin_payload: dict = Depends(verify_admin)):
+    """Hit/miss/eviction counters of the day-bucketed reservation read cache."""
+    return ReservationService.cache_stats()
+
+
 @ReservationRouter.get("/{reservation_id}", response_model=ReservationRead)
 async def get_reservation(
     reservation_id: str, session: AsyncSession = Depends(get_session)
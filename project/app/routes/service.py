@@ -1,10 +1,12 @@
+from typing import Dict, List, Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.db import get_session
-from app.models import Service, ServiceCreate, ServiceUpdate, ItemIntake, Item, InventoryOrder, Reservation
+from app.models import Service, ServiceCreate, ServiceMatch, ServiceUpdate
 from app.services import ServiceService
+from app.services.service import MAX_SEARCH_LIMIT, SEARCH_LIMIT
 from fastapi import Query
 
 ServiceRouter = APIRouter()
@@ -22,6 +24,34 @@ async def create_service(
     return await ServiceService.create_service(service, session)
 
 
+@ServiceRouter.get("/search", response_model=List[ServiceMatch])
+async def search_services(
+    q: str = Query(..., min_length=1, description="Part of the service name"),
+    limit: int = Query(SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT, description="Most results"),
+    session: AsyncSession = Depends(get_session),
+):
+    """Typeahead: best-ranked services whose name matches `q`, case-insensitively."""
+    return await ServiceService.search_services(q, session, limit)
+
+
+@ServiceRouter.get("/available_time_slots", response_model=Dict[str, List[str]])
+async def available_time_slots_batch(
+    date: str = Query(..., description="Date (YYYY-MM-DD) or ISO datetime"),
+    service_id: Optional[List[str]] = Query(
+        None, description="Services to include (repeatable); all services when omitted"
+    ),
+    session: AsyncSession = Depends(get_session),
+):
+    try:
+        return await ServiceService.get_available_time_slots_batch(
+            date, session, service_id
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid date format"
+        )
+
+
 @ServiceRouter.get("/{service_id}/available_time_slots", response_model=list[str])
 async def available_time_slots(
     service_id: str,
@@ -37,6 +67,17 @@ async def available_time_slots(
     return slots
 
 
+@ServiceRouter.get("/check-availability")
+async def check_services_availability(
+    service_id: Optional[List[str]] = Query(
+        None, description="Services to check (repeatable); all services when omitted"
+    ),
+    session: AsyncSession = Depends(get_session),
+):
+    """Inventory check of many services at once: {serviceId: availability}."""
+    return await ServiceService.check_availability_batch(session, service_id)
+
+
 @ServiceRouter.get("/{service_id}/check-availability")
 async def check_service_availability(
     service_id: str,
@@ -46,104 +87,12 @@ async def check_service_availability(
     Check if a service has sufficient inventory to fulfill a reservation.
     Returns availability status and details about any insufficient items.
     """
-    # Verify service exists
-    svc = await ServiceService.get_service(service_id, session)
-    if not svc:
+    report = await ServiceService.check_availability(service_id, session)
+    if report is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Service not found"
         )
-
-    # Get all items required for this service
-    stmt = select(ItemIntake).where(ItemIntake.serviceId == service_id)
-    result = await session.execute(stmt)
-    intakes = result.scalars().all()
-
-    insufficient_items = []
-
-    for intake in intakes:
-        try:
-            # Get the item
-            item_stmt = select(Item).where(Item.id == intake.itemId)
-            item_result = await session.execute(item_stmt)
-            item = item_result.scalars().first()
-
-            if not item:
-                insufficient_items.append({
-                    "itemId": intake.itemId,
-                    "itemName": f"Unknown Item {intake.itemId}",
-                    "requiredQuantity": intake.quantity,
-                    "availableQuantity": 0,
-                })
-                continue
-
-            # Calculate quantity directly from database queries (avoiding lazy loading)
-            # Formula: sum(inventory_order.quantity WHERE redeemed=True) - sum(item_intake.quantity WHERE serviceId=this_service)
-            # We only subtract intakes for THIS service multiplied by its reservation count.
-            # Banquet seat intakes (seatId-based) are not subtracted here.
-            
-            # Get sum of redeemed inventory orders
-            order_stmt = (
-                select(func.coalesce(func.sum(InventoryOrder.quantity), 0))
-                .where(
-                    (InventoryOrder.idItem == intake.itemId) &
-                    (InventoryOrder.redeemed == True)
-                )
-            )
-            order_result = await session.execute(order_stmt)
-            ordered_qty = order_result.scalar() or 0
-            
-            # Get sum of intakes for THIS service only
-            service_intake_stmt = (
-                select(func.coalesce(func.sum(ItemIntake.quantity), 0))
-                .where(
-                    (ItemIntake.itemId == intake.itemId) &
-                    (ItemIntake.serviceId == service_id)
-                )
-            )
-            service_intake_result = await session.execute(service_intake_stmt)
-            intake_qty_per_reservation = service_intake_result.scalar() or 0
-            
-            # Get number of reservations for this service
-            reservation_stmt = (
-                select(func.count(Reservation.id))
-                .where(Reservation.serviceId == service_id)
-            )
-            reservation_result = await session.execute(reservation_stmt)
-            num_reservations = reservation_result.scalar() or 0
-            
-            # Total consumed = intake_qty * number_of_reservations
-            consumed_qty = intake_qty_per_reservation * num_reservations
-            
-            available_qty = ordered_qty - consumed_qty
-            
-            if available_qty < intake.quantity:
-                insufficient_items.append({
-                    "itemId": intake.itemId,
-                    "itemName": item.name,
-                    "requiredQuantity": intake.quantity,
-                    "availableQuantity": available_qty,
-                })
-            else:
-                pass
-        except Exception as e:
-            insufficient_items.append({
-                "itemId": intake.itemId,
-                "itemName": f"Item {intake.itemId}",
-                "requiredQuantity": intake.quantity,
-                "availableQuantity": 0,
-            })
-
-    is_available = len(insufficient_items) == 0
-    message = (
-        "All items are in stock" if is_available
-        else f"{len(insufficient_items)} item(s) have insufficient stock"
-    )
-
-    return {
-        "isAvailable": is_available,
-        "insufficientItems": insufficient_items,
-        "message": message,
-    }
+    return report
 
 
 @ServiceRouter.get("/{service_id}", response_model=Service)
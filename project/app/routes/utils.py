@@ -5,7 +5,8 @@ import os
 from app.db import get_session
 from sqlmodel import select
 import json
-from app.services import ServiceService, PrivateVenueService, BanquetService, ItemService
+from app.services import ServiceService, PrivateVenueService, BanquetService
+from app.services.item_stock import ItemStockService
 from sqlalchemy import func, distinct
 from app.models import Order, InventoryOrder
 from app.models.utils import DashboardRead
@@ -70,27 +71,9 @@ async def get_dashboard(session: AsyncSession = Depends(get_session)):
     # Compute stock alerts and pending orders; wrap in try/except so endpoint
     # always returns valid JSON even if something goes wrong.
     try:
-        # Compute stock alerts: count of items whose calculated `quantity` is below threshold
-        items = await ItemService.list_items(session)
-        STOCK_THRESHOLD = 12
-        # Coerce quantities safely and log them for debugging
-        stock_alerts = 0
-        for it in items:
-            # support both attribute access and dict-like objects
-            q = getattr(it, 'quantity', None)
-            if q is None and isinstance(it, dict):
-                q = it.get('quantity')
-            try:
-                qnum = int(q) if q is not None else 0
-            except Exception:
-                qnum = 0
-            logger.debug('dashboard item quantity', extra={
-                'item_id': getattr(it, 'id', None) or it.get('id') if isinstance(it, dict) else getattr(it, 'id', None),
-                'item_name': getattr(it, 'name', None) or (it.get('name') if isinstance(it, dict) else None),
-                'quantity': qnum,
-            })
-            if qnum < STOCK_THRESHOLD:
-                stock_alerts += 1
+        # Compute stock alerts: size of the maintained low-stock set (items
+        # under their own threshold), counted off its partial index
+        stock_alerts = await ItemStockService.count_low(session)
 
         # Compute pending orders: number of distinct orders that have at least one inventory line not redeemed
         stmt = (
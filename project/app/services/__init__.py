@@ -2,6 +2,7 @@ from app.services.banquet import BanquetService
 from app.services.employee import EmployeeService
 from app.services.files import FileService
 from app.services.reservation import ReservationService
+from app.services.reservation_partition import ReservationPartitionService
 from app.services.service import ServiceService
 from app.services.spirit import SpiritService
 from app.services.spirit_type import SpiritTypeService
@@ -20,6 +21,7 @@ __all__ = [
     "EmployeeService",
     "FileService",
     "ReservationService",
+    "ReservationPartitionService",
     "ServiceService",
     "SpiritService",
     "SpiritTypeService",
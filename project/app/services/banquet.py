@@ -1,22 +1,55 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from datetime import date, datetime, time, timedelta, timezone
 from app.core.constants import TIME_SLOTS
 from sqlmodel import select
 from sqlalchemy.orm import selectinload
+import numpy as np
 
-from app.services.spirit import SpiritService
+from app.services.repository import Repository
+from app.services.reservation_cache import reservation_cache
 from app.services.type_relation import TypeRelationService
-from app.models import BanquetTable, BanquetSeat, Reservation, VenueAccount, Spirit
-from sqlalchemy import func, exists
+from app.services.banquet_occupancy import (
+    FloorArrays,
+    SlotOccupancy,
+    TableLayout,
+    as_utc,
+    current_hour_window,
+    occupancy_index,
+    spirit_payload,
+)
+from app.models import (
+    BanquetTable,
+    BanquetSeat,
+    BanquetSeatRead,
+    BanquetTableRead,
+    Reservation,
+    VenueAccount,
+    Spirit,
+)
+from sqlalchemy import case, delete, distinct, func, exists, insert, update
 from app.core.tools import logger
+from app.core import events
 
 
-class BanquetService:
+class BanquetService(Repository[BanquetTable]):
     """Service layer for banquet-related DB operations.
 
     All methods are async and expect an `AsyncSession` passed from the caller.
     """
 
+    model = BanquetTable
+
+    # Upper bound for the availability calendar (inclusive day count)
+    MAX_CALENDAR_DAYS = 62
+    # Broker topic carrying seat occupied/freed deltas
+    SEAT_EVENTS_TOPIC = "banquet.seats"
+    # Largest number of tables accepted by one bulk provisioning request
+    MAX_BULK_TABLES = 500
+    # Largest group the batch seating endpoint accepts
+    MAX_SEATING_GROUP = 200
+    # Candidate seats the seating search may try before returning its best plan
+    MAX_SEATING_STEPS = 20000
+
     @staticmethod
     async def list_tables(session) -> List[BanquetTable]:
         res = await session.exec(
@@ -24,139 +57,435 @@ class BanquetService:
         )
         return res.all()
 
+    @staticmethod
+    async def _get_spirit_type_id(spirit_id: int, session) -> Optional[str]:
+        res = await session.exec(select(Spirit.typeId).where(Spirit.id == spirit_id))
+        return res.first()
+
+    @staticmethod
+    def _slot_arrays(
+        floor: FloorArrays,
+        occupancy: Dict[int, SlotOccupancy],
+        typeId: str,
+        matrix,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Apply occupancy and type-relation rules for one slot on per-seat arrays.
+
+        Returns `(occupied, blocked, forbidden)`: per-seat flags for taken seats
+        and seats next to an occupant that requires separation, and a per-table
+        flag for tables holding an occupant whose type is forbidden.
+        """
+        occupied = np.zeros(floor.size, dtype=bool)
+        occupant_type = np.full(floor.size, -1, dtype=np.int64)
+        for k, t in enumerate(floor.tables):
+            occ = occupancy.get(t.id)
+            if occ is None or not occ.mask:
+                continue
+            base = int(floor.offsets[k])
+            mask = occ.mask
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                pos = low.bit_length() - 1
+                occupied[base + pos] = True
+                spirit = occ.first(pos)[1]
+                if spirit:
+                    type_index = matrix.index_of(spirit["typeId"])
+                    if type_index is not None:
+                        occupant_type[base + pos] = type_index
+
+        relation = np.zeros(floor.size, dtype=np.int8)
+        codes = matrix.codes_for(typeId)
+        if codes is not None:
+            known = occupant_type >= 0
+            relation[known] = codes[occupant_type[known]]
+
+        # separation blocks both ring neighbours of the occupant
+        separated = relation == matrix.SEPARATION
+        blocked = np.zeros(floor.size, dtype=bool)
+        blocked[floor.next_idx[separated]] = True
+        blocked[floor.prev_idx[separated]] = True
+
+        forbidden = (
+            np.bincount(
+                floor.table_of[relation == matrix.FORBIDDEN],
+                minlength=len(floor.tables),
+            )
+            > 0
+        )
+        return occupied, blocked, forbidden
+
+    @staticmethod
+    def _evaluate_slot(
+        floor: FloorArrays,
+        occupancy: Dict[int, SlotOccupancy],
+        typeId: str,
+        matrix,
+    ) -> List[Dict]:
+        """Build the `AvailableBanquetTableRead` payloads of one slot."""
+        occupied, blocked, forbidden = BanquetService._slot_arrays(
+            floor, occupancy, typeId, matrix
+        )
+        unavailable = (occupied | blocked).tolist()
+        forbidden = forbidden.tolist()
+
+        out_tables = []
+        for k, t in enumerate(floor.tables):
+            tbl = t.as_dict()
+            if forbidden[k]:
+                tbl["available"] = False
+            base = int(floor.offsets[k])
+            occ = occupancy.get(t.id)
+            occupies = []
+            seats_out = []
+            for pos, seat_id in enumerate(t.seat_ids):
+                seat_d = {
+                    "seatNumber": t.seat_numbers[pos],
+                    "id": seat_id,
+                    "tableId": t.id,
+                }
+                first = occ.first(pos) if occ is not None else None
+                if first:
+                    seat_d["reservationId"] = first[0]
+                    seat_d["available"] = False
+                    seat_d["spirit"] = first[1]
+                    if first[1]:
+                        occupies.append(first[1])
+                elif unavailable[base + pos]:
+                    seat_d["available"] = False
+                seats_out.append(seat_d)
+            tbl["availableSeats"] = seats_out
+            tbl["occupies"] = occupies
+            out_tables.append(tbl)
+
+        return out_tables
+
+    @staticmethod
+    def _has_free_seat(
+        floor: FloorArrays,
+        occupancy: Dict[int, SlotOccupancy],
+        typeId: str,
+        matrix,
+    ) -> bool:
+        """True when some seat is neither taken, separated nor on a forbidden table."""
+        occupied, blocked, forbidden = BanquetService._slot_arrays(
+            floor, occupancy, typeId, matrix
+        )
+        free = ~(occupied | blocked | forbidden[floor.table_of])
+        return bool(free.any())
+
     @staticmethod
     async def list_available_seats(
         spirit_id: int, start_dt: datetime, session
     ) -> List[Dict]:
-        # Parse incoming date/datetime and normalize to UTC
-        spirit = await SpiritService.get_spirit(spirit_id, session)
-        if not spirit:
+        typeId = await BanquetService._get_spirit_type_id(spirit_id, session)
+        if not typeId:
             return []
 
-        typeId = spirit.typeId
-        end_dt = start_dt + timedelta(hours=1)
+        start_dt = as_utc(start_dt)
+        window = (start_dt, start_dt + timedelta(hours=1))
 
-        # Load tables with seats
-        res = await session.exec(
-            select(BanquetTable).options(selectinload(BanquetTable.availableSeats))
+        floor = await occupancy_index.get_floor(session)
+        occupancy = await occupancy_index.get_windows([window], session)
+        # Relations come from the in-memory matrix: no per-seat DB round trips.
+        matrix = await TypeRelationService.get_compatibility_matrix(session)
+
+        return BanquetService._evaluate_slot(
+            floor, occupancy[window], typeId, matrix
         )
-        tables = res.all()
-
-        # Collect seat ids to find overlapping reservations
-        seat_ids = [
-            s.id
-            for t in tables
-            for s in getattr(t, "availableSeats", [])
-            if s.id is not None
+
+    @staticmethod
+    def _plan_seating(
+        layout: List[TableLayout],
+        occupancy: Dict[int, SlotOccupancy],
+        guests: List[tuple],
+        matrix,
+        max_steps: int,
+    ) -> tuple:
+        """Find seats for `guests` ([(spirit_id, typeId)]) on top of the current occupancy.
+
+        A guest may not share a table with a "forbidden" type nor sit next to a
+        "separation" type, checked in both directions so the group is also
+        compatible with itself. Guests with the fewest options are placed
+        first and the backtracking search stops after `max_steps` free seats
+        tried (seats taken by the group itself are skipped at no cost). Returns ({spirit_id: (table_index, position)}, complete), the
+        plan being the largest one found.
+        """
+        relations: Dict[tuple, str] = {}
+
+        def clashes(a, b, kind: str) -> bool:
+            for key in ((a, b), (b, a)):
+                if key not in relations:
+                    relations[key] = matrix.relation(*key)
+                if relations[key] == kind:
+                    return True
+            return False
+
+        # table index -> occupant typeId per ring position (None when free,
+        # "" when occupied by a spirit whose type is unknown)
+        seats: List[List[Optional[str]]] = []
+        for t in layout:
+            occ = occupancy.get(t.id)
+            row: List[Optional[str]] = []
+            for pos in range(len(t.seat_ids)):
+                first = occ.first(pos) if occ is not None else None
+                if first is None:
+                    row.append(None)
+                else:
+                    row.append(first[1]["typeId"] if first[1] else "")
+            seats.append(row)
+
+        def fits(type_id, ti: int, pos: int) -> bool:
+            row = seats[ti]
+            if row[pos] is not None:
+                return False
+            for other in row:
+                if other and clashes(type_id, other, "forbidden"):
+                    return False
+            n = len(row)
+            for nb in ((pos - 1) % n, (pos + 1) % n):
+                other = row[nb]
+                if nb != pos and other and clashes(type_id, other, "separation"):
+                    return False
+            return True
+
+        # only seats free before the group sits down can ever be candidates
+        candidates = [
+            (ti, pos)
+            for ti, row in enumerate(seats)
+            for pos in range(len(row))
+            if row[pos] is None
         ]
+        options = {
+            sid: sum(1 for ti, pos in candidates if fits(type_id, ti, pos))
+            for sid, type_id in guests
+        }
+        order = sorted(guests, key=lambda g: options[g[0]])
+
+        current: Dict[int, tuple] = {}
+        best: Dict[int, tuple] = {}
+        steps = 0
+
+        def search(k: int) -> bool:
+            nonlocal steps, best
+            if len(current) > len(best):
+                best = dict(current)
+            if k == len(order):
+                # a leaf only ends the search when nobody was skipped
+                return len(current) == len(order)
+            sid, type_id = order[k]
+            for ti, pos in candidates:
+                if seats[ti][pos] is not None:
+                    # taken by an earlier guest of the group: free to skip
+                    continue
+                if steps >= max_steps:
+                    return False
+                steps += 1
+                if not fits(type_id, ti, pos):
+                    continue
+                seats[ti][pos] = type_id
+                current[sid] = (ti, pos)
+                if search(k + 1):
+                    return True
+                seats[ti][pos] = None
+                del current[sid]
+            # nowhere left for this guest: seat the rest without them, unless
+            # that cannot beat the best plan found so far
+            if steps >= max_steps or len(current) + len(order) - k - 1 <= len(best):
+                return False
+            return search(k + 1)
+
+        if search(0):
+            return current, True
+        return best, len(best) == len(guests)
 
-        reservations_map = {}
-        if seat_ids:
-            q = (
-                select(Reservation)
-                .where(
-                    Reservation.seatId.in_(seat_ids),
-                    Reservation.startTime < end_dt,
-                    Reservation.endTime > start_dt,
-                )
-                .options(
-                    selectinload(Reservation.account)
-                    .selectinload(VenueAccount.spirit)
-                    .selectinload(Spirit.type)
-                )
+    @staticmethod
+    async def assign_seats(
+        spirit_ids: List[int], start_dt: datetime, session
+    ) -> Dict:
+        """Compute a compatible seat for each spirit in one request.
+
+        Spirits, floor and slot occupancy are loaded once; nothing is booked.
+        """
+        spirit_ids = list(dict.fromkeys(spirit_ids))
+        start_dt = as_utc(start_dt)
+        window = (start_dt, start_dt + timedelta(hours=1))
+
+        res = await session.exec(
+            select(Spirit.id, Spirit.typeId).where(Spirit.id.in_(spirit_ids))
+        )
+        type_ids = {row[0]: row[1] for row in res.all()}
+
+        layout = await occupancy_index.get_layout(session)
+        occupancy = (await occupancy_index.get_windows([window], session))[window]
+        matrix = await TypeRelationService.get_compatibility_matrix(session)
+
+        guests = [(sid, type_ids[sid]) for sid in spirit_ids if sid in type_ids]
+        plan, complete = BanquetService._plan_seating(
+            layout, occupancy, guests, matrix, BanquetService.MAX_SEATING_STEPS
+        )
+
+        assignments = []
+        for sid in spirit_ids:
+            if sid not in plan:
+                continue
+            ti, pos = plan[sid]
+            t = layout[ti]
+            assignments.append(
+                {
+                    "spiritId": sid,
+                    "seatId": t.seat_ids[pos],
+                    "tableId": t.id,
+                    "seatNumber": t.seat_numbers[pos],
+                }
             )
-            res2 = await session.exec(q)
-            found = res2.all()
-            # Map seatId -> first matching reservation
-            for r in found:
-                if r.seatId not in reservations_map:
-                    reservations_map[r.seatId] = r
-
-            def _map_seats(seat):
-                seat_d = seat.dict()
-                resv = reservations_map.get(seat.id)
-                if resv:
-                    seat_d["reservationId"] = resv.id
-                    seat_d["available"] = False
-                    seat_d["spirit"] = (
-                        getattr(resv.account, "spirit", None).dict()
-                        if getattr(resv.account, "spirit", None)
-                        else None
-                    )
-                    seat_d["spirit"]["type"] = (
-                        getattr(resv.account.spirit, "type", None).dict()
-                        if getattr(resv.account.spirit, "type", None)
-                        else None
-                    )
-
-                return seat_d
+        return {
+            "assignments": assignments,
+            "unassigned": [sid for sid in spirit_ids if sid not in plan],
+            "complete": complete,
+        }
 
-        out_tables = []
-        for t in tables:
-            # Go through each table
-            tbl = t.dict()
-            occupies = []
+    @staticmethod
+    async def record_seat_change(
+        before: Optional[tuple], after: Optional[tuple], session
+    ) -> None:
+        """Propagate a reservation write to the occupancy index and seat stream.
+
+        `before`/`after` are `(reservation_id, seatId, accountId, startTime,
+        endTime)` snapshots of the row around the write (None when the row did
+        not exist). Reservations without a seat are ignored.
+        """
+        await BanquetService.record_seat_changes([(before, after)], session)
 
-            seats_out = list(
-                map(
-                    _map_seats,
-                    sorted(
-                        getattr(t, "availableSeats", []).copy(),
-                        key=lambda s: s.seatNumber,
-                    ),
-                )
+    @staticmethod
+    async def record_seat_changes(changes: List[tuple], session) -> None:
+        """Batch form of `record_seat_change` for a list of `(before, after)` pairs.
+
+        Occupants of all new rows landing in cached windows are looked up with
+        a single query.
+        """
+        added = []
+        for before, after in changes:
+            if before is not None and before[1] is not None:
+                occupancy_index.remove(before[0])
+            # only pay for the occupant lookup when a cached window is affected
+            if (
+                after is not None
+                and after[1] is not None
+                and occupancy_index.overlapping(after[3], after[4])
+            ):
+                added.append(after)
+
+        if added:
+            res = await session.exec(
+                select(VenueAccount)
+                .where(VenueAccount.id.in_({a[2] for a in added}))
+                .options(selectinload(VenueAccount.spirit).selectinload(Spirit.type))
             )
-            for i, seat_d in enumerate(seats_out):
-                nextSeat = seats_out[i + 1] if i + 1 < len(seats_out) else seats_out[0]
-                pastSeat = seats_out[i - 1] if i - 1 >= 0 else seats_out[-1]
-                # Go through each seat
-                if seat_d.get("spirit", None):
-                    sp = seat_d["spirit"]
-                    tr = await TypeRelationService.get_relation_between(
-                        typeId, sp["typeId"], session
-                    )
-                    relation = tr.relation if tr else "allow"
-                    if relation == "forbidden":
-                        tbl["available"] = False
-                    elif relation == "separation":
-                        pastSeat["available"] = False
-                        nextSeat["available"] = False
-                    occupies.append(sp)
-            tbl["availableSeats"] = seats_out
-            tbl["occupies"] = occupies
-            out_tables.append(tbl)
+            spirits = {
+                account.id: spirit_payload(getattr(account, "spirit", None))
+                for account in res.all()
+            }
+            for reservation_id, seat_id, account_id, start, end in added:
+                occupancy_index.add(
+                    reservation_id, seat_id, start, end, spirits.get(account_id)
+                )
 
-        return out_tables
+        for before, after in changes:
+            if before is not None and after is not None and before[1:] == after[1:]:
+                # nothing seat-related changed (e.g. the reservation was redeemed)
+                continue
+            if before is not None and before[1] is not None:
+                await BanquetService._publish_seat_event("seat_freed", before, session)
+            if after is not None and after[1] is not None:
+                await BanquetService._publish_seat_event("seat_occupied", after, session)
 
     @staticmethod
-    async def create_table(table_create, session) -> BanquetTable:
-        t = BanquetTable(**table_create.dict())
-        session.add(t)
-        await session.commit()
-        await session.refresh(t)
+    async def _publish_seat_event(kind: str, snapshot: tuple, session) -> None:
+        reservation_id, seat_id, _, start, end = snapshot
+        table_id, seat_number = await occupancy_index.locate_seat(seat_id, session)
+        await events.publish(
+            BanquetService.SEAT_EVENTS_TOPIC,
+            {
+                "type": kind,
+                "reservationId": reservation_id,
+                "seatId": seat_id,
+                "tableId": table_id,
+                "seatNumber": seat_number,
+                "startTime": as_utc(start).isoformat() if start else None,
+                "endTime": as_utc(end).isoformat() if end else None,
+            },
+        )
 
-        # auto-create seats
-        seats = []
-        try:
-            cap = int(t.capacity) if t.capacity and t.capacity > 0 else 0
-        except Exception:
-            cap = 0
-        for i in range(1, cap + 1):
-            s = BanquetSeat(tableId=t.id, seatNumber=i)
-            session.add(s)
-            seats.append(s)
-        if seats:
-            await session.commit()
-            for s in seats:
-                await session.refresh(s)
-
-        await session.refresh(t)
-        res = await session.exec(
-            select(BanquetTable)
-            .where(BanquetTable.id == t.id)
-            .options(selectinload(BanquetTable.availableSeats))
+    @staticmethod
+    async def create_table(table_create, session) -> BanquetTableRead:
+        tables = await BanquetService.create_tables([table_create], session)
+        return tables[0]
+
+    @staticmethod
+    async def create_tables(tables_create: List, session) -> List[BanquetTableRead]:
+        """Create many tables and their auto-numbered seats in one transaction.
+
+        Tables and seats are each written with a single multi-row
+        INSERT ... RETURNING, so provisioning a hall costs a fixed number of
+        round trips regardless of how many tables or seats it has.
+        """
+        if not tables_create:
+            return []
+
+        table_rows = [tc.dict() for tc in tables_create]
+        res = await session.execute(
+            insert(BanquetTable).returning(
+                BanquetTable.id,
+                BanquetTable.capacity,
+                BanquetTable.state,
+            ),
+            table_rows,
         )
-        return res.first()
+        # RETURNING rows carry everything the seats need, so their order is
+        # irrelevant; ids ascend in insertion order.
+        created = sorted(res.all(), key=lambda row: row[0])
+
+        # auto-create seats
+        seat_rows = []
+        for table_id, capacity, _ in created:
+            try:
+                cap = int(capacity) if capacity and capacity > 0 else 0
+            except Exception:
+                cap = 0
+            seat_rows.extend(
+                {"tableId": table_id, "seatNumber": i} for i in range(1, cap + 1)
+            )
+
+        seats_by_table: Dict[int, List[BanquetSeatRead]] = {
+            row[0]: [] for row in created
+        }
+        if seat_rows:
+            res = await session.execute(
+                insert(BanquetSeat).returning(
+                    BanquetSeat.id,
+                    BanquetSeat.tableId,
+                    BanquetSeat.seatNumber,
+                ),
+                seat_rows,
+            )
+            for seat_id, table_id, seat_number in sorted(res.all()):
+                seats_by_table[table_id].append(
+                    BanquetSeatRead(id=seat_id, tableId=table_id, seatNumber=seat_number)
+                )
+
+        await session.commit()
+        occupancy_index.invalidate()
+
+        return [
+            BanquetTableRead(
+                id=table_id,
+                capacity=capacity,
+                state=state,
+                availableSeats=seats_by_table[table_id],
+            )
+            for table_id, capacity, state in created
+        ]
 
     @staticmethod
     async def get_table(table_id: str, session) -> Optional[BanquetTable]:
@@ -171,30 +500,31 @@ class BanquetService:
     async def update_table(
         table_id: str, table_update, session
     ) -> Optional[BanquetTable]:
-        result = await session.exec(
-            select(BanquetTable).where(BanquetTable.id == table_id)
+        t = await BanquetService.update_returning(
+            table_id, table_update.dict(exclude_unset=True), session
         )
-        t = result.first()
-        if not t:
-            return None
-        data = table_update.dict(exclude_unset=True)
-        for key, value in data.items():
-            setattr(t, key, value)
-        session.add(t)
-        await session.commit()
-        await session.refresh(t)
+        if t is not None:
+            occupancy_index.invalidate()
         return t
 
     @staticmethod
     async def delete_table(table_id: str, session) -> bool:
-        result = await session.exec(
-            select(BanquetTable).where(BanquetTable.id == table_id)
+        # what the seats' delete-orphan cascade did: free their bookings, drop them
+        seats = select(BanquetSeat.id).where(BanquetSeat.tableId == table_id)
+        await session.exec(
+            update(Reservation)
+            .where(Reservation.seatId.in_(seats))
+            .values(seatId=None)
+        )
+        await session.exec(
+            delete(BanquetSeat)
+            .where(BanquetSeat.tableId == table_id)
         )
-        t = result.first()
-        if not t:
+        if await BanquetService.delete_returning(table_id, session) is None:
+            await session.rollback()
             return False
-        await session.delete(t)
-        await session.commit()
+        occupancy_index.invalidate()
+        reservation_cache.invalidate()
         return True
 
     @staticmethod
@@ -211,145 +541,133 @@ class BanquetService:
         return res.first()
 
     @staticmethod
-    async def get_available_time_slots(spirit_id: str, d: date, session) -> List[str]:
-        """Return TIME_SLOTS where at least one seat is free for the given spirit on date `d`.
+    def _slot_windows(d: date) -> List[tuple]:
+        """Return (slot, start_utc, end_utc) for each TIME_SLOT still bookable on `d`.
 
-        This fetches tables and all reservations for the day once, then checks each slot
-        for any seat without an overlapping reservation.
+        Timeslot strings are expressed in Bogota local time (UTC-5); dates in the
+        past (Bogota) yield no windows and, for today, slots that already ended
+        are skipped.
         """
-
-        # normalize day to UTC midnight
-        start_of_day = datetime.combine(d, time.min).replace(tzinfo=timezone.utc)
-        end_of_day = start_of_day + timedelta(days=1)
-
-        # Timeslot strings are expressed in Bogota local time (UTC-5).
         BOGOTA_TZ = timezone(timedelta(hours=-5))
 
-        # Compare the requested day against "today" in Bogota.
         today_bogota = datetime.now(timezone.utc).astimezone(BOGOTA_TZ).date()
         if d < today_bogota:
             return []
 
-        # If the requested date is today in Bogota, compute current UTC time to
-        # exclude timeslots that have already passed when converted to UTC.
         is_today = d == today_bogota
         now_utc = datetime.now(timezone.utc) if is_today else None
 
-        # For each timeslot, ask `list_available_seats` for the slot start time
-        # and treat a slot as available if any seat across all tables is free.
-        available_slots: List[str] = []
-
+        windows = []
         for slot in TIME_SLOTS:
             # parse slot like '09:00 AM'
             try:
                 slot_time = datetime.strptime(slot, "%I:%M %p").time()
             except Exception:
                 continue
-            # Interpret the slot time as Bogota-local, then convert to UTC
-            # for comparisons and for passing into the seat-availability
-            # routine which expects UTC datetimes.
             slot_start_local = datetime.combine(d, slot_time).replace(tzinfo=BOGOTA_TZ)
             slot_start = slot_start_local.astimezone(timezone.utc)
             slot_end = slot_start + timedelta(hours=1)
 
-            # If we're computing for today (Bogota), skip slots that have already passed.
             if is_today and now_utc is not None and slot_end <= now_utc:
                 continue
+            windows.append((slot, slot_start, slot_end))
+        return windows
 
-            # Use the existing seat-availability logic which applies type
-            # restrictions and reservation checks per seat. Pass UTC datetime.
-            try:
-                tables = await BanquetService.list_available_seats(
-                    spirit_id, slot_start, session
-                )
-            except Exception:
-                # If something goes wrong computing seats for this slot, skip it.
-                continue
-
-            slot_has_free = False
-            for tbl in tables:
-                # If the table itself is marked unavailable, treat all seats as unavailable
-                table_unavailable = tbl.get("available") is False
-
-                seats = tbl.get("availableSeats", [])
-                for seat in seats:
-                    if table_unavailable:
-                        # table-level restriction => seat unavailable
-                        continue
-
-                    # If seat has a reservationId it's taken. If 'available' is present
-                    # and False then it's restricted/unavailable.
-                    if seat.get("reservationId"):
-                        continue
-
-                    if seat.get("available") is False:
-                        continue
+    @staticmethod
+    async def get_available_time_slots(spirit_id: str, d: date, session) -> List[str]:
+        """Return TIME_SLOTS where at least one seat is free for the given spirit on date `d`.
 
-                    # Seat is free for this slot
-                    slot_has_free = True
-                    break
+        Tables, seats and every seat reservation overlapping the day's slots are
+        loaded once; each slot is then evaluated in memory with the same rules as
+        `list_available_seats`.
+        """
+        calendar = await BanquetService.get_available_time_slots_range(
+            spirit_id, d, d, session
+        )
+        return calendar[d.isoformat()]
 
-                if slot_has_free:
-                    break
+    @staticmethod
+    async def get_available_time_slots_range(
+        spirit_id: str, start_date: date, end_date: date, session
+    ) -> Dict[str, List[str]]:
+        """Return a {YYYY-MM-DD: [slots]} map for every date in [start_date, end_date].
+
+        All seat reservations overlapping the range are fetched with a single
+        query and every (day, slot) pair is evaluated in one in-memory batch.
+        Past days map to an empty list.
+        """
+        days = [
+            start_date + timedelta(days=i)
+            for i in range((end_date - start_date).days + 1)
+        ]
+        calendar: Dict[str, List[str]] = {d.isoformat(): [] for d in days}
+        windows_by_day = {d: BanquetService._slot_windows(d) for d in days}
+        all_windows = [w for ws in windows_by_day.values() for w in ws]
+        if not all_windows:
+            return calendar
+
+        typeId = await BanquetService._get_spirit_type_id(spirit_id, session)
+        if not typeId:
+            return calendar
+
+        floor = await occupancy_index.get_floor(session)
+        occupancy = await occupancy_index.get_windows(
+            [(w[1], w[2]) for w in all_windows], session
+        )
+        matrix = await TypeRelationService.get_compatibility_matrix(session)
 
-            if slot_has_free:
-                available_slots.append(slot)
+        for d, windows in windows_by_day.items():
+            for slot, slot_start, slot_end in windows:
+                if BanquetService._has_free_seat(
+                    floor, occupancy[(slot_start, slot_end)], typeId, matrix
+                ):
+                    calendar[d.isoformat()].append(slot)
 
-        return available_slots
+        return calendar
 
     @staticmethod
-    async def today_table_availability(session) -> int:
-        """
-        Return the number of seats taken in all tables for today (UTC day).
+    async def today_table_availability(session) -> List[dict]:
         """
-        from datetime import datetime, timezone
+        Return per-table seat usage for the current hour (UTC) as a list of
+        dicts with table id, capacity, takenSeats and availableSeats.
 
-        today = datetime.now(timezone.utc)
-        # Bogota
-        start_dt = today
-        end_dt = start_dt + timedelta(hours=1)
+        Computed by a single grouped aggregate over banquet_table,
+        banquet_seat and the overlapping reservations.
+        """
+        start_dt, end_dt = current_hour_window()
         logger.debug(f"Computing banquet availability for {start_dt} to {end_dt}")
-        from app.models import Reservation
 
-        q = (
-            select(Reservation)
-            .where(Reservation.seatId != None)
-            .where(Reservation.startTime >= start_dt)
-            .where(Reservation.startTime < end_dt)
-        )
-        res = await session.exec(q)
-        reservations = res.all()
-        # Count distinct seat reservations (one reservation per seat/time)
-        taken = len([r for r in reservations if r.seatId is not None])
-        # Instead of returning a single int, return a list of table availability
-        # dicts containing table id, capacity, takenSeats and availableSeats.
-
-        # Load tables and their seats
-        res_t = await session.exec(
-            select(BanquetTable).options(selectinload(BanquetTable.availableSeats))
+        capacity = func.coalesce(
+            BanquetTable.capacity, func.count(distinct(BanquetSeat.id))
         )
-        tables = res_t.all()
-
-        # Map seatId -> reservation (any reservation during the day means seat taken)
-        taken_seat_ids = {r.seatId for r in reservations if r.seatId is not None}
-
-        out: List[dict] = []
-        for t in tables:
-            seats = getattr(t, "availableSeats", [])
-            capacity = (
-                int(t.capacity)
-                if getattr(t, "capacity", None) is not None
-                else len(seats)
+        taken = func.count(distinct(Reservation.seatId))
+        q = (
+            select(
+                BanquetTable.id,
+                capacity.label("capacity"),
+                taken.label("takenSeats"),
+                case((capacity - taken > 0, capacity - taken), else_=0).label(
+                    "availableSeats"
+                ),
             )
-            taken_count = sum(1 for s in seats if s.id in taken_seat_ids)
-            available = max(0, capacity - taken_count)
-            out.append(
-                {
-                    "id": t.id,
-                    "capacity": capacity,
-                    "takenSeats": taken_count,
-                    "availableSeats": available,
-                }
+            .select_from(BanquetTable)
+            .outerjoin(BanquetSeat, BanquetSeat.tableId == BanquetTable.id)
+            .outerjoin(
+                Reservation,
+                (Reservation.seatId == BanquetSeat.id)
+                & (Reservation.startTime < end_dt)
+                & (Reservation.endTime > start_dt),
             )
-
-        return out
+            .group_by(BanquetTable.id, BanquetTable.capacity)
+            .order_by(BanquetTable.id)
+        )
+        res = await session.exec(q)
+        return [
+            {
+                "id": row[0],
+                "capacity": int(row[1] or 0),
+                "takenSeats": int(row[2] or 0),
+                "availableSeats": int(row[3] or 0),
+            }
+            for row in res.all()
+        ]
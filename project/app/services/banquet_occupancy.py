@@ -0,0 +1,326 @@
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlmodel import select
+from sqlalchemy.orm import selectinload
+
+from app.models import BanquetTable, Reservation, VenueAccount, Spirit
+
+# (start_utc, end_utc) of a banquet slot
+Window = Tuple[datetime, datetime]
+
+
+def as_utc(dt: datetime) -> datetime:
+    # SQLite hands back naive datetimes; treat them as UTC like Postgres does.
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def spirit_payload(spirit: Optional[Spirit]) -> Optional[dict]:
+    """Serialize an occupant spirit (with its type) the way availability responses expose it."""
+    if spirit is None:
+        return None
+    data = spirit.model_dump()
+    spirit_type = getattr(spirit, "type", None)
+    data["type"] = spirit_type.model_dump() if spirit_type else None
+    return data
+
+
+class TableLayout:
+    """Immutable seating layout of one banquet table.
+
+    Seats are kept in ring order (sorted by `seatNumber`); position `i` in
+    `seat_ids`/`seat_numbers` is bit `i` of every `SlotOccupancy.mask` for
+    this table.
+    """
+
+    def __init__(self, table_id: int, capacity: int, state: bool, seats: List[tuple]):
+        self.id = table_id
+        self.capacity = capacity
+        self.state = state
+        ordered = sorted(seats, key=lambda s: s[1])
+        self.seat_ids: List[int] = [s[0] for s in ordered]
+        self.seat_numbers: List[int] = [s[1] for s in ordered]
+
+    @classmethod
+    def from_table(cls, t: BanquetTable) -> "TableLayout":
+        seats = [
+            (s.id, s.seatNumber)
+            for s in getattr(t, "availableSeats", [])
+            if s.id is not None
+        ]
+        return cls(t.id, t.capacity, t.state, seats)
+
+    def as_dict(self) -> dict:
+        return {"capacity": self.capacity, "state": self.state, "id": self.id}
+
+
+class FloorArrays:
+    """The whole floor flattened into per-seat NumPy arrays.
+
+    Seats of every table are laid out back to back in ring order: table `k`
+    owns `offsets[k]:offsets[k] + sizes[k]`. `next_idx`/`prev_idx` hold the
+    flat index of each seat's ring neighbours, so shifting a per-seat array
+    around every table at once is a single gather.
+    """
+
+    def __init__(self, layout: List[TableLayout]):
+        self.tables = layout
+        self.sizes = np.array([len(t.seat_ids) for t in layout], dtype=np.int64)
+        self.offsets = np.zeros(len(layout), dtype=np.int64)
+        if len(layout):
+            self.offsets[1:] = np.cumsum(self.sizes)[:-1]
+        self.size = int(self.sizes.sum())
+        self.table_of = np.repeat(np.arange(len(layout), dtype=np.int64), self.sizes)
+        local = np.arange(self.size, dtype=np.int64) - self.offsets[self.table_of]
+        sizes = self.sizes[self.table_of]
+        base = self.offsets[self.table_of]
+        self.next_idx = base + (local + 1) % np.maximum(sizes, 1)
+        self.prev_idx = base + (local - 1) % np.maximum(sizes, 1)
+
+
+class SlotOccupancy:
+    """Occupied seats of one table during one slot.
+
+    `mask` has bit `i` set when the seat at ring position `i` has at least one
+    overlapping reservation; `occupants[i]` lists those reservations as
+    (reservation_id, spirit_payload) in arrival order, the first one being the
+    occupant reported to clients.
+    """
+
+    def __init__(self, size: int):
+        self.mask = 0
+        self.occupants: List[List[tuple]] = [[] for _ in range(size)]
+
+    def add(self, pos: int, reservation_id: str, spirit: Optional[dict]) -> None:
+        self.occupants[pos].append((reservation_id, spirit))
+        self.mask |= 1 << pos
+
+    def remove(self, reservation_id: str) -> bool:
+        removed = False
+        for pos, entries in enumerate(self.occupants):
+            kept = [e for e in entries if e[0] != reservation_id]
+            if len(kept) != len(entries):
+                self.occupants[pos] = kept
+                removed = True
+                if not kept:
+                    self.mask &= ~(1 << pos)
+        return removed
+
+    def first(self, pos: int) -> Optional[tuple]:
+        entries = self.occupants[pos]
+        return entries[0] if entries else None
+
+    @property
+    def taken(self) -> int:
+        return bin(self.mask).count("1")
+
+
+class BanquetOccupancyIndex:
+    """Process-wide seat occupancy per banquet table and slot window.
+
+    The floor layout is loaded once and slot windows are filled lazily (all
+    missing windows of a request with a single reservation query). After that
+    the index is maintained incrementally by `add`/`remove` whenever a
+    reservation with a `seatId` is written through `ReservationService`
+    (single, bulk, update, delete), so availability reads no longer rebuild
+    occupancy from `Reservation` rows.
+
+    Only the most recently used `max_windows` windows are kept. Table changes
+    call `invalidate()` since seat positions may shift, and so do changes to
+    what an occupant payload shows: spirits, spirit types and accounts.
+    Detaching bookings from a deleted service and moving rows between
+    reservation partitions leave seats and occupants as they were.
+
+    Like the other in-process caches it assumes a single worker process
+    (docker-compose runs uvicorn with `--workers 1`): writes made by another
+    worker, or by SQL outside the services, are not seen until `invalidate()`
+    or a restart.
+    """
+
+    def __init__(self, max_windows: int = 512):
+        self.max_windows = max_windows
+        self._layout: Optional[List[TableLayout]] = None
+        self._floor: Optional[FloorArrays] = None
+        # seat id -> (table id, ring position)
+        self._seat_pos: Dict[int, Tuple[int, int]] = {}
+        self._seat_numbers: Dict[int, int] = {}
+        self._windows: "OrderedDict[Window, Dict[int, SlotOccupancy]]" = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.loads = 0
+
+    def invalidate(self) -> None:
+        self._layout = None
+        self._floor = None
+        self._seat_pos = {}
+        self._seat_numbers = {}
+        self._windows.clear()
+        self._generation += 1
+
+    async def get_layout(self, session) -> List[TableLayout]:
+        if self._layout is None:
+            generation = self._generation
+            res = await session.exec(
+                select(BanquetTable).options(selectinload(BanquetTable.availableSeats))
+            )
+            layout = [TableLayout.from_table(t) for t in res.all()]
+            if generation != self._generation:
+                return layout
+            self._layout = layout
+            self._seat_pos = {
+                seat_id: (t.id, pos)
+                for t in layout
+                for pos, seat_id in enumerate(t.seat_ids)
+            }
+            self._seat_numbers = {
+                seat_id: number
+                for t in layout
+                for seat_id, number in zip(t.seat_ids, t.seat_numbers)
+            }
+        return self._layout
+
+    async def get_floor(self, session) -> FloorArrays:
+        layout = await self.get_layout(session)
+        if self._floor is None or self._floor.tables is not layout:
+            floor = FloorArrays(layout)
+            if layout is not self._layout:
+                # layout changed under us: serve it without caching
+                return floor
+            self._floor = floor
+        return self._floor
+
+    async def locate_seat(self, seat_id: int, session) -> Tuple[Optional[int], Optional[int]]:
+        """Return (table id, seat number) of a seat, or (None, None) if unknown."""
+        await self.get_layout(session)
+        located = self._seat_pos.get(seat_id)
+        if located is None:
+            return None, None
+        return located[0], self._seat_numbers.get(seat_id)
+
+    def _empty_window(self, layout: List[TableLayout]) -> Dict[int, SlotOccupancy]:
+        return {t.id: SlotOccupancy(len(t.seat_ids)) for t in layout}
+
+    def _store(self, window: Window, occupancy: Dict[int, SlotOccupancy]) -> None:
+        self._windows[window] = occupancy
+        self._windows.move_to_end(window)
+        while len(self._windows) > self.max_windows:
+            self._windows.popitem(last=False)
+
+    async def get_windows(
+        self, windows: List[Window], session
+    ) -> Dict[Window, Dict[int, SlotOccupancy]]:
+        """Return {window: {table_id: SlotOccupancy}} for every requested window.
+
+        Cached windows are served from memory; the missing ones are filled
+        from one query covering their combined time range.
+        """
+        layout = await self.get_layout(session)
+        generation = self._generation
+        out: Dict[Window, Dict[int, SlotOccupancy]] = {}
+        missing: List[Window] = []
+        for w in windows:
+            cached = self._windows.get(w)
+            if cached is not None:
+                self._windows.move_to_end(w)
+                self.hits += 1
+                out[w] = cached
+            elif w not in out:
+                out[w] = self._empty_window(layout)
+                missing.append(w)
+
+        if not missing or not self._seat_pos:
+            for w in missing:
+                self._store(w, out[w])
+            return out
+
+        q = (
+            select(Reservation)
+            .where(
+                Reservation.seatId.in_(list(self._seat_pos)),
+                Reservation.startTime < max(w[1] for w in missing),
+                Reservation.endTime > min(w[0] for w in missing),
+            )
+            .options(
+                selectinload(Reservation.account)
+                .selectinload(VenueAccount.spirit)
+                .selectinload(Spirit.type)
+            )
+        )
+        res = await session.exec(q)
+        self.loads += 1
+
+        missing.sort(key=lambda w: w[0])
+        starts = [w[0] for w in missing]
+        longest = max(w[1] - w[0] for w in missing)
+        for r in res.all():
+            start, end = as_utc(r.startTime), as_utc(r.endTime)
+            payload = None
+            # only windows starting after (start - longest window) can overlap
+            for w in missing[bisect_left(starts, start - longest):]:
+                if w[0] >= end:
+                    break
+                if w[1] > start:
+                    if payload is None:
+                        payload = spirit_payload(getattr(r.account, "spirit", None))
+                    self._add_to(out[w], r.id, r.seatId, payload)
+
+        # a table change while we were loading makes these windows stale
+        if generation == self._generation:
+            for w in missing:
+                self._store(w, out[w])
+        return out
+
+    def _add_to(
+        self,
+        occupancy: Dict[int, SlotOccupancy],
+        reservation_id: str,
+        seat_id: int,
+        spirit: Optional[dict],
+    ) -> None:
+        located = self._seat_pos.get(seat_id)
+        if located is None:
+            return
+        table_id, pos = located
+        occupancy[table_id].add(pos, reservation_id, spirit)
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Window]:
+        start, end = as_utc(start), as_utc(end)
+        return [w for w in self._windows if w[0] < end and w[1] > start]
+
+    def add(
+        self,
+        reservation_id: str,
+        seat_id: int,
+        start: datetime,
+        end: datetime,
+        spirit: Optional[dict],
+    ) -> None:
+        for w in self.overlapping(start, end):
+            self._add_to(self._windows[w], reservation_id, seat_id, spirit)
+
+    def remove(self, reservation_id: str) -> None:
+        for occupancy in self._windows.values():
+            for slot in occupancy.values():
+                slot.remove(reservation_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "windows": len(self._windows),
+            "hits": self.hits,
+            "loads": self.loads,
+            "tables": len(self._layout or []),
+        }
+
+
+occupancy_index = BanquetOccupancyIndex()
+
+
+def current_hour_window(now: Optional[datetime] = None) -> Window:
+    now = as_utc(now or datetime.now(timezone.utc))
+    start = now.replace(minute=0, second=0, microsecond=0)
+    return start, start + timedelta(hours=1)
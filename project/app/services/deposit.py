@@ -3,9 +3,12 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.deposit import Deposit, DepositCreate, DepositUpdate
+from app.services.repository import Repository
 
 
-class DepositService:
+class DepositService(Repository[Deposit]):
+    model = Deposit
+
     @staticmethod
     async def list_deposits(session: AsyncSession) -> List[Deposit]:
         res = await session.exec(select(Deposit))
@@ -39,24 +42,10 @@ class DepositService:
     async def update_deposit(
         deposit_id: str, deposit_in: DepositUpdate, session: AsyncSession
     ) -> Optional[Deposit]:
-        res = await session.exec(select(Deposit).where(Deposit.id == deposit_id))
-        st = res.first()
-        if not st:
-            return None
-        data = deposit_in.dict(exclude_unset=True)
-        for key, value in data.items():
-            setattr(st, key, value)
-        session.add(st)
-        await session.commit()
-        await session.refresh(st)
-        return st
+        return await DepositService.update_returning(
+            deposit_id, deposit_in.dict(exclude_unset=True), session
+        )
 
     @staticmethod
     async def delete_deposit(deposit_id: str, session: AsyncSession) -> bool:
-        res = await session.exec(select(Deposit).where(Deposit.id == deposit_id))
-        st = res.first()
-        if not st:
-            return False
-        await session.delete(st)
-        await session.commit()
-        return True
+        return await DepositService.delete_returning(deposit_id, session) is not None
@@ -4,9 +4,12 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException, status
 
 from app.models import Employee, EmployeeCreate, EmployeeUpdate
+from app.services.repository import Repository
 
 
-class EmployeeService:
+class EmployeeService(Repository[Employee]):
+    model = Employee
+
     @staticmethod
     async def list_employees(
         session: AsyncSession,
@@ -48,20 +51,21 @@ class EmployeeService:
     async def update_employee(
         clerk_id: str, employee_update: EmployeeUpdate, session: AsyncSession
     ) -> Employee:
-        employee = await EmployeeService.get_employee_or_404(clerk_id, session)
-        update_data = employee_update.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(employee, key, value)
-        session.add(employee)
-        await session.commit()
-        await session.refresh(employee)
+        employee = await EmployeeService.update_returning(
+            clerk_id, employee_update.dict(exclude_unset=True), session
+        )
+        if not employee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found"
+            )
         return employee
 
     @staticmethod
     async def delete_employee(clerk_id: str, session: AsyncSession) -> None:
-        employee = await EmployeeService.get_employee_or_404(clerk_id, session)
-        await session.delete(employee)
-        await session.commit()
+        if await EmployeeService.delete_returning(clerk_id, session) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found"
+            )
 
     @staticmethod
     async def _ensure_employee_is_unique(
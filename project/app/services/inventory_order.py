@@ -7,9 +7,18 @@ from app.models.inventory_order import (
     InventoryOrderCreate,
     InventoryOrderUpdate,
 )
+from app.services.item_stock import ItemStockService
+from app.services.repository import Repository
 
 
-class InventoryOrderService:
+def _stock_delta(line) -> dict:
+    """What an inventory order line adds to its item's stock: only redeemed lines count."""
+    return {line.idItem: line.quantity} if line.redeemed else {}
+
+
+class InventoryOrderService(Repository[InventoryOrder]):
+    model = InventoryOrder
+
     @staticmethod
     async def list_inventory_orders(session: AsyncSession) -> List[InventoryOrder]:
         res = await session.exec(select(InventoryOrder))
@@ -21,6 +30,7 @@ class InventoryOrderService:
     ) -> InventoryOrder:
         st = InventoryOrder(**inventory_order_in.dict())
         session.add(st)
+        await ItemStockService.add(session, _stock_delta(st))
         await session.commit()
         await session.refresh(st)
         return st
@@ -40,30 +50,45 @@ class InventoryOrderService:
         inventory_order_in: InventoryOrderUpdate,
         session: AsyncSession,
     ) -> Optional[InventoryOrder]:
+        # locked until commit: a concurrent update must see this one's result,
+        # or both would add the same redeemed line to item_stock
         res = await session.exec(
-            select(InventoryOrder).where(InventoryOrder.id == inventory_order_id)
+            select(
+                InventoryOrder.idItem, InventoryOrder.quantity, InventoryOrder.redeemed
+            )
+            .where(InventoryOrder.id == inventory_order_id)
+            .with_for_update()
         )
-        st = res.first()
-        if not st:
+        before = res.first()
+        if before is None:
             return None
-        data = inventory_order_in.dict(exclude_unset=True)
-        for key, value in data.items():
-            setattr(st, key, value)
-        session.add(st)
+        line = await InventoryOrderService.update_returning(
+            inventory_order_id,
+            inventory_order_in.dict(exclude_unset=True),
+            session,
+            commit=False,
+        )
+        if line is None:
+            return None
+        deltas = _stock_delta(line)
+        item_id, quantity, redeemed = before
+        if redeemed:
+            deltas[item_id] = deltas.get(item_id, 0) - quantity
+        await ItemStockService.add(session, deltas)
         await session.commit()
-        await session.refresh(st)
-        return st
+        return line
 
     @staticmethod
     async def delete_inventory_order(
         inventory_order_id: str, session: AsyncSession
     ) -> bool:
-        res = await session.exec(
-            select(InventoryOrder).where(InventoryOrder.id == inventory_order_id)
+        line = await InventoryOrderService.delete_returning(
+            inventory_order_id, session, commit=False
         )
-        st = res.first()
-        if not st:
+        if line is None:
             return False
-        await session.delete(st)
+        await ItemStockService.add(
+            session, {item_id: -q for item_id, q in _stock_delta(line).items()}
+        )
         await session.commit()
         return True
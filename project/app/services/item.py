@@ -2,118 +2,122 @@ from typing import List, Optional
 from sqlmodel import select
 from sqlalchemy.orm import selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import func
+from sqlalchemy import delete, func
 
 from app.models import (
     Item,
     ItemCreate,
     ItemUpdate,
-    ItemIntake,
-    Service,
-    InventoryOrder,
-    Reservation,
+    ItemStock,
     ItemRead,
 )
+from app.models.item_stock import DEFAULT_LOW_STOCK_THRESHOLD
+from app.services.item_stock import ItemStockService
+from app.services.repository import Repository
 
 
-class ItemService:
+class ItemService(Repository[Item]):
+    model = Item
+
     @staticmethod
     async def list_items(session: AsyncSession) -> List[Item]:
         res = await session.exec(
-                select(Item).options(
-                    selectinload(Item.inventory_orders),
-                    selectinload(Item.intakes).selectinload(ItemIntake.service).selectinload(Service.reservations),
-                )
+            select(Item)
+            .options(selectinload(Item.stock))
+            # counters move under the session's feet: always re-read them
+            .execution_options(populate_existing=True)
         )
         return res.all()
 
     @staticmethod
     async def create_item(item_in: ItemCreate, session: AsyncSession) -> Item:
-        item = Item(**item_in.dict())
+        values = item_in.dict()
+        threshold = values.pop("lowStockThreshold", DEFAULT_LOW_STOCK_THRESHOLD)
+        item = Item(**values)
         session.add(item)
+        await session.flush()
+        # every item gets its counter, so it can enter the low-stock set
+        session.add(ItemStock(itemId=item.id, threshold=threshold))
         await session.commit()
-        await session.refresh(item, ['inventory_orders', 'intakes'])
+        await session.refresh(item, ['stock'])
         return item
 
     @staticmethod
     async def get_item(item_id: int, session: AsyncSession) -> Optional[Item]:
         res = await session.exec(
-                select(Item).where(Item.id == item_id).options(
-                    selectinload(Item.inventory_orders),
-                    selectinload(Item.intakes).selectinload(ItemIntake.service).selectinload(Service.reservations),
-                )
+            select(Item)
+            .where(Item.id == item_id)
+            .options(selectinload(Item.stock))
+            .execution_options(populate_existing=True)
         )
         return res.first()
 
     @staticmethod
-    async def list_items_with_quantity(session: AsyncSession) -> List[ItemRead]:
-        """
-        Return ItemRead list with computed `quantity` using DB-side aggregations to
-        avoid triggering lazy loads during serialization.
-        """
-        # load base items
-        items_res = await session.exec(select(Item))
-        items = items_res.all()
-
-        # Sum redeemed inventory orders per item
-        inv_q = await session.exec(
-            select(InventoryOrder.idItem, func.coalesce(func.sum(InventoryOrder.quantity), 0))
-            .where(InventoryOrder.redeemed == True)
-            .group_by(InventoryOrder.idItem)
-        )
-        inv_map = {row[0]: int(row[1]) for row in inv_q.all()}
+    async def list_items_with_quantity(
+        session: AsyncSession, below: Optional[int] = None
+    ) -> List[ItemRead]:
+        """ItemRead of every item, its quantity read from the item_stock ledger.
 
-        # Count reservations per service
-        res_q = await session.exec(
-            select(Reservation.serviceId, func.count(Reservation.id)).group_by(Reservation.serviceId)
+        One scan of item joined to item_stock by primary key; no ORM objects
+        and no reservation rows are loaded. With `below`, only items whose
+        stock is under it are returned (filtered in SQL).
+        """
+        quantity = func.coalesce(ItemStock.quantity, 0)
+        q = (
+            select(Item.id, Item.name, Item.image, Item.unit, quantity, ItemStock.threshold)
+            .outerjoin(ItemStock, ItemStock.itemId == Item.id)
+            .order_by(Item.id)
         )
-        res_map = {row[0]: int(row[1]) for row in res_q.all()}
+        if below is not None:
+            q = q.where(quantity < below)
+        res = await session.exec(q)
+        return ItemService._reads(res.all())
 
-        # Get intakes for all items
-        int_q = await session.exec(select(ItemIntake.itemId, ItemIntake.serviceId, ItemIntake.quantity))
-        intakes = int_q.all()
-
-        # Compute consumed per item
-        consumed_map: dict[int, int] = {}
-        for itemId, serviceId, qty in intakes:
-            if serviceId:
-                num_res = res_map.get(serviceId, 0)
-                consumed_map[itemId] = consumed_map.get(itemId, 0) + (qty * num_res)
-            else:
-                consumed_map[itemId] = consumed_map.get(itemId, 0) + qty
+    @staticmethod
+    async def list_low_stock(session: AsyncSession) -> List[ItemRead]:
+        """ItemRead of the items under their own low-stock threshold.
 
-        # Build ItemRead list
-        result: List[ItemRead] = []
-        for itm in items:
-            ordered = inv_map.get(itm.id, 0)
-            consumed = consumed_map.get(itm.id, 0)
-            q = ordered - consumed
-            result.append(ItemRead(id=itm.id, name=itm.name, image=itm.image, unit=itm.unit, quantity=q))
+        Driven by the partial index of the low-stock set: the cost grows with
+        the number of alerts, not with the number of items.
+        """
+        res = await session.exec(
+            select(
+                Item.id, Item.name, Item.image, Item.unit,
+                ItemStock.quantity, ItemStock.threshold,
+            )
+            .join(Item, Item.id == ItemStock.itemId)
+            .where(ItemStockService.is_low())
+            .order_by(ItemStock.itemId)
+        )
+        return ItemService._reads(res.all())
 
-        return result
+    @staticmethod
+    def _reads(rows) -> List[ItemRead]:
+        return [
+            ItemRead(
+                id=id_, name=name, image=image, unit=unit,
+                quantity=qty, lowStockThreshold=threshold,
+            )
+            for id_, name, image, unit, qty, threshold in rows
+        ]
 
     @staticmethod
     async def update_item(
         item_id: int, item_in: ItemUpdate, session: AsyncSession
     ) -> Optional[Item]:
-        res = await session.exec(select(Item).where(Item.id == item_id))
-        item = res.first()
-        if not item:
-            return None
-        data = item_in.dict(exclude_unset=True)
-        for key, value in data.items():
-            setattr(item, key, value)
-        session.add(item)
-        await session.commit()
-        await session.refresh(item, ['inventory_orders', 'intakes'])
+        values = item_in.dict(exclude_unset=True)
+        threshold = values.pop("lowStockThreshold", None)
+        item = await ItemService.update_returning(item_id, values, session, commit=False)
+        if item is not None:
+            if threshold is not None:
+                await ItemStockService.set_threshold(session, item_id, threshold)
+            await session.commit()
+            # ItemRead carries the quantity
+            await session.refresh(item, ["stock"])
         return item
 
     @staticmethod
     async def delete_item(item_id: int, session: AsyncSession) -> bool:
-        res = await session.exec(select(Item).where(Item.id == item_id))
-        item = res.first()
-        if not item:
-            return False
-        await session.delete(item)
-        await session.commit()
-        return True
+        # the counter goes with its item (ON DELETE CASCADE where FKs are enforced)
+        await session.exec(delete(ItemStock).where(ItemStock.itemId == item_id))
+        return await ItemService.delete_returning(item_id, session) is not None
@@ -3,9 +3,13 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import ItemIntake, ItemIntakeCreate, ItemIntakeUpdate
+from app.services.item_stock import ItemStockService
+from app.services.repository import Repository
 
 
-class ItemIntakeService:
+class ItemIntakeService(Repository[ItemIntake]):
+    model = ItemIntake
+
     @staticmethod
     async def list_item_intakes(session: AsyncSession) -> List[ItemIntake]:
         res = await session.exec(select(ItemIntake))
@@ -17,6 +21,9 @@ class ItemIntakeService:
     ) -> ItemIntake:
         intake = ItemIntake(**item_intake_in.dict())
         session.add(intake)
+        await ItemStockService.add(
+            session, {intake.itemId: await ItemStockService.intake_delta(intake, session)}
+        )
         await session.commit()
         await session.refresh(intake)
         return intake
@@ -30,10 +37,11 @@ class ItemIntakeService:
 
     @staticmethod
     async def delete_item_intake(intake_id: int, session: AsyncSession) -> bool:
-        res = await session.exec(select(ItemIntake).where(ItemIntake.id == intake_id))
-        intake = res.first()
-        if not intake:
+        intake = await ItemIntakeService.delete_returning(intake_id, session, commit=False)
+        if intake is None:
             return False
-        await session.delete(intake)
+        await ItemStockService.add(
+            session, {intake.itemId: -await ItemStockService.intake_delta(intake, session)}
+        )
         await session.commit()
         return True
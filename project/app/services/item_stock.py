@@ -0,0 +1,202 @@
+from typing import Dict, Optional
+
+from sqlalchemy import case, delete, func, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import InventoryOrder, Item, ItemIntake, ItemStock, Reservation, Service
+
+
+class ItemStockService:
+    """The `item_stock` ledger: one running stock counter per item.
+
+    Every write that changes a term of the stock formula (see `ItemStock`)
+    adds its delta here before committing, so the counters move in the same
+    transaction as the orders, intakes and reservations they summarize:
+
+    - an inventory order line counts while redeemed (`add`);
+    - an intake consumes its quantity once, or once per booking of its
+      service (`add`, with `bookings` for the current count);
+    - a booking consumes the intakes of its service (`book`).
+
+    The methods never commit. Deltas are upserts ordered by item id, so
+    concurrent writers only wait on the counters they share. `rebuild`
+    recomputes every counter from scratch, for data written behind the
+    services' back (seeding, manual fixes).
+
+    Each counter also carries its item's low-stock `threshold`; the items
+    under it form the low-stock set (`is_low`), read through a partial index.
+    """
+
+    @staticmethod
+    def _upsert(session: AsyncSession):
+        dialect = session.get_bind().dialect.name
+        return (pg_insert if dialect == "postgresql" else sqlite_insert)(ItemStock)
+
+    @staticmethod
+    def is_low():
+        """The low-stock predicate; the WHERE of the partial index `ix_item_stock_low`."""
+        return ItemStock.quantity < ItemStock.threshold
+
+    @staticmethod
+    def _accumulate(stmt):
+        return stmt.on_conflict_do_update(
+            index_elements=[ItemStock.itemId],
+            set_={"quantity": ItemStock.quantity + stmt.excluded.quantity},
+        )
+
+    @staticmethod
+    async def add(session: AsyncSession, deltas: Dict[int, int]) -> None:
+        """Add `deltas` ({itemId: quantity}) to the items' counters."""
+        rows = [
+            {"itemId": item_id, "quantity": delta}
+            for item_id, delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return
+        stmt = ItemStockService._upsert(session).values(rows)
+        await session.exec(ItemStockService._accumulate(stmt))
+
+    @staticmethod
+    async def book(session: AsyncSession, bookings: Dict[Optional[str], int]) -> None:
+        """Apply a change of the services' booking counts ({serviceId: +n/-n}).
+
+        One statement: the intakes of those services are summed per item in
+        the database and accumulated into the counters. On Postgres the
+        services' rows are share-locked first.
+        """
+        bookings = {sid: n for sid, n in bookings.items() if sid is not None and n}
+        if not bookings:
+            return
+        if session.get_bind().dialect.name == "postgresql":
+            # an intake of these services being written holds their rows
+            # (see `intake_delta`); wait for it so the sum below includes it
+            await session.exec(
+                select(Service.id)
+                .where(Service.id.in_(bookings))
+                .order_by(Service.id)
+                .with_for_update(read=True)
+            )
+        consumed = func.sum(ItemIntake.quantity * case(bookings, value=ItemIntake.serviceId))
+        per_item = (
+            select(ItemIntake.itemId, -consumed)
+            .where(ItemIntake.serviceId.in_(bookings))
+            .group_by(ItemIntake.itemId)
+            .order_by(ItemIntake.itemId)
+        )
+        stmt = ItemStockService._upsert(session).from_select(
+            ["itemId", "quantity"], per_item
+        )
+        await session.exec(ItemStockService._accumulate(stmt))
+
+    @staticmethod
+    async def set_threshold(session: AsyncSession, item_id: int, threshold: int) -> None:
+        """Set the low-stock threshold of an item, creating its counter if missing."""
+        stmt = ItemStockService._upsert(session).values(itemId=item_id, threshold=threshold)
+        await session.exec(
+            stmt.on_conflict_do_update(
+                index_elements=[ItemStock.itemId],
+                set_={"threshold": stmt.excluded.threshold},
+            )
+        )
+
+    @staticmethod
+    async def count_low(session: AsyncSession) -> int:
+        """Number of items under their low-stock threshold, counted off the partial index."""
+        res = await session.exec(
+            select(func.count()).select_from(ItemStock).where(ItemStockService.is_low())
+        )
+        return res.one()
+
+    @staticmethod
+    async def bookings(session: AsyncSession, service_id: str) -> int:
+        """Number of bookings of a service, i.e. how often its intakes count."""
+        res = await session.exec(
+            select(func.count(Reservation.id)).where(Reservation.serviceId == service_id)
+        )
+        return res.one()
+
+    @staticmethod
+    async def intake_delta(intake: ItemIntake, session: AsyncSession) -> int:
+        """What `intake` takes from its item's stock as things stand.
+
+        On Postgres the intake's service row and its item's counter are locked
+        (FOR UPDATE, in that order) until commit before the bookings are
+        counted: a booking in flight is waited for and counted, and one that
+        comes later waits in `book` and then sees the intake.
+        """
+        locking = session.get_bind().dialect.name == "postgresql"
+        if locking and intake.serviceId is not None:
+            await session.exec(
+                select(Service.id).where(Service.id == intake.serviceId).with_for_update()
+            )
+        if locking:
+            # no counter yet: a concurrent first delta conflicts on the insert
+            await session.exec(
+                select(ItemStock.itemId)
+                .where(ItemStock.itemId == intake.itemId)
+                .with_for_update()
+            )
+        if intake.serviceId is None:
+            return -intake.quantity
+        return -intake.quantity * await ItemStockService.bookings(session, intake.serviceId)
+
+    @staticmethod
+    def levels_query():
+        """Stock of every item computed from the source tables, as (itemId, quantity)."""
+        ordered = (
+            select(
+                InventoryOrder.idItem.label("itemId"),
+                func.sum(InventoryOrder.quantity).label("qty"),
+            )
+            .where(InventoryOrder.redeemed == True)
+            .group_by(InventoryOrder.idItem)
+            .subquery("ordered")
+        )
+        booked = (
+            select(Reservation.serviceId, func.count(Reservation.id).label("n"))
+            .where(Reservation.serviceId != None)
+            .group_by(Reservation.serviceId)
+            .subquery("booked")
+        )
+        times = case(
+            (ItemIntake.serviceId == None, literal(1)),
+            else_=func.coalesce(booked.c.n, 0),
+        )
+        consumed = (
+            select(ItemIntake.itemId, func.sum(ItemIntake.quantity * times).label("qty"))
+            .outerjoin(booked, booked.c.serviceId == ItemIntake.serviceId)
+            .group_by(ItemIntake.itemId)
+            .subquery("consumed")
+        )
+        return (
+            select(
+                Item.id,
+                func.coalesce(ordered.c.qty, 0) - func.coalesce(consumed.c.qty, 0),
+            )
+            .outerjoin(ordered, ordered.c.itemId == Item.id)
+            .outerjoin(consumed, consumed.c.itemId == Item.id)
+            .order_by(Item.id)
+        )
+
+    @staticmethod
+    async def rebuild(session: AsyncSession) -> int:
+        """Recompute every counter from the source tables; returns the item count.
+
+        Thresholds are kept; items without a counter get the default one.
+        """
+        # counters of deleted items, where the FK cascade is not enforced
+        await session.exec(delete(ItemStock).where(ItemStock.itemId.not_in(select(Item.id))))
+        stmt = ItemStockService._upsert(session).from_select(
+            ["itemId", "quantity"], ItemStockService.levels_query()
+        )
+        res = await session.exec(
+            stmt.on_conflict_do_update(
+                index_elements=[ItemStock.itemId],
+                set_={"quantity": stmt.excluded.quantity},
+            )
+        )
+        return res.rowcount
@@ -1,13 +1,18 @@
 from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 from sqlmodel import select
+from sqlalchemy import update
 from sqlalchemy.orm import selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import Order, OrderCreate, OrderUpdate, InventoryOrder, InventoryOrderCreate
+from app.services.item_stock import ItemStockService
+from app.services.repository import Repository
 
 
-class OrderService:
+class OrderService(Repository[Order]):
+    model = Order
+
     @staticmethod
     async def list_orders(session: AsyncSession) -> List[Order]:
         # Return only orders where current time is between orderDate and deliveryDate
@@ -85,45 +90,41 @@ class OrderService:
     async def update_order(
         order_id: int, order_in: OrderUpdate, session: AsyncSession
     ) -> Optional[Order]:
-        res = await session.exec(select(Order).where(Order.id == order_id))
-        order = res.first()
-        if not order:
-            return None
-        data = order_in.dict(exclude_unset=True)
-        for key, value in data.items():
-            setattr(order, key, value)
-        session.add(order)
-        await session.commit()
-        await session.refresh(order)
+        order = await OrderService.update_returning(
+            order_id, order_in.dict(exclude_unset=True), session
+        )
+        if order is not None:
+            # OrderRead lists the order lines
+            await session.refresh(order, ["items"])
         return order
 
     @staticmethod
     async def delete_order(order_id: int, session: AsyncSession) -> bool:
-        res = await session.exec(select(Order).where(Order.id == order_id))
-        order = res.first()
-        if not order:
-            return False
-        await session.delete(order)
-        await session.commit()
-        return True
+        return await OrderService.delete_returning(order_id, session) is not None
 
     @staticmethod
     async def redeem_order(order_id: int, session: AsyncSession) -> Optional[Order]:
         """Mark all inventory orders for this order as redeemed."""
+        # one UPDATE for every pending line instead of loading and flushing each;
+        # what it received goes into the item_stock counters
+        res = await session.exec(
+            update(InventoryOrder)
+            .where(InventoryOrder.idOrder == order_id, InventoryOrder.redeemed == False)
+            .values(redeemed=True)
+            .returning(InventoryOrder.idItem, InventoryOrder.quantity)
+        )
+        received = {}
+        for item_id, quantity in res.all():
+            received[item_id] = received.get(item_id, 0) + quantity
+        await ItemStockService.add(session, received)
         res = await session.exec(
             select(Order)
             .where(Order.id == order_id)
             .options(selectinload(Order.items))
+            .execution_options(populate_existing=True)
         )
         order = res.first()
         if not order:
             return None
-        
-        # Update all inventory orders to redeemed=True
-        for item in order.items:
-            item.redeemed = True
-            session.add(item)
-        
         await session.commit()
-        await session.refresh(order)
         return order
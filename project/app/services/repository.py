@@ -0,0 +1,71 @@
+from typing import Any, ClassVar, Dict, Generic, Optional, Type, TypeVar
+
+from sqlalchemy import delete, inspect, update
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+
+class Repository(Generic[ModelT]):
+    """Single-statement writes by primary key, shared by the services.
+
+    A service subclasses it with its table model (``model = Deposit``) and
+    writes through `update_returning` / `delete_returning`: the row is
+    changed and read back by one ``UPDATE … RETURNING`` / ``DELETE …
+    RETURNING`` round trip instead of SELECT → setattr → flush → refresh
+    (Postgres, and SQLite from 3.35). A returned entity replaces the state of
+    any copy already loaded in the session.
+
+    The DELETE runs in the database only: ORM cascades and the nulling of
+    loaded children do not happen, so callers clear dependent rows first.
+    """
+
+    model: ClassVar[Type[SQLModel]]
+
+    @classmethod
+    def _key(cls):
+        return inspect(cls.model).primary_key[0]
+
+    @classmethod
+    async def update_returning(
+        cls,
+        pk: Any,
+        values: Dict[str, Any],
+        session: AsyncSession,
+        commit: bool = True,
+    ) -> Optional[ModelT]:
+        """Set `values` on the row with primary key `pk`; None when there is none.
+
+        With ``commit=False`` the caller commits (or adds more statements to
+        the same transaction). An empty `values` only reads the row.
+        """
+        if not values:
+            res = await session.exec(select(cls.model).where(cls._key() == pk))
+            return res.first()
+        stmt = (
+            update(cls.model)
+            .where(cls._key() == pk)
+            .values(**values)
+            .returning(cls.model)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        row = (await session.exec(stmt)).first()
+        if row is None:
+            return None
+        if commit:
+            await session.commit()
+        return row[0]
+
+    @classmethod
+    async def delete_returning(
+        cls, pk: Any, session: AsyncSession, commit: bool = True
+    ) -> Optional[ModelT]:
+        """Delete the row with primary key `pk` and return it; None when there is none."""
+        stmt = delete(cls.model).where(cls._key() == pk).returning(cls.model)
+        row = (await session.exec(stmt)).first()
+        if row is None:
+            return None
+        if commit:
+            await session.commit()
+        return row[0]
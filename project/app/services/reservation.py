@@ -1,6 +1,13 @@
-from typing import List, Optional
+import base64
+import json
+import uuid
+from typing import Awaitable, Dict, List, Optional, Tuple
 from datetime import datetime, date, time, timedelta, timezone
 from sqlmodel import select
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, and_, delete, func, insert, literal, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -8,20 +15,140 @@ from app.models import (
     Reservation,
     ReservationCreate,
     ReservationUpdate,
+    ReservationBulkRead,
+    ReservationConflictRead,
+    ReservationTombstone,
+    BanquetSeat,
+    Service,
     VenueAccount,
     Spirit,
 )
 from app.models import DateRequest
+from app.services.banquet import BanquetService
+from app.services.banquet_occupancy import as_utc
+from app.services.item_stock import ItemStockService
+from app.services.repository import Repository
+from app.services.reservation_cache import days_between, reservation_cache
 from app.core.tools import logger
 
 # Use UTC for all datetime handling
 
+# Page size of GET /reservation/ when no limit is given, and its upper bound
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Columns returned by the compact reservation view
+COMPACT_COLUMNS = (
+    Reservation.id,
+    Reservation.accountId,
+    Reservation.serviceId,
+    Reservation.seatId,
+    Reservation.startTime,
+    Reservation.endTime,
+    Reservation.isRedeemed,
+    Reservation.updatedAt,
+)
+
+# How long tombstones of deleted reservations are kept for the changes feed;
+# a client whose last sync is older must reload the full list
+CHANGES_RETENTION = timedelta(days=30)
+# updatedAt/deletedAt are the start time of the writing transaction, which may
+# commit later: the feed holds back changes younger than this, the longest a
+# reservation write is expected to stay uncommitted
+CHANGES_SETTLE = timedelta(seconds=30)
+
+# Exclusion constraints guarding against double booking (Postgres only; on a
+# partitioned table each partition has its own, see reservation_partition)
+BOOKING_CONFLICTS = {
+    "reservation_seat_no_overlap": "Seat is already booked for an overlapping time",
+    "reservation_service_no_overlap": "Service is already booked for an overlapping time",
+}
+EXCLUSION_VIOLATION = "23P01"
+OVERLAP_CONFLICT = "Already booked for an overlapping time"
+# Largest number of rows accepted by POST /reservation/bulk
+MAX_BULK_RESERVATIONS = 500
+
+
+class ReservationService(Repository[Reservation]):
+    model = Reservation
 
-class ReservationService:
     @staticmethod
-    async def list_reservations(
-        filters: Optional[dict], session: AsyncSession
-    ) -> List[Reservation]:
+    def _seat_snapshot(r: Reservation) -> tuple:
+        # what the banquet occupancy index needs to know about a row
+        return (r.id, r.seatId, r.accountId, r.startTime, r.endTime)
+
+    @staticmethod
+    def _booking_conflict(error: IntegrityError) -> Optional[str]:
+        orig = error.orig
+        code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+        if code != EXCLUSION_VIOLATION:
+            return None
+        for constraint, detail in BOOKING_CONFLICTS.items():
+            # partitions carry their own copy: reservation_p202610_seat_no_overlap
+            if constraint.removeprefix("reservation_") in str(orig):
+                return detail
+        return None
+
+    @staticmethod
+    async def _commit_booking(session: AsyncSession, write: Optional[Awaitable] = None):
+        """Commit a reservation write, reporting an overlapping booking as 409.
+
+        Overlaps are rejected by the database itself (exclusion constraints on
+        the booked interval per seat / per seatless service), so concurrent
+        requests for the same slot cannot both succeed and need no lock or
+        retry here: the loser's commit fails and is rolled back. A statement
+        executed eagerly (`write`, e.g. an UPDATE … RETURNING) is awaited
+        inside the same guard and its result returned.
+        """
+        try:
+            result = await write if write is not None else None
+            await session.commit()
+            return result
+        except IntegrityError as e:
+            await session.rollback()
+            detail = ReservationService._booking_conflict(e)
+            if detail is None:
+                raise
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+    @staticmethod
+    def _datetime_window(filters: Optional[dict]) -> Optional[Tuple[datetime, datetime]]:
+        """The [start, end) range of `startTime` selected by the `datetime` filter."""
+        val = (filters or {}).get("datetime")
+        if val is None or val == "":
+            return None
+        # `datetime` filter may be a date (YYYY-MM-DD) or a full ISO datetime.
+        # - If it's a date, return reservations whose startTime falls within that Bogotá date (00:00-23:59 Bogotá).
+        # - If it's a full datetime, return reservations whose startTime is within 1 hour of that datetime.
+        # Note: A Bogotá date 2024-12-10 spans UTC 2024-12-10 05:00 to 2024-12-11 04:59:59
+        logger.debug(f"Filtering reservations by datetime: {val}")
+        try:
+            if isinstance(val, str):
+                if len(val) <= 10 and "-" in val:
+                    # date string (YYYY-MM-DD) interpreted as UTC date
+                    d = date.fromisoformat(val)
+                    start_dt = datetime.combine(d, time.min).replace(tzinfo=timezone.utc)
+                    return start_dt, start_dt + timedelta(days=1)
+                # full ISO datetime string, interpret as UTC
+                dt = datetime.fromisoformat(val)
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+                return dt, dt + timedelta(hours=1)
+            if isinstance(val, datetime):
+                dt = val
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+                return dt, dt + timedelta(hours=1)
+            if isinstance(val, date):
+                start_dt = datetime.combine(val, time.min).replace(tzinfo=timezone.utc)
+                return start_dt, start_dt + timedelta(days=1)
+        except Exception:
+            raise ValueError("Invalid datetime filter format")
+        # unknown type; ignore the filter
+        return None
+
+    @staticmethod
+    def _filtered_query(filters: Optional[dict]):
         q = select(Reservation)
         if filters:
             if (
@@ -36,84 +163,439 @@ class ReservationService:
                 and filters["serviceId"] != ""
             ):
                 q = q.where(Reservation.serviceId == filters["serviceId"])
-            if (
-                "datetime" in filters
-                and filters["datetime"] is not None
-                and filters["datetime"] != ""
-            ):
-                # `datetime` filter may be a date (YYYY-MM-DD) or a full ISO datetime.
-                # - If it's a date, return reservations whose startTime falls within that Bogotá date (00:00-23:59 Bogotá).
-                # - If it's a full datetime, return reservations whose startTime is within 1 hour of that datetime.
-                # Note: A Bogotá date 2024-12-10 spans UTC 2024-12-10 05:00 to 2024-12-11 04:59:59
-                val = filters["datetime"]
-                logger.debug(f"Filtering reservations by datetime: {val}")
-                try:
-                    if isinstance(val, str):
-                        if len(val) <= 10 and "-" in val:
-                            # date string (YYYY-MM-DD) interpreted as UTC date
-                            d = date.fromisoformat(val)
-                            start_dt = datetime.combine(d, time.min).replace(
-                                tzinfo=timezone.utc
-                            )
-                            end_dt = start_dt + timedelta(days=1)
-                            q = q.where(Reservation.startTime >= start_dt).where(
-                                Reservation.startTime < end_dt
-                            )
-                        else:
-                            # full ISO datetime string, interpret as UTC
-                            dt = datetime.fromisoformat(val)
-                            if dt.tzinfo is None:
-                                dt = dt.replace(tzinfo=timezone.utc)
-                            end_dt = dt + timedelta(hours=1)
-                            q = q.where(Reservation.startTime >= dt).where(
-                                Reservation.startTime < end_dt
-                            )
-                    elif isinstance(val, datetime):
-                        dt = val
-                        if dt.tzinfo is None:
-                            dt = dt.replace(tzinfo=timezone.utc)
-                        end_dt = dt + timedelta(hours=1)
-                        q = q.where(Reservation.startTime >= dt).where(
-                            Reservation.startTime < end_dt
-                        )
-                    elif isinstance(val, date):
-                        d = val
-                        start_dt = datetime.combine(d, time.min).replace(
-                            tzinfo=timezone.utc
-                        )
-                        end_dt = start_dt + timedelta(days=1)
-                        q = q.where(Reservation.startTime >= start_dt).where(
-                            Reservation.startTime < end_dt
-                        )
-                    else:
-                        # unknown type; ignore the filter
-                        pass
-                except Exception:
-                    raise ValueError("Invalid datetime filter format")
-        q = q.options(
+            window = ReservationService._datetime_window(filters)
+            if window is not None:
+                q = q.where(Reservation.startTime >= window[0]).where(
+                    Reservation.startTime < window[1]
+                )
+        return q
+
+    @staticmethod
+    def _with_relations(q):
+        return q.options(
             selectinload(Reservation.account)
             .selectinload(VenueAccount.spirit)
             .selectinload(Spirit.type),
             selectinload(Reservation.service),
             selectinload(Reservation.seat),
         )
-        res = await session.exec(q)
+
+    @staticmethod
+    async def _fetch_view(q, view: str, session: AsyncSession) -> list:
+        if view == "compact":
+            # plain columns: no ORM entities, no relationship loading
+            res = await session.execute(q.with_only_columns(*COMPACT_COLUMNS))
+            return [dict(row._mapping) for row in res.all()]
+        if view != "full":
+            raise ValueError(f"Unknown view {view!r}")
+        res = await session.exec(ReservationService._with_relations(q))
         return res.all()
 
+    @staticmethod
+    def _cache_scope(filters: Optional[dict]) -> Optional[Tuple[tuple, Tuple[date, ...]]]:
+        """(cache key, day buckets) of a day-scoped query, or None if it is not cacheable."""
+        window = ReservationService._datetime_window(filters)
+        if window is None:
+            return None
+        f = filters or {}
+        key = (f.get("accountId") or None, f.get("serviceId") or None, window)
+        return key, days_between(*window)
+
+    @staticmethod
+    def _detach(row) -> dict:
+        """Plain-dict copy of a full-view reservation and its loaded relations.
+
+        Nothing in the result refers back to the session that loaded `row`, so
+        it can be kept in `reservation_cache` and shared between requests.
+        """
+        if isinstance(row, dict):
+            return row
+        out = row.model_dump()
+        out["service"] = row.service.model_dump() if row.service is not None else None
+        out["seat"] = row.seat.model_dump() if row.seat is not None else None
+        account = row.account
+        if account is not None:
+            spirit = account.spirit
+            out["account"] = {
+                **account.model_dump(),
+                "spirit": None if spirit is None else {
+                    **spirit.model_dump(),
+                    "type": spirit.type.model_dump() if spirit.type is not None else None,
+                },
+            }
+        else:
+            out["account"] = None
+        return out
+
+    @staticmethod
+    async def _cached(key: tuple, days: Tuple[date, ...], fetch) -> List[dict]:
+        """Serve `key` from `reservation_cache`, running `fetch()` on a miss.
+
+        Rows are stored (and returned, on a hit or a miss alike) as plain
+        dicts, see `_detach`.
+        """
+        generation = reservation_cache.generation
+        rows = reservation_cache.get(key)
+        if rows is None:
+            rows = [ReservationService._detach(r) for r in await fetch()]
+            reservation_cache.put(key, days, rows, generation)
+        return rows
+
+    @staticmethod
+    def _invalidate_days(*starts: Optional[datetime]) -> None:
+        # drop cached reads of the days these reservations start on
+        reservation_cache.invalidate_days(as_utc(s).date() for s in starts if s is not None)
+
+    @staticmethod
+    async def list_reservations(
+        filters: Optional[dict], session: AsyncSession, view: str = "full"
+    ) -> List[Reservation]:
+        """List matching reservations.
+
+        `view="full"` returns entities with account -> spirit -> type, service
+        and seat loaded; `view="compact"` returns flat dicts of
+        `COMPACT_COLUMNS` from a single column SELECT. Queries filtered by
+        `datetime` are served from `reservation_cache`; their full-view rows
+        are plain dicts of the same shape (see `_detach`).
+        """
+        q = ReservationService._filtered_query(filters)
+        scope = ReservationService._cache_scope(filters)
+        if scope is None:
+            return await ReservationService._fetch_view(q, view, session)
+        return await ReservationService._cached(
+            ("list", view, scope[0]),
+            scope[1],
+            lambda: ReservationService._fetch_view(q, view, session),
+        )
+
+    @staticmethod
+    def _encode_cursor(start: datetime, reservation_id: str) -> str:
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        raw = json.dumps([start.astimezone(timezone.utc).isoformat(), reservation_id])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            start, reservation_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(start), str(reservation_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    async def list_reservations_page(
+        filters: Optional[dict],
+        session: AsyncSession,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        view: str = "full",
+    ) -> Tuple[List[Reservation], Optional[str]]:
+        """Return one page of reservations ordered by (startTime, id).
+
+        Pages are keyset-based: `cursor` is the `next_cursor` of the previous
+        page and resumes strictly after its last row, so the cost of a page
+        does not depend on how deep into the history it is. Relations are only
+        loaded for the rows of the page, and not at all for `view="compact"`
+        (see `list_reservations`).
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        q = ReservationService._filtered_query(filters)
+        if cursor:
+            after_start, after_id = ReservationService._decode_cursor(cursor)
+            q = q.where(
+                tuple_(Reservation.startTime, Reservation.id)
+                > tuple_(literal(after_start, DateTime(timezone=True)), literal(after_id))
+            )
+        q = q.order_by(Reservation.startTime, Reservation.id).limit(limit + 1)
+        scope = ReservationService._cache_scope(filters)
+        if scope is None:
+            rows = await ReservationService._fetch_view(q, view, session)
+        else:
+            rows = await ReservationService._cached(
+                ("page", view, limit, cursor, scope[0]),
+                scope[1],
+                lambda: ReservationService._fetch_view(q, view, session),
+            )
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        if isinstance(last, dict):
+            key = (last["startTime"], last["id"])
+        else:
+            key = (last.startTime, last.id)
+        return rows, ReservationService._encode_cursor(*key)
+
+    @staticmethod
+    def _server_stamp(value: datetime, session: AsyncSession):
+        """Bind `value` for comparison with a server-defaulted `now()` column."""
+        bound = literal(value, DateTime(timezone=True))
+        if session.get_bind().dialect.name == "sqlite":
+            # CURRENT_TIMESTAMP is stored without fractional seconds there
+            return func.datetime(bound)
+        return bound
+
+    @staticmethod
+    def _settled_horizon(session: AsyncSession):
+        """Server time `CHANGES_SETTLE` ago, in the format of the `now()` columns."""
+        if session.get_bind().dialect.name == "sqlite":
+            return func.datetime("now", f"-{int(CHANGES_SETTLE.total_seconds())} seconds")
+        return func.now() - literal(CHANGES_SETTLE)
+
+    @staticmethod
+    async def list_changes(
+        since: Optional[datetime],
+        session: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        view: str = "full",
+    ) -> Tuple[list, List[str], str, bool]:
+        """Reservations written and ids deleted after `since` (or after `cursor`).
+
+        Rows come in (updatedAt, id) order, at most `limit` per call, and the
+        returned cursor resumes right after the last change handed out, so a
+        poller sees every write exactly once however many share a timestamp.
+        The stamps are transaction start times, so only changes older than
+        `CHANGES_SETTLE` are served: a write still uncommitted at poll time
+        would otherwise land behind the cursor and be skipped. Deletes are
+        reported from `reservation_tombstone` up to the last row of the page;
+        only `delete_reservation` writes tombstones, rows removed behind the
+        service's back (manual SQL) never show up as deleted. Returns (rows,
+        deleted ids, next cursor, has_more).
+        """
+        if cursor:
+            after_ts, after_id = ReservationService._decode_cursor(cursor)
+        elif since is not None:
+            after_ts, after_id = since, ""
+        else:
+            raise ValueError("Either since or cursor is required")
+        after_ts = as_utc(after_ts)
+        if after_ts < datetime.now(timezone.utc) - CHANGES_RETENTION:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Changes are only kept for "
+                f"{CHANGES_RETENTION.days} days; reload the full list",
+            )
+
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        stamp = ReservationService._server_stamp
+        horizon = ReservationService._settled_horizon(session)
+        q = (
+            select(Reservation)
+            .where(
+                tuple_(Reservation.updatedAt, Reservation.id)
+                > tuple_(stamp(after_ts, session), literal(after_id)),
+                Reservation.updatedAt < horizon,
+            )
+            .order_by(Reservation.updatedAt, Reservation.id)
+            .limit(limit + 1)
+        )
+        rows = await ReservationService._fetch_view(q, view, session)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        keys = [
+            (r["updatedAt"], r["id"]) if isinstance(r, dict) else (r.updatedAt, r.id)
+            for r in rows
+        ]
+
+        dq = select(ReservationTombstone.id, ReservationTombstone.deletedAt).where(
+            ReservationTombstone.deletedAt > stamp(after_ts, session),
+            ReservationTombstone.deletedAt < horizon,
+        )
+        if has_more:
+            # later deletes are reported with the page that reaches them
+            dq = dq.where(ReservationTombstone.deletedAt <= stamp(as_utc(keys[-1][0]), session))
+        res = await session.execute(dq.order_by(ReservationTombstone.deletedAt))
+        tombstones = res.all()
+
+        last_ts, last_id = keys[-1] if keys else (after_ts, after_id)
+        if tombstones and as_utc(tombstones[-1][1]) > as_utc(last_ts):
+            last_ts, last_id = tombstones[-1][1], ""
+        next_cursor = ReservationService._encode_cursor(last_ts, last_id)
+        return rows, [t[0] for t in tombstones], next_cursor, has_more
+
     @staticmethod
     async def create_reservation(
         reservation_in: ReservationCreate, session: AsyncSession
     ) -> Reservation:
         r = Reservation(**reservation_in.model_dump())
         session.add(r)
-        await session.commit()
+        await ReservationService._commit_booking(
+            session, ItemStockService.book(session, {r.serviceId: 1})
+        )
         await session.refresh(r)
+        ReservationService._invalidate_days(r.startTime)
+        await BanquetService.record_seat_change(
+            None, ReservationService._seat_snapshot(r), session
+        )
         return r
 
+    @staticmethod
+    def _booking_key(row: dict) -> Optional[tuple]:
+        # the resource an exclusion constraint guards for this row
+        if row.get("seatId") is not None:
+            return ("seat", row["seatId"])
+        if row.get("serviceId") is not None:
+            return ("service", row["serviceId"])
+        return None
+
+    @staticmethod
+    async def _booked_intervals(rows: List[dict], session: AsyncSession) -> Dict[tuple, list]:
+        """Existing bookings of the seats/seatless services in `rows`, by resource."""
+        seat_ids = {r["seatId"] for r in rows if r["seatId"] is not None}
+        service_ids = {
+            r["serviceId"]
+            for r in rows
+            if r["seatId"] is None and r["serviceId"] is not None
+        }
+        clauses = []
+        if seat_ids:
+            clauses.append(Reservation.seatId.in_(seat_ids))
+        if service_ids:
+            clauses.append(
+                and_(Reservation.seatId.is_(None), Reservation.serviceId.in_(service_ids))
+            )
+        if not clauses:
+            return {}
+        res = await session.exec(
+            select(
+                Reservation.seatId,
+                Reservation.serviceId,
+                Reservation.startTime,
+                Reservation.endTime,
+            ).where(
+                or_(*clauses),
+                Reservation.startTime < max(r["endTime"] for r in rows),
+                Reservation.endTime > min(r["startTime"] for r in rows),
+            )
+        )
+        booked: Dict[tuple, list] = {}
+        for seat_id, service_id, start, end in res.all():
+            key = ReservationService._booking_key({"seatId": seat_id, "serviceId": service_id})
+            booked.setdefault(key, []).append((as_utc(start), as_utc(end)))
+        return booked
+
+    @staticmethod
+    async def _bulk_conflicts(rows: List[dict], session: AsyncSession) -> Dict[int, str]:
+        """Position -> reason of the `rows` that cannot be booked as things stand."""
+        conflicts: Dict[int, str] = {}
+
+        # referenced rows must exist: one lookup per referenced table
+        for column, model, label in (
+            ("accountId", VenueAccount, "account"),
+            ("seatId", BanquetSeat, "seat"),
+            ("serviceId", Service, "service"),
+        ):
+            wanted = {row[column] for row in rows if row[column] is not None}
+            if not wanted:
+                continue
+            res = await session.exec(select(model.id).where(model.id.in_(wanted)))
+            known = set(res.all())
+            for i, row in enumerate(rows):
+                if i not in conflicts and row[column] is not None and row[column] not in known:
+                    conflicts[i] = f"Unknown {label} {row[column]}"
+
+        booked = await ReservationService._booked_intervals(rows, session)
+        for i, row in enumerate(rows):
+            key = ReservationService._booking_key(row)
+            if i in conflicts or key is None:
+                continue
+            start, end = as_utc(row["startTime"]), as_utc(row["endTime"])
+            taken = booked.setdefault(key, [])
+            if any(s < end and e > start for s, e in taken):
+                conflicts[i] = BOOKING_CONFLICTS[f"reservation_{key[0]}_no_overlap"]
+                continue
+            taken.append((start, end))
+        return conflicts
+
+    @staticmethod
+    async def _insert_bookings(rows: List[dict], session: AsyncSession) -> Dict[str, tuple]:
+        """INSERT `rows` and commit; returns id -> (id, createdAt, updatedAt) of those written."""
+        stmt = insert(Reservation)
+        if session.get_bind().dialect.name == "postgresql":
+            stmt = pg_insert(Reservation).on_conflict_do_nothing()
+
+        async def write():
+            res = await session.execute(
+                stmt.returning(Reservation.id, Reservation.createdAt, Reservation.updatedAt),
+                rows,
+            )
+            returned = {row[0]: row for row in res.all()}
+            booked_services: Dict[Optional[str], int] = {}
+            for row in rows:
+                if row["id"] in returned:
+                    sid = row["serviceId"]
+                    booked_services[sid] = booked_services.get(sid, 0) + 1
+            await ItemStockService.book(session, booked_services)
+            return returned
+
+        return await ReservationService._commit_booking(session, write())
+
+    @staticmethod
+    async def create_reservations(
+        reservations_in: List[ReservationCreate], session: AsyncSession
+    ) -> ReservationBulkRead:
+        """Validate and insert many reservations in one transaction.
+
+        Rows pointing at an unknown account/seat/service, or overlapping an
+        existing booking (or an earlier row of the same request) of the same
+        seat or seatless service, are reported in `conflicts` by position.
+        The rest are written with one multi-row INSERT ... RETURNING; on
+        Postgres that insert also skips rows the exclusion constraints reject
+        (a booking that raced in after the check), which are reported too.
+        A racing booking in a neighbouring month partition is caught by the
+        cross-month trigger instead, which fails the whole INSERT: the batch
+        is then checked and written once more, the racer being committed.
+        """
+        if not reservations_in:
+            return ReservationBulkRead()
+
+        rows = [r.model_dump() for r in reservations_in]
+        for retry in (False, True):
+            conflicts = await ReservationService._bulk_conflicts(rows, session)
+            accepted = {
+                i: {**row, "id": str(uuid.uuid4())}
+                for i, row in enumerate(rows)
+                if i not in conflicts
+            }
+            if not accepted:
+                returned = {}
+                break
+            try:
+                returned = await ReservationService._insert_bookings(
+                    list(accepted.values()), session
+                )
+                break
+            except HTTPException as e:
+                if retry or e.status_code != status.HTTP_409_CONFLICT:
+                    raise
+
+        created = []
+        for i, row in accepted.items():
+            if row["id"] not in returned:
+                conflicts[i] = OVERLAP_CONFLICT
+                continue
+            _, created_at, updated_at = returned[row["id"]]
+            created.append(Reservation(**row, createdAt=created_at, updatedAt=updated_at))
+
+        ReservationService._invalidate_days(*(r.startTime for r in created))
+        await BanquetService.record_seat_changes(
+            [(None, ReservationService._seat_snapshot(r)) for r in created], session
+        )
+        return ReservationBulkRead(
+            created=created,
+            conflicts=[
+                ReservationConflictRead(index=i, detail=detail)
+                for i, detail in sorted(conflicts.items())
+            ],
+        )
+
     @staticmethod
     async def get_banquet_reservations_for_date(
         payload: DateRequest, session: AsyncSession
-    ) -> List[Reservation]:
+    ) -> List[dict]:
         # Parse date (accept YYYY-MM-DD or full ISO datetime)
         try:
             if len(payload.date) <= 10 and "-" in payload.date:
@@ -127,19 +609,22 @@ class ReservationService:
         start_dt = datetime.combine(d, time.min).replace(tzinfo=timezone.utc)
         end_dt = start_dt + timedelta(days=1)
 
-        q = (
+        q = ReservationService._with_relations(
             select(Reservation)
             .where(Reservation.seatId != None)
             .where(Reservation.startTime >= start_dt)
             .where(Reservation.startTime < end_dt)
-            .options(
-                selectinload(Reservation.account),
-                selectinload(Reservation.service),
-                selectinload(Reservation.seat),
-            )
         )
-        res = await session.exec(q)
-        return res.all()
+
+        async def fetch():
+            res = await session.exec(q)
+            return res.all()
+
+        return await ReservationService._cached(("banquet", d), (d,), fetch)
+
+    @staticmethod
+    def cache_stats() -> Dict[str, float]:
+        return reservation_cache.stats()
 
     @staticmethod
     async def get_reservation(
@@ -160,28 +645,61 @@ class ReservationService:
     async def update_reservation(
         reservation_id: str, reservation_in: ReservationUpdate, session: AsyncSession
     ) -> Optional[Reservation]:
+        # the old seat and time are still needed for the cache and seat events,
+        # the old service for the item_stock counters (row locked until commit,
+        # so concurrent updates cannot both move the same booking's counts)
         res = await session.exec(
-            select(Reservation).where(Reservation.id == reservation_id)
+            select(
+                Reservation.id,
+                Reservation.seatId,
+                Reservation.accountId,
+                Reservation.startTime,
+                Reservation.endTime,
+                Reservation.serviceId,
+            )
+            .where(Reservation.id == reservation_id)
+            .with_for_update()
         )
-        r = res.first()
-        if not r:
+        row = res.first()
+        if not row:
             return None
-        data = reservation_in.model_dump(exclude_unset=True)
-        for key, value in data.items():
-            setattr(r, key, value)
-        session.add(r)
-        await session.commit()
-        await session.refresh(r)
+        before, old_service = tuple(row[:5]), row[5]
+
+        async def write():
+            r = await ReservationService.update_returning(
+                reservation_id,
+                reservation_in.model_dump(exclude_unset=True),
+                session,
+                commit=False,
+            )
+            if r is not None and r.serviceId != old_service:
+                await ItemStockService.book(session, {old_service: -1, r.serviceId: 1})
+            return r
+
+        r = await ReservationService._commit_booking(session, write())
+        if r is None:
+            return None
+        ReservationService._invalidate_days(before[3], r.startTime)
+        await BanquetService.record_seat_change(
+            before, ReservationService._seat_snapshot(r), session
+        )
         return r
 
     @staticmethod
     async def delete_reservation(reservation_id: str, session: AsyncSession) -> bool:
-        res = await session.exec(
-            select(Reservation).where(Reservation.id == reservation_id)
-        )
-        r = res.first()
-        if not r:
+        r = await ReservationService.delete_returning(reservation_id, session, commit=False)
+        if r is None:
             return False
-        await session.delete(r)
+        before = ReservationService._seat_snapshot(r)
+        await ItemStockService.book(session, {r.serviceId: -1})
+        session.add(ReservationTombstone(id=r.id))
+        await session.execute(
+            delete(ReservationTombstone).where(
+                ReservationTombstone.deletedAt
+                < datetime.now(timezone.utc) - CHANGES_RETENTION
+            )
+        )
         await session.commit()
+        ReservationService._invalidate_days(before[3])
+        await BanquetService.record_seat_change(before, None, session)
         return True
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from app.services.banquet_occupancy import as_utc
+
+
+def days_between(start: datetime, end: datetime) -> Tuple[date, ...]:
+    """UTC days touched by the half-open `startTime` range [start, end)."""
+    first = as_utc(start).date()
+    last = as_utc(end - timedelta(microseconds=1)).date()
+    return tuple(first + timedelta(days=i) for i in range((last - first).days + 1))
+
+
+class ReservationReadCache:
+    """Process-wide LRU cache of day-scoped reservation reads.
+
+    Entries are keyed by the query (filters, view, page) and tagged with the
+    UTC days of `startTime` they cover. `ReservationService` writes call
+    `invalidate_days` with the days of the rows they touched, which drops only
+    the entries of those day buckets; everything else stays warm.
+
+    Cached lists hold plain dicts shared between requests, never ORM
+    entities, so callers must treat them as read-only. Since rows embed their
+    account/spirit/service/seat data, updates and deletes of those call
+    `invalidate`. Like the other in-process caches, writes made by another
+    worker are not seen here.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[date, ...], list]]" = OrderedDict()
+        self._by_day: Dict[date, Set[Hashable]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def invalidate(self) -> None:
+        self._entries.clear()
+        self._by_day.clear()
+        self._generation += 1
+
+    def get(self, key: Hashable) -> Optional[list]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return list(entry[1])
+
+    def put(self, key: Hashable, days: Tuple[date, ...], rows: list, generation: int) -> None:
+        """Store `rows` unless a write invalidated anything since `generation` was read."""
+        if generation != self._generation:
+            return
+        self._drop(key)
+        self._entries[key] = (days, list(rows))
+        for d in days:
+            self._by_day.setdefault(d, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate_days(self, days: Iterable[date]) -> None:
+        self._generation += 1
+        for d in set(days):
+            for key in self._by_day.pop(d, ()):
+                if self._drop(key):
+                    self.invalidations += 1
+
+    def _drop(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for d in entry[0]:
+            keys = self._by_day.get(d)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_day[d]
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "days": len(self._by_day),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+reservation_cache = ReservationReadCache()
@@ -0,0 +1,113 @@
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.tools import logger
+
+# Monthly partitions kept ready ahead of the current month; later bookings
+# land in reservation_default until their month gets a partition
+PARTITION_MONTHS_AHEAD = 3
+# Months (before the current one) kept in their own partition before being
+# folded into reservation_archive
+ARCHIVE_AFTER_MONTHS = 12
+
+
+def month_start(d: date, shift: int = 0) -> date:
+    """First day of the month `shift` months after the month of `d`."""
+    months = d.year * 12 + d.month - 1 + shift
+    return date(months // 12, months % 12 + 1, 1)
+
+
+class ReservationPartitionService:
+    """Maintenance of the monthly `reservation` partitions (migration 5d1e8a3c9f26).
+
+    On Postgres `reservation` is range-partitioned by the UTC month of
+    `startTime`; the DDL lives in SQL functions created by the migration and
+    is only driven from here. `ReservationService` queries are unaware of
+    it: day/hour windows are pruned to one partition by the planner. Months
+    before the migration ran start out in reservation_archive.
+
+    On other databases, or before the migration ran, every method is a no-op.
+    """
+
+    @staticmethod
+    async def _is_partitioned(session: AsyncSession) -> bool:
+        if session.get_bind().dialect.name != "postgresql":
+            return False
+        res = await session.execute(
+            text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass('reservation')")
+        )
+        return res.scalar() == "p"
+
+    @staticmethod
+    async def ensure_partitions(
+        session: AsyncSession,
+        months_ahead: int = PARTITION_MONTHS_AHEAD,
+        today: Optional[date] = None,
+    ) -> List[str]:
+        """Create the partitions of the current month and `months_ahead` more.
+
+        Bookings of those months already sitting in reservation_default are
+        moved into their new partition. Returns the partition names.
+        """
+        if not await ReservationPartitionService._is_partitioned(session):
+            return []
+        today = today or datetime.now(timezone.utc).date()
+        names = []
+        for shift in range(months_ahead + 1):
+            res = await session.execute(
+                text("SELECT reservation_create_partition(:month)"),
+                {"month": month_start(today, shift)},
+            )
+            names.append(res.scalar())
+        await session.commit()
+        return names
+
+    @staticmethod
+    async def archive_partitions(
+        session: AsyncSession,
+        keep_months: int = ARCHIVE_AFTER_MONTHS,
+        today: Optional[date] = None,
+    ) -> List[str]:
+        """Fold monthly partitions older than `keep_months` into reservation_archive.
+
+        The archive is itself a partition of `reservation`, so archived rows
+        stay visible to every query (account history, stock and balance
+        totals); the point is keeping the number of partitions, and what the
+        "today" queries' partition has to carry, bounded. Runs under an
+        exclusive lock on `reservation`: schedule it off-peak. Returns the
+        names of the folded partitions.
+        """
+        if keep_months < 1:
+            raise ValueError("keep_months must be at least 1")
+        if not await ReservationPartitionService._is_partitioned(session):
+            return []
+        today = today or datetime.now(timezone.utc).date()
+        cutoff = month_start(today, -keep_months)
+        res = await session.execute(
+            text("SELECT reservation_archive_before(:cutoff)"), {"cutoff": cutoff}
+        )
+        archived = list(res.scalars().all())
+        await session.commit()
+        if archived:
+            logger.info(f"Archived reservation partitions before {cutoff}: {archived}")
+        return archived
+
+    @staticmethod
+    async def list_partitions(session: AsyncSession) -> List[dict]:
+        """Name, bounds and estimated row count of every reservation partition."""
+        if not await ReservationPartitionService._is_partitioned(session):
+            return []
+        res = await session.execute(
+            text(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'reservation'::regclass ORDER BY c.relname"
+            )
+        )
+        return [
+            {"name": name, "bounds": bounds, "rows": max(int(rows), 0)}
+            for name, bounds, rows in res.all()
+        ]
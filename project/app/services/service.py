@@ -1,8 +1,8 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime, date, time, timedelta, timezone
-from sqlalchemy.orm import selectinload
+from sqlalchemy import func, update
 from app.core.constants import TIME_SLOTS
 
 from app.models.service import Service as ServiceModel, ServiceCreate, ServiceUpdate
@@ -10,19 +10,73 @@ from app.models.service import Service as ServiceModel, ServiceCreate, ServiceUp
 # keep the original name for type hints and instantiation
 Service = ServiceModel
 from app.models.reservation import Reservation, ReservationRead
-from app.models.utils import ServiceSummary, ServiceWithReservations
+from app.models.item import Item
+from app.models.item_stock import ItemStock
+from app.models.item_intake import ItemIntake
+from app.models.utils import ServiceMatch, ServiceSummary, ServiceWithReservations
+from app.services.banquet import BanquetService
+from app.services.banquet_occupancy import as_utc
+from app.services.item_stock import ItemStockService
+from app.services.repository import Repository
+from app.services.reservation_cache import reservation_cache
 
+# typeahead results per request
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+
+
+class ServiceService(Repository[Service]):
+    model = Service
+
+    @staticmethod
+    def _name_matches(q: str):
+        """Case-insensitive substring match on the name, `q` taken literally."""
+        needle = q.strip().lower()
+        for ch in ("\\", "%", "_"):
+            needle = needle.replace(ch, "\\" + ch)
+        return func.lower(Service.name).like(f"%{needle}%", escape="\\")
 
-class ServiceService:
     @staticmethod
     async def list_services(
         session: AsyncSession, q: Optional[str] = None
     ) -> List[Service]:
         res = await session.exec(
-            select(Service).where(Service.name.contains(q)) if q else select(Service)
+            select(Service).where(ServiceService._name_matches(q)) if q else select(Service)
         )
         return res.all()
 
+    @staticmethod
+    async def search_services(
+        q: str, session: AsyncSession, limit: int = SEARCH_LIMIT
+    ) -> List[ServiceMatch]:
+        """Ranked name search for typeahead: the best `limit` matches of `q`.
+
+        Names starting with `q` come first, then by how early `q` appears and
+        how short the name is. On Postgres the match is served by
+        ix_service_name_trgm; only the listed columns are read.
+        """
+        needle = q.strip().lower()
+        if not needle:
+            return []
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        name = func.lower(Service.name)
+        position = (
+            func.strpos(name, needle)
+            if session.get_bind().dialect.name == "postgresql"
+            else func.instr(name, needle)
+        )
+        stmt = (
+            select(Service.id, Service.name, Service.eiltRate, Service.image)
+            .where(ServiceService._name_matches(needle))
+            .order_by(position, func.length(Service.name), Service.name)
+            .limit(limit)
+        )
+        res = await session.exec(stmt)
+        return [
+            ServiceMatch(id=id_, name=name_, eiltRate=rate, image=image)
+            for id_, name_, rate, image in res.all()
+        ]
+
     @staticmethod
     async def create_service(
         service_in: ServiceCreate, session: AsyncSession
@@ -42,92 +96,183 @@ class ServiceService:
     async def update_service(
         service_id: str, service_in: ServiceUpdate, session: AsyncSession
     ) -> Optional[Service]:
-        res = await session.exec(select(Service).where(Service.id == service_id))
-        svc = res.first()
-        if not svc:
-            return None
-        data = service_in.dict(exclude_unset=True)
-        for key, value in data.items():
-            setattr(svc, key, value)
-        session.add(svc)
-        await session.commit()
-        await session.refresh(svc)
+        svc = await ServiceService.update_returning(
+            service_id, service_in.dict(exclude_unset=True), session
+        )
+        if svc is not None:
+            # cached day reads embed the service
+            reservation_cache.invalidate()
         return svc
 
     @staticmethod
     async def delete_service(service_id: str, session: AsyncSession) -> bool:
-        res = await session.exec(select(Service).where(Service.id == service_id))
-        svc = res.first()
-        if not svc:
+        # bookings outlive their service, as the ORM delete used to leave them;
+        # they stop consuming the service's intakes
+        res = await session.exec(
+            update(Reservation)
+            .where(Reservation.serviceId == service_id)
+            .values(serviceId=None)
+        )
+        detached = res.rowcount
+        await ItemStockService.book(session, {service_id: -detached})
+        if await ServiceService.delete_returning(service_id, session) is None:
             return False
-        await session.delete(svc)
-        await session.commit()
+        if detached:
+            # cached day reads still carry the serviceId
+            reservation_cache.invalidate()
         return True
 
     @staticmethod
-    async def get_available_time_slots(
-        service_id: str, date_payload: str, session: AsyncSession
-    ) -> List[str]:
-        """Return TIME_SLOTS that are not in the past and not reserved for the service on the date."""
+    def _parse_date(date_payload: str) -> date:
+        """Accept YYYY-MM-DD or a full ISO datetime."""
         try:
             if len(date_payload) <= 10 and "-" in date_payload:
-                d = date.fromisoformat(date_payload)
-            else:
-                d = datetime.fromisoformat(date_payload).date()
+                return date.fromisoformat(date_payload)
+            return datetime.fromisoformat(date_payload).date()
         except Exception:
             raise ValueError("Invalid date format")
 
-        bogota_tz = timezone(timedelta(hours=-5))
-        today_bogota = datetime.now(timezone.utc).astimezone(bogota_tz).date()
-        if d < today_bogota:
-            return []
+    @staticmethod
+    async def get_available_time_slots(
+        service_id: str, date_payload: str, session: AsyncSession
+    ) -> List[str]:
+        """Return TIME_SLOTS that are not in the past and not reserved for the service on the date."""
+        slots = await ServiceService.get_available_time_slots_batch(
+            date_payload, session, [service_id]
+        )
+        return slots[service_id]
 
-        is_today = d == today_bogota
-        now_utc = datetime.now(timezone.utc) if is_today else None
+    @staticmethod
+    async def get_available_time_slots_batch(
+        date_payload: str,
+        session: AsyncSession,
+        service_ids: Optional[Iterable[str]] = None,
+    ) -> Dict[str, List[str]]:
+        """Return a {serviceId: [slots]} map of the free TIME_SLOTS on the date.
+
+        Covers `service_ids`, or every service when None. The slot grid is
+        built once and the day's bookings of all those services come from a
+        single reservation query; each service is then checked in memory.
+        """
+        d = ServiceService._parse_date(date_payload)
+        if service_ids is None:
+            res = await session.exec(select(Service.id))
+            service_ids = res.all()
+        service_ids = list(dict.fromkeys(service_ids))
+        windows = BanquetService._slot_windows(d)
+        if not windows or not service_ids:
+            return {sid: [] for sid in service_ids}
 
         start_dt = datetime.combine(d, time.min).replace(tzinfo=timezone.utc)
         end_dt = start_dt + timedelta(days=1)
-
         q = (
-            select(Reservation)
-            .where(Reservation.serviceId == service_id)
+            select(Reservation.serviceId, Reservation.startTime, Reservation.endTime)
+            .where(Reservation.serviceId.in_(service_ids))
             .where(Reservation.startTime >= start_dt)
             .where(Reservation.startTime < end_dt)
         )
         res = await session.exec(q)
-        reservations = res.all()
+        booked: Dict[str, list] = {}
+        for sid, res_start, res_end in res.all():
+            if res_start is None:
+                continue
+            res_start = as_utc(res_start)
+            res_end = as_utc(res_end) if res_end else res_start + timedelta(hours=1)
+            booked.setdefault(sid, []).append((res_start, res_end))
 
-        available: List[str] = []
+        return {
+            sid: [
+                slot
+                for slot, slot_start, slot_end in windows
+                if not any(
+                    s < slot_end and e > slot_start for s, e in booked.get(sid, ())
+                )
+            ]
+            for sid in service_ids
+        }
 
-        for slot in TIME_SLOTS:
-            try:
-                slot_time = datetime.strptime(slot, "%I:%M %p").time()
-            except Exception:
-                continue
+    @staticmethod
+    def _stock_check_query(service_ids: Optional[List[str]] = None):
+        """One row per (service, item intake) with the item's stock.
 
-            slot_start_local = datetime.combine(d, slot_time).replace(tzinfo=bogota_tz)
-            slot_start = slot_start_local.astimezone(timezone.utc)
-            slot_end = slot_start + timedelta(hours=1)
+        The stock is the item's item_stock counter (see ItemStockService), so
+        nothing is aggregated here. Services without intakes still get a row
+        (all NULLs), which also tells an existing service without needs from
+        a missing one.
+        """
+        q = (
+            select(
+                Service.id,
+                ItemIntake.itemId,
+                Item.name,
+                ItemIntake.quantity,
+                func.coalesce(ItemStock.quantity, 0).label("available"),
+            )
+            .outerjoin(ItemIntake, ItemIntake.serviceId == Service.id)
+            .outerjoin(Item, Item.id == ItemIntake.itemId)
+            .outerjoin(ItemStock, ItemStock.itemId == ItemIntake.itemId)
+            .order_by(Service.id, ItemIntake.id)
+        )
+        if service_ids is not None:
+            q = q.where(Service.id.in_(service_ids))
+        return q
 
-            if is_today and now_utc is not None and slot_end <= now_utc:
-                continue
+    @staticmethod
+    def _availability_report(insufficient: List[dict]) -> dict:
+        is_available = len(insufficient) == 0
+        message = (
+            "All items are in stock" if is_available
+            else f"{len(insufficient)} item(s) have insufficient stock"
+        )
+        return {
+            "isAvailable": is_available,
+            "insufficientItems": insufficient,
+            "message": message,
+        }
 
-            slot_taken = False
-            for r in reservations:
-                if r.startTime is None:
-                    continue
-                res_start = r.startTime
-                res_end = getattr(r, "endTime", None) or (
-                    res_start + timedelta(hours=1)
-                )
-                if res_start < slot_end and res_end > slot_start:
-                    slot_taken = True
-                    break
+    @staticmethod
+    async def check_availability_batch(
+        session: AsyncSession, service_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, dict]:
+        """Inventory check of `service_ids` (every service when None) in one query.
 
-            if not slot_taken:
-                available.append(slot)
+        Returns {serviceId: {isAvailable, insufficientItems, message}}; an
+        item is insufficient when its available stock is below what one
+        booking of the service takes. Unknown service ids are left out.
+        """
+        if service_ids is not None:
+            service_ids = list(dict.fromkeys(service_ids))
+        res = await session.exec(ServiceService._stock_check_query(service_ids))
+        insufficient: Dict[str, List[dict]] = {}
+        for service_id, item_id, item_name, required, available in res.all():
+            items = insufficient.setdefault(service_id, [])
+            if item_id is None:
+                continue
+            available = int(available or 0)
+            if item_name is None:
+                items.append({
+                    "itemId": item_id,
+                    "itemName": f"Unknown Item {item_id}",
+                    "requiredQuantity": required,
+                    "availableQuantity": 0,
+                })
+            elif available < required:
+                items.append({
+                    "itemId": item_id,
+                    "itemName": item_name,
+                    "requiredQuantity": required,
+                    "availableQuantity": available,
+                })
+        return {
+            sid: ServiceService._availability_report(items)
+            for sid, items in insufficient.items()
+        }
 
-        return available
+    @staticmethod
+    async def check_availability(service_id: str, session: AsyncSession) -> Optional[dict]:
+        """Whether the service's items are in stock for a booking; None if the service does not exist."""
+        report = await ServiceService.check_availability_batch(session, [service_id])
+        return report.get(service_id)
 
     @staticmethod
     async def today_reservations_per_service(
@@ -138,34 +283,22 @@ class ServiceService:
         start_dt = datetime.combine(today, time.min).replace(tzinfo=timezone.utc)
         end_dt = start_dt + timedelta(days=1)
 
-        # Fetch reservations for today and their services
+        # every service with today's booking count (zero included)
+        bookings = func.count(Reservation.id)
         q = (
-            select(Reservation)
-            .where(Reservation.startTime >= start_dt)
-            .where(Reservation.startTime < end_dt)
-            .options(selectinload(Reservation.service))
+            select(Service, bookings)
+            .outerjoin(
+                Reservation,
+                (Reservation.serviceId == Service.id)
+                & (Reservation.startTime >= start_dt)
+                & (Reservation.startTime < end_dt),
+            )
+            .group_by(Service.id)
         )
         res = await session.exec(q)
-        reservations = res.all()
-
-        # Build a mapping serviceId -> list of reservations
-        groups: dict[str, list[Reservation]] = {}
-        for r in reservations:
-            sid = r.serviceId or (
-                getattr(r.service, "id", None) if getattr(r, "service", None) else None
-            )
-            if sid is None:
-                continue
-            groups.setdefault(sid, []).append(r)
-
-        # Load all services and return a summary per-service (count may be zero)
-        svc_q = select(ServiceModel)
-        svc_res = await session.exec(svc_q)
-        svcs = svc_res.all()
 
         out: List[ServiceWithReservations] = []
-        for svc in svcs:
-            rlist = groups.get(svc.id, [])
+        for svc, count in res.all():
             svc_summary = ServiceSummary(
                 id=svc.id,
                 name=svc.name,
@@ -176,7 +309,7 @@ class ServiceService:
             out.append(
                 ServiceWithReservations(
                     service=svc_summary,
-                    reservations_count=len(rlist),
+                    reservations_count=count,
                 )
             )
 
@@ -6,9 +6,14 @@ from datetime import datetime
 
 from app.models.spirit import Spirit, SpiritCreate, SpiritUpdate, SpiritRead
 from app.models import VenueAccount
+from app.services.banquet_occupancy import occupancy_index
+from app.services.reservation_cache import reservation_cache
+from app.services.repository import Repository
 
 
-class SpiritService:
+class SpiritService(Repository[Spirit]):
+    model = Spirit
+
     @staticmethod
     async def list_spirits(session: AsyncSession) -> List[SpiritRead]:
         res = await session.exec(select(Spirit).options(selectinload(Spirit.type)))
@@ -67,24 +72,19 @@ class SpiritService:
     async def update_spirit(
         spirit_id: int, spirit_in: SpiritUpdate, session: AsyncSession
     ) -> Optional[Spirit]:
-        res = await session.exec(select(Spirit).where(Spirit.id == spirit_id))
-        s = res.first()
-        if not s:
-            return None
-        data = spirit_in.dict(exclude_unset=True)
-        for key, value in data.items():
-            setattr(s, key, value)
-        session.add(s)
-        await session.commit()
-        await session.refresh(s)
-        return s
+        spirit = await SpiritService.update_returning(
+            spirit_id, spirit_in.dict(exclude_unset=True), session
+        )
+        if spirit is not None:
+            # seated occupants and cached reservation reads carry the spirit and its type
+            occupancy_index.invalidate()
+            reservation_cache.invalidate()
+        return spirit
 
     @staticmethod
     async def delete_spirit(spirit_id: int, session: AsyncSession) -> bool:
-        res = await session.exec(select(Spirit).where(Spirit.id == spirit_id))
-        s = res.first()
-        if not s:
+        if await SpiritService.delete_returning(spirit_id, session) is None:
             return False
-        await session.delete(s)
-        await session.commit()
+        occupancy_index.invalidate()
+        reservation_cache.invalidate()
         return True
@@ -3,9 +3,14 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.spirit_type import SpiritType, SpiritTypeCreate, SpiritTypeUpdate
+from app.services.banquet_occupancy import occupancy_index
+from app.services.reservation_cache import reservation_cache
+from app.services.repository import Repository
 
 
-class SpiritTypeService:
+class SpiritTypeService(Repository[SpiritType]):
+    model = SpiritType
+
     @staticmethod
     async def list_spirit_types(session: AsyncSession) -> List[SpiritType]:
         res = await session.exec(select(SpiritType))
@@ -34,28 +39,19 @@ class SpiritTypeService:
     async def update_spirit_type(
         spirit_type_id: str, spirit_type_in: SpiritTypeUpdate, session: AsyncSession
     ) -> Optional[SpiritType]:
-        res = await session.exec(
-            select(SpiritType).where(SpiritType.id == spirit_type_id)
+        spirit_type = await SpiritTypeService.update_returning(
+            spirit_type_id, spirit_type_in.dict(exclude_unset=True), session
         )
-        st = res.first()
-        if not st:
-            return None
-        data = spirit_type_in.dict(exclude_unset=True)
-        for key, value in data.items():
-            setattr(st, key, value)
-        session.add(st)
-        await session.commit()
-        await session.refresh(st)
-        return st
+        if spirit_type is not None:
+            # seated occupants and cached reservation reads carry their spirit's type
+            occupancy_index.invalidate()
+            reservation_cache.invalidate()
+        return spirit_type
 
     @staticmethod
     async def delete_spirit_type(spirit_type_id: str, session: AsyncSession) -> bool:
-        res = await session.exec(
-            select(SpiritType).where(SpiritType.id == spirit_type_id)
-        )
-        st = res.first()
-        if not st:
+        if await SpiritTypeService.delete_returning(spirit_type_id, session) is None:
             return False
-        await session.delete(st)
-        await session.commit()
+        occupancy_index.invalidate()
+        reservation_cache.invalidate()
         return True
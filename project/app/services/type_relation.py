@@ -1,4 +1,5 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
+import numpy as np
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -7,9 +8,132 @@ from app.models.type_relation import (
     TypeRelationCreate,
     TypeRelationUpdate,
 )
+from app.services.repository import Repository
 
 
-class TypeRelationService:
+class CompatibilityMatrix:
+    """Dense, in-process lookup of the relation between every pair of spirit types.
+
+    The matrix is built from the whole `type_relation` table in one SELECT and
+    then served from memory until `invalidate()` is called. Lookups follow the
+    same rules as `TypeRelationService.get_relation_between`: the direct
+    (source -> target) row wins, otherwise the inverse row is used, and a
+    missing pair means "allow".
+
+    The cache lives in the worker process, so writes made by another worker
+    only become visible here after that process invalidates or restarts.
+    """
+
+    DEFAULT_RELATION = "allow"
+    # int8 codes used by the vectorized seat evaluator
+    ALLOW, SEPARATION, FORBIDDEN = 0, 1, 2
+    RELATION_CODES = {"allow": ALLOW, "separation": SEPARATION, "forbidden": FORBIDDEN}
+
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self._matrix: List[List[str]] = []
+        self._codes = np.zeros((0, 0), dtype=np.int8)
+        self._loaded = False
+        self._generation = 0
+        self.hits = 0
+        self.reloads = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def invalidate(self) -> None:
+        self._loaded = False
+        self._generation += 1
+
+    async def ensure_loaded(self, session: AsyncSession) -> "CompatibilityMatrix":
+        if not self._loaded:
+            await self.reload(session)
+        return self
+
+    async def reload(self, session: AsyncSession) -> None:
+        generation = self._generation
+        res = await session.exec(select(TypeRelation))
+        rows = res.all()
+
+        index: Dict[str, int] = {}
+        for tr in rows:
+            for type_id in (str(tr.source_type_id), str(tr.target_type_id)):
+                if type_id not in index:
+                    index[type_id] = len(index)
+
+        size = len(index)
+        direct: List[List[Optional[str]]] = [[None] * size for _ in range(size)]
+        for tr in rows:
+            i = index[str(tr.source_type_id)]
+            j = index[str(tr.target_type_id)]
+            # keep the first row for a pair, like `.first()` does
+            if direct[i][j] is None:
+                direct[i][j] = getattr(tr.relation, "value", tr.relation)
+
+        matrix = [
+            [
+                direct[i][j] or direct[j][i] or self.DEFAULT_RELATION
+                for j in range(size)
+            ]
+            for i in range(size)
+        ]
+
+        self._install(index, matrix)
+        self.reloads += 1
+        # a write that invalidated us while the SELECT was running wins
+        self._loaded = generation == self._generation
+
+    def _install(self, index: Dict[str, int], matrix: List[List[str]]) -> None:
+        size = len(index)
+        self._index = index
+        self._matrix = matrix
+        self._codes = np.array(
+            [[self.RELATION_CODES.get(r, self.ALLOW) for r in row] for row in matrix],
+            dtype=np.int8,
+        ).reshape(size, size)
+
+    def index_of(self, type_id) -> Optional[int]:
+        if type_id is None:
+            return None
+        return self._index.get(str(type_id))
+
+    def relation(self, source_type_id, target_type_id) -> str:
+        """Return the relation name between two spirit types without touching the DB."""
+        self.hits += 1
+        i = self.index_of(source_type_id)
+        j = self.index_of(target_type_id)
+        if i is None or j is None:
+            return self.DEFAULT_RELATION
+        return self._matrix[i][j]
+
+    def codes_for(self, source_type_id) -> Optional[np.ndarray]:
+        """Relation codes from one type to every indexed type, or None if unknown.
+
+        Row `i` of the result is the code of `relation(source_type_id, t)` for
+        the type `t` with `index_of(t) == i`.
+        """
+        self.hits += 1
+        i = self.index_of(source_type_id)
+        if i is None:
+            return None
+        return self._codes[i]
+
+    def stats(self) -> Dict[str, Union[int, bool]]:
+        return {
+            "hits": self.hits,
+            "reloads": self.reloads,
+            "types": len(self._index),
+            "loaded": self._loaded,
+        }
+
+
+compatibility_matrix = CompatibilityMatrix()
+
+
+class TypeRelationService(Repository[TypeRelation]):
+    model = TypeRelation
+
     @staticmethod
     async def list_type_relations(session: AsyncSession) -> List[TypeRelation]:
         res = await session.exec(select(TypeRelation))
@@ -22,6 +146,7 @@ class TypeRelationService:
         tr = TypeRelation(**tr_in.dict())
         session.add(tr)
         await session.commit()
+        compatibility_matrix.invalidate()
         await session.refresh(tr)
         return tr
 
@@ -36,33 +161,33 @@ class TypeRelationService:
     async def update_type_relation(
         tr_id: int, tr_in: TypeRelationUpdate, session: AsyncSession
     ) -> Optional[TypeRelation]:
-        res = await session.exec(select(TypeRelation).where(TypeRelation.id == tr_id))
-        tr = res.first()
-        if not tr:
-            return None
         data = tr_in.dict(exclude_unset=True)
         # support both the model field names and older id_type1/id_type2 keys
         if "id_type1" in data:
             data["source_type_id"] = data.pop("id_type1")
         if "id_type2" in data:
             data["target_type_id"] = data.pop("id_type2")
-        for key, value in data.items():
-            setattr(tr, key, value)
-        session.add(tr)
-        await session.commit()
-        await session.refresh(tr)
+        tr = await TypeRelationService.update_returning(tr_id, data, session)
+        if tr is not None:
+            compatibility_matrix.invalidate()
         return tr
 
     @staticmethod
     async def delete_type_relation(tr_id: int, session: AsyncSession) -> bool:
-        res = await session.exec(select(TypeRelation).where(TypeRelation.id == tr_id))
-        tr = res.first()
-        if not tr:
+        if await TypeRelationService.delete_returning(tr_id, session) is None:
             return False
-        await session.delete(tr)
-        await session.commit()
+        compatibility_matrix.invalidate()
         return True
 
+    @staticmethod
+    async def get_compatibility_matrix(session: AsyncSession) -> CompatibilityMatrix:
+        """Return the shared relation matrix, loading it on first use or after a write."""
+        return await compatibility_matrix.ensure_loaded(session)
+
+    @staticmethod
+    def compatibility_stats() -> Dict[str, Union[int, bool]]:
+        return compatibility_matrix.stats()
+
     @staticmethod
     async def get_relation_between(
         source_type_id: str, target_type_id: str, session: AsyncSession
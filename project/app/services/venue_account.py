@@ -15,9 +15,14 @@ from app.models import (
     Reservation,
     Service,
 )
+from app.services.banquet_occupancy import occupancy_index
+from app.services.reservation_cache import reservation_cache
+from app.services.repository import Repository
 
 
-class VenueAccountService:
+class VenueAccountService(Repository[VenueAccount]):
+    model = VenueAccount
+
     @staticmethod
     async def _compute_account_balance(
         acct: VenueAccount, session: AsyncSession
@@ -138,28 +143,19 @@ class VenueAccountService:
     async def update_account(
         account_id: str, account_in: VenueAccountUpdate, session: AsyncSession
     ) -> Optional[VenueAccount]:
-        res = await session.exec(
-            select(VenueAccount).where(VenueAccount.id == account_id)
+        account = await VenueAccountService.update_returning(
+            account_id, account_in.dict(exclude_unset=True), session
         )
-        acct = res.first()
-        if not acct:
-            return None
-        data = account_in.dict(exclude_unset=True)
-        for key, value in data.items():
-            setattr(acct, key, value)
-        session.add(acct)
-        await session.commit()
-        await session.refresh(acct)
-        return acct
+        if account is not None:
+            # seated occupants and cached reservation reads embed the account
+            occupancy_index.invalidate()
+            reservation_cache.invalidate()
+        return account
 
     @staticmethod
     async def delete_account(account_id: str, session: AsyncSession) -> bool:
-        res = await session.exec(
-            select(VenueAccount).where(VenueAccount.id == account_id)
-        )
-        acct = res.first()
-        if not acct:
+        if await VenueAccountService.delete_returning(account_id, session) is None:
             return False
-        await session.delete(acct)
-        await session.commit()
+        occupancy_index.invalidate()
+        reservation_cache.invalidate()
         return True
@@ -0,0 +1,54 @@
+"""item stock ledger
+
+Revision ID: 2e7a9c4f1b60
+Revises: 8f2c6b1e4d37
+Create Date: 2026-10-18 09:14:26.530871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e7a9c4f1b60'
+down_revision = '8f2c6b1e4d37'
+branch_labels = None
+depends_on = None
+
+# same formula as ItemStockService.levels_query
+BACKFILL = """
+INSERT INTO item_stock ("itemId", quantity)
+SELECT item.id, COALESCE(ordered.qty, 0) - COALESCE(consumed.qty, 0)
+FROM item
+LEFT OUTER JOIN (
+    SELECT "idItem" AS "itemId", SUM(quantity) AS qty
+    FROM inventory_order WHERE redeemed GROUP BY "idItem"
+) AS ordered ON ordered."itemId" = item.id
+LEFT OUTER JOIN (
+    SELECT item_intake."itemId", SUM(item_intake.quantity * CASE
+        WHEN item_intake."serviceId" IS NULL THEN 1 ELSE COALESCE(booked.n, 0) END
+    ) AS qty
+    FROM item_intake
+    LEFT OUTER JOIN (
+        SELECT "serviceId", COUNT(id) AS n FROM reservation
+        WHERE "serviceId" IS NOT NULL GROUP BY "serviceId"
+    ) AS booked ON booked."serviceId" = item_intake."serviceId"
+    GROUP BY item_intake."itemId"
+) AS consumed ON consumed."itemId" = item.id
+"""
+
+
+def upgrade() -> None:
+    op.create_table('item_stock',
+    sa.Column('itemId', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['itemId'], ['item.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('itemId')
+    )
+    # Counters only move with the services' writes from here on: deploy the
+    # code that maintains them together with this migration.
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.drop_table('item_stock')
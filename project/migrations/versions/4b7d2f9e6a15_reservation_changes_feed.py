@@ -0,0 +1,46 @@
+"""reservation changes feed: updatedAt index and tombstones
+
+Revision ID: 4b7d2f9e6a15
+Revises: 9e4b1d7c2a58
+Create Date: 2026-10-17 14:21:07.118342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7d2f9e6a15'
+down_revision = '9e4b1d7c2a58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('reservation_tombstone',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('deletedAt', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_reservation_tombstone_deletedAt', 'reservation_tombstone',
+        ['deletedAt'], unique=False,
+    )
+    # CONCURRENTLY keeps reservation writable while the index builds
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_reservation_updatedAt_id', 'reservation',
+            ['updatedAt', 'id'], unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_reservation_updatedAt_id', table_name='reservation',
+            postgresql_concurrently=True,
+        )
+    op.drop_index('ix_reservation_tombstone_deletedAt', table_name='reservation_tombstone')
+    op.drop_table('reservation_tombstone')
@@ -0,0 +1,34 @@
+"""item low stock threshold
+
+Revision ID: 4b8d2f6a1c93
+Revises: 2e7a9c4f1b60
+Create Date: 2026-10-18 16:42:08.194275
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b8d2f6a1c93'
+down_revision = '2e7a9c4f1b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # existing items keep the former dashboard-wide threshold
+    op.add_column('item_stock', sa.Column(
+        'threshold', sa.Integer(), nullable=False, server_default='12'
+    ))
+    # the low-stock set: only counters under their threshold are indexed
+    op.create_index(
+        'ix_item_stock_low', 'item_stock', ['itemId'],
+        postgresql_where=sa.text('quantity < threshold'),
+        sqlite_where=sa.text('quantity < threshold'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_item_stock_low', table_name='item_stock')
+    op.drop_column('item_stock', 'threshold')
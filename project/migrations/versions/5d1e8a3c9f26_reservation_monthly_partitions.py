@@ -0,0 +1,276 @@
+"""reservation monthly range partitions and archive partition
+
+Revision ID: 5d1e8a3c9f26
+Revises: 4b7d2f9e6a15
+Create Date: 2026-10-17 16:40:52.207316
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1e8a3c9f26'
+down_revision = '4b7d2f9e6a15'
+branch_labels = None
+depends_on = None
+
+BOOKED_RANGE = """tstzrange("startTime", "endTime", '[)')"""
+# months partitioned ahead of the current one at migration time
+MONTHS_AHEAD = 3
+
+INDEXES = (
+    ('ix_reservation_serviceId_startTime', '("serviceId", "startTime")'),
+    ('ix_reservation_seatId_startTime_endTime', '("seatId", "startTime", "endTime")'),
+    ('ix_reservation_accountId', '("accountId")'),
+    ('ix_reservation_banquet_startTime', '("startTime") WHERE ("seatId" IS NOT NULL)'),
+    ('ix_reservation_updatedAt_id', '("updatedAt", id)'),
+)
+FOREIGN_KEYS = (
+    ('reservation_accountId_fkey', 'accountId', 'venue_account'),
+    ('reservation_seatId_fkey', 'seatId', 'banquet_seat'),
+    ('reservation_serviceId_fkey', 'serviceId', 'service'),
+)
+
+# Postgres 15 has no exclusion constraints on a partitioned parent: every
+# partition carries its own pair, named <partition>_seat_no_overlap and
+# <partition>_service_no_overlap.
+ADD_NO_OVERLAP = """
+CREATE FUNCTION reservation_add_no_overlap(part text) RETURNS void
+LANGUAGE plpgsql AS $$
+BEGIN
+    EXECUTE format(
+        'ALTER TABLE %I ADD CONSTRAINT %I EXCLUDE USING gist '
+        '("seatId" WITH =, tstzrange("startTime", "endTime", ''[)'') WITH &&) '
+        'WHERE ("seatId" IS NOT NULL)',
+        part, part || '_seat_no_overlap');
+    EXECUTE format(
+        'ALTER TABLE %I ADD CONSTRAINT %I EXCLUDE USING gist '
+        '("serviceId" WITH =, tstzrange("startTime", "endTime", ''[)'') WITH &&) '
+        'WHERE ("seatId" IS NULL AND "serviceId" IS NOT NULL)',
+        part, part || '_service_no_overlap');
+END $$
+"""
+
+# Create and attach the partition of the UTC month containing `month`,
+# moving its rows out of reservation_default first. Returns its name.
+CREATE_PARTITION = """
+CREATE FUNCTION reservation_create_partition(month date) RETURNS text
+LANGUAGE plpgsql AS $$
+DECLARE
+    first_day date := date_trunc('month', month)::date;
+    lo timestamptz := first_day::timestamp AT TIME ZONE 'UTC';
+    hi timestamptz := (first_day + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+    part text := 'reservation_p' || to_char(first_day, 'YYYYMM');
+BEGIN
+    IF to_regclass(part) IS NOT NULL THEN
+        RETURN part;
+    END IF;
+    EXECUTE format('CREATE TABLE %I (LIKE reservation INCLUDING DEFAULTS)', part);
+    IF to_regclass('reservation_default') IS NOT NULL THEN
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM reservation_default '
+            'WHERE "startTime" >= %L AND "startTime" < %L RETURNING *) '
+            'INSERT INTO %I SELECT * FROM moved',
+            lo, hi, part);
+    END IF;
+    -- a matching CHECK lets ATTACH skip validating the rows
+    EXECUTE format(
+        'ALTER TABLE %I ADD CONSTRAINT %I CHECK ("startTime" >= %L AND "startTime" < %L)',
+        part, part || '_bounds', lo, hi);
+    EXECUTE format(
+        'ALTER TABLE reservation ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        part, lo, hi);
+    EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', part, part || '_bounds');
+    PERFORM reservation_add_no_overlap(part);
+    RETURN part;
+END $$
+"""
+
+# Fold every monthly partition before the UTC month of `cutoff` into
+# reservation_archive, which stays attached: rows remain visible through
+# reservation, only the number of partitions shrinks. Returns the folded
+# partition names.
+ARCHIVE_BEFORE = """
+CREATE FUNCTION reservation_archive_before(cutoff date) RETURNS SETOF text
+LANGUAGE plpgsql AS $$
+DECLARE
+    hi timestamptz := date_trunc('month', cutoff)::timestamp AT TIME ZONE 'UTC';
+    archive_hi timestamptz;
+    part text;
+BEGIN
+    SELECT coalesce(
+        substring(pg_get_expr(c.relpartbound, c.oid) FROM 'TO \\(''([^'']+)''\\)')::timestamptz,
+        '-infinity')
+    INTO archive_hi
+    FROM pg_class c WHERE c.oid = 'reservation_archive'::regclass;
+    IF hi <= archive_hi THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE reservation DETACH PARTITION reservation_archive;
+    FOR part IN
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'reservation'::regclass
+          AND c.relname ~ '^reservation_p[0-9]{6}$'
+          AND to_date(substr(c.relname, 14), 'YYYYMM') < date_trunc('month', cutoff)
+        ORDER BY c.relname
+    LOOP
+        EXECUTE format('ALTER TABLE reservation DETACH PARTITION %I', part);
+        EXECUTE format('INSERT INTO reservation_archive SELECT * FROM %I', part);
+        EXECUTE format('DROP TABLE %I', part);
+        RETURN NEXT part;
+    END LOOP;
+    -- months that never got a partition sit in the default one
+    WITH moved AS (
+        DELETE FROM reservation_default WHERE "startTime" < hi RETURNING *
+    ) INSERT INTO reservation_archive SELECT * FROM moved;
+
+    ALTER TABLE reservation_archive DROP CONSTRAINT IF EXISTS reservation_archive_bounds;
+    EXECUTE format(
+        'ALTER TABLE reservation_archive ADD CONSTRAINT reservation_archive_bounds '
+        'CHECK ("startTime" < %L)', hi);
+    EXECUTE format(
+        'ALTER TABLE reservation ATTACH PARTITION reservation_archive '
+        'FOR VALUES FROM (MINVALUE) TO (%L)', hi);
+END $$
+"""
+
+# Exclusion constraints only see their own partition. A booking can still
+# clash with one starting in the previous month (that runs past the month
+# end) or in the next month (if this one does): check those under a
+# per-resource lock, so two such inserts cannot both pass. Assumes no
+# booking is longer than 31 days.
+NO_CROSS_MONTH_OVERLAP = """
+CREATE FUNCTION reservation_no_cross_month_overlap() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    lo timestamptz := date_trunc('month', NEW."startTime" AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    hi timestamptz := (date_trunc('month', NEW."startTime" AT TIME ZONE 'UTC')
+                       + interval '1 month') AT TIME ZONE 'UTC';
+    booked tstzrange := tstzrange(NEW."startTime", NEW."endTime", '[)');
+    constraint_name text;
+BEGIN
+    IF NEW."seatId" IS NOT NULL THEN
+        PERFORM pg_advisory_xact_lock(hashtext('reservation_seat'), NEW."seatId");
+        PERFORM 1 FROM reservation r
+        WHERE r."seatId" = NEW."seatId" AND r.id <> NEW.id
+          AND ((r."startTime" >= lo - interval '31 days' AND r."startTime" < lo)
+               OR (r."startTime" >= hi AND r."startTime" < NEW."endTime"))
+          AND tstzrange(r."startTime", r."endTime", '[)') && booked;
+        constraint_name := 'reservation_seat_no_overlap';
+    ELSIF NEW."serviceId" IS NOT NULL THEN
+        PERFORM pg_advisory_xact_lock(hashtext('reservation_service:' || NEW."serviceId"));
+        PERFORM 1 FROM reservation r
+        WHERE r."seatId" IS NULL AND r."serviceId" = NEW."serviceId" AND r.id <> NEW.id
+          AND ((r."startTime" >= lo - interval '31 days' AND r."startTime" < lo)
+               OR (r."startTime" >= hi AND r."startTime" < NEW."endTime"))
+          AND tstzrange(r."startTime", r."endTime", '[)') && booked;
+        constraint_name := 'reservation_service_no_overlap';
+    ELSE
+        RETURN NEW;
+    END IF;
+    IF FOUND THEN
+        RAISE EXCEPTION 'conflicting key value violates exclusion constraint "%"', constraint_name
+            USING ERRCODE = 'exclusion_violation', CONSTRAINT = constraint_name,
+                  TABLE = 'reservation';
+    END IF;
+    RETURN NEW;
+END $$
+"""
+
+FUNCTIONS = (ADD_NO_OVERLAP, CREATE_PARTITION, ARCHIVE_BEFORE, NO_CROSS_MONTH_OVERLAP)
+
+DROP_FUNCTIONS = (
+    'reservation_no_cross_month_overlap()',
+    'reservation_archive_before(date)',
+    'reservation_create_partition(date)',
+    'reservation_add_no_overlap(text)',
+)
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    # Rewrites the table under an exclusive lock: run in a maintenance window.
+    op.execute('ALTER TABLE reservation RENAME TO reservation_unpartitioned')
+    op.execute(
+        'CREATE TABLE reservation (LIKE reservation_unpartitioned INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE ("startTime")'
+    )
+    for function in FUNCTIONS:
+        op.execute(function)
+
+    # cold history (empty for now), one partition per month from the oldest
+    # booking to MONTHS_AHEAD months from now, and a default partition for
+    # bookings further ahead
+    op.execute(f"""
+        DO $$
+        DECLARE
+            first_month date := date_trunc('month', coalesce(
+                (SELECT min("startTime") FROM reservation_unpartitioned), now()) AT TIME ZONE 'UTC');
+            month date;
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE reservation_archive PARTITION OF reservation '
+                'FOR VALUES FROM (MINVALUE) TO (%L)',
+                first_month::timestamp AT TIME ZONE 'UTC');
+            PERFORM reservation_add_no_overlap('reservation_archive');
+            month := first_month;
+            WHILE month <= date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{MONTHS_AHEAD} months' LOOP
+                PERFORM reservation_create_partition(month);
+                month := month + interval '1 month';
+            END LOOP;
+        END $$
+    """)
+    op.execute('CREATE TABLE reservation_default PARTITION OF reservation DEFAULT')
+    op.execute("SELECT reservation_add_no_overlap('reservation_default')")
+
+    op.execute('INSERT INTO reservation SELECT * FROM reservation_unpartitioned')
+    op.execute('DROP TABLE reservation_unpartitioned')
+
+    # the partition key has to be part of the primary key
+    op.execute('ALTER TABLE reservation ADD PRIMARY KEY (id, "startTime")')
+    for name, column, target in FOREIGN_KEYS:
+        op.execute(
+            f'ALTER TABLE reservation ADD CONSTRAINT "{name}" '
+            f'FOREIGN KEY ("{column}") REFERENCES {target} (id)'
+        )
+    for name, columns in INDEXES:
+        op.execute(f'CREATE INDEX "{name}" ON reservation {columns}')
+    op.execute(
+        'CREATE TRIGGER reservation_no_cross_month_overlap '
+        'BEFORE INSERT OR UPDATE OF "seatId", "serviceId", "startTime", "endTime" '
+        'ON reservation FOR EACH ROW EXECUTE FUNCTION reservation_no_cross_month_overlap()'
+    )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.execute('ALTER TABLE reservation RENAME TO reservation_partitioned')
+    op.execute(
+        'CREATE TABLE reservation (LIKE reservation_partitioned INCLUDING DEFAULTS)'
+    )
+    op.execute('INSERT INTO reservation SELECT * FROM reservation_partitioned')
+    op.execute('DROP TABLE reservation_partitioned CASCADE')
+    for fn in DROP_FUNCTIONS:
+        op.execute(f'DROP FUNCTION {fn}')
+
+    op.execute('ALTER TABLE reservation ADD PRIMARY KEY (id)')
+    for name, column, target in FOREIGN_KEYS:
+        op.execute(
+            f'ALTER TABLE reservation ADD CONSTRAINT "{name}" '
+            f'FOREIGN KEY ("{column}") REFERENCES {target} (id)'
+        )
+    for name, columns in INDEXES:
+        op.execute(f'CREATE INDEX "{name}" ON reservation {columns}')
+    op.execute(
+        'ALTER TABLE reservation ADD CONSTRAINT reservation_seat_no_overlap '
+        f'EXCLUDE USING gist ("seatId" WITH =, {BOOKED_RANGE} WITH &&) '
+        'WHERE ("seatId" IS NOT NULL)'
+    )
+    op.execute(
+        'ALTER TABLE reservation ADD CONSTRAINT reservation_service_no_overlap '
+        f'EXCLUDE USING gist ("serviceId" WITH =, {BOOKED_RANGE} WITH &&) '
+        'WHERE ("seatId" IS NULL AND "serviceId" IS NOT NULL)'
+    )
@@ -0,0 +1,59 @@
+"""reservation time-window indexes
+
+Revision ID: 7c2e4a9d1f03
+Revises: bc5bfd6f5320
+Create Date: 2026-10-17 10:12:44.301917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e4a9d1f03'
+down_revision = 'bc5bfd6f5320'
+branch_labels = None
+depends_on = None
+
+SEATED = sa.text('"seatId" IS NOT NULL')
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps reservation writable while the indexes build; it
+    # cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_reservation_serviceId_startTime', 'reservation',
+            ['serviceId', 'startTime'], unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_reservation_seatId_startTime_endTime', 'reservation',
+            ['seatId', 'startTime', 'endTime'], unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_reservation_accountId', 'reservation',
+            ['accountId'], unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_reservation_banquet_startTime', 'reservation',
+            ['startTime'], unique=False,
+            postgresql_where=SEATED, sqlite_where=SEATED,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in (
+            'ix_reservation_banquet_startTime',
+            'ix_reservation_accountId',
+            'ix_reservation_seatId_startTime_endTime',
+            'ix_reservation_serviceId_startTime',
+        ):
+            op.drop_index(
+                name, table_name='reservation',
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,36 @@
+"""service name trigram index
+
+Revision ID: 8f2c6b1e4d37
+Revises: 5d1e8a3c9f26
+Create Date: 2026-10-17 23:05:41.207619
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8f2c6b1e4d37'
+down_revision = '5d1e8a3c9f26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    # gin_trgm_ops serves the lower(name) LIKE '%q%' of
+    # ServiceService.search_services, whatever the position of q in the name
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY keeps service writable while the index builds
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_service_name_trgm '
+            'ON service USING gin (lower(name) gin_trgm_ops)'
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_service_name_trgm')
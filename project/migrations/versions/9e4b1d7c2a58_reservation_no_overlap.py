@@ -0,0 +1,42 @@
+"""reservation no-overlap exclusion constraints
+
+Revision ID: 9e4b1d7c2a58
+Revises: 7c2e4a9d1f03
+Create Date: 2026-10-17 11:02:19.554813
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4b1d7c2a58'
+down_revision = '7c2e4a9d1f03'
+branch_labels = None
+depends_on = None
+
+BOOKED_RANGE = """tstzrange("startTime", "endTime", '[)')"""
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    # gist needs btree_gist for the plain equality on seatId/serviceId.
+    # Fails if overlapping bookings already exist; resolve those first.
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.execute(
+        'ALTER TABLE reservation ADD CONSTRAINT reservation_seat_no_overlap '
+        f'EXCLUDE USING gist ("seatId" WITH =, {BOOKED_RANGE} WITH &&) '
+        'WHERE ("seatId" IS NOT NULL)'
+    )
+    op.execute(
+        'ALTER TABLE reservation ADD CONSTRAINT reservation_service_no_overlap '
+        f'EXCLUDE USING gist ("serviceId" WITH =, {BOOKED_RANGE} WITH &&) '
+        'WHERE ("seatId" IS NULL AND "serviceId" IS NOT NULL)'
+    )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.drop_constraint('reservation_service_no_overlap', 'reservation')
+    op.drop_constraint('reservation_seat_no_overlap', 'reservation')
@@ -15,6 +15,22 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 
+@pytest.fixture(autouse=True)
+def reset_inprocess_caches():
+    """Drop process-wide caches so one test's mocked data never leaks into another."""
+    from app.services.type_relation import compatibility_matrix
+    from app.services.banquet_occupancy import occupancy_index
+    from app.services.reservation_cache import reservation_cache
+
+    compatibility_matrix.invalidate()
+    occupancy_index.invalidate()
+    reservation_cache.invalidate()
+    yield
+    compatibility_matrix.invalidate()
+    occupancy_index.invalidate()
+    reservation_cache.invalidate()
+
+
 @pytest.fixture
 def async_session_mock():
     """Provide a simple mocked AsyncSession with common methods used by services."""
@@ -29,6 +45,8 @@ def async_session_mock():
     session.exec = AsyncMock(side_effect=fake_exec)
     session.add = MagicMock()
     session.commit = AsyncMock()
+    session.flush = AsyncMock()
     session.refresh = AsyncMock()
     session.delete = AsyncMock()
+    session.execute = AsyncMock()
     return session
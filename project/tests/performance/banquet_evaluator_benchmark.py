@@ -0,0 +1,165 @@
+"""Benchmark the NumPy seat evaluator against the per-seat Python loop.
+
+Builds synthetic banquet floors from 10 to 5,000 seats, checks that
+`BanquetService._evaluate_slot` returns exactly the payload of the previous
+loop-based evaluator, and prints the time per slot of:
+
+- payload: the `list_available_seats` response for one slot;
+- free seat: the yes/no check run for every slot of the availability calendar.
+
+Run from `project/`:
+
+    python tests/performance/banquet_evaluator_benchmark.py [--seats 10,100,5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.services.banquet import BanquetService  # noqa: E402
+from app.services.banquet_occupancy import (  # noqa: E402
+    FloorArrays,
+    SlotOccupancy,
+    TableLayout,
+)
+from app.services.type_relation import CompatibilityMatrix  # noqa: E402
+
+SEATS_PER_TABLE = 10
+TYPES = [str(i) for i in range(1, 9)]
+
+
+def loop_evaluate_slot(layout, occupancy, typeId, matrix):
+    """The per-seat evaluator this benchmark compares against."""
+    out_tables = []
+    for t in layout:
+        tbl = t.as_dict()
+        occupies = []
+        occ = occupancy.get(t.id)
+
+        seats_out = []
+        for pos, seat_id in enumerate(t.seat_ids):
+            seat_d = {
+                "seatNumber": t.seat_numbers[pos],
+                "id": seat_id,
+                "tableId": t.id,
+            }
+            first = occ.first(pos) if occ is not None else None
+            if first:
+                seat_d["reservationId"] = first[0]
+                seat_d["available"] = False
+                seat_d["spirit"] = first[1]
+            seats_out.append(seat_d)
+
+        for i, seat_d in enumerate(seats_out):
+            nextSeat = seats_out[i + 1] if i + 1 < len(seats_out) else seats_out[0]
+            pastSeat = seats_out[i - 1] if i - 1 >= 0 else seats_out[-1]
+            if seat_d.get("spirit", None):
+                sp = seat_d["spirit"]
+                relation = matrix.relation(typeId, sp["typeId"])
+                if relation == "forbidden":
+                    tbl["available"] = False
+                elif relation == "separation":
+                    pastSeat["available"] = False
+                    nextSeat["available"] = False
+                occupies.append(sp)
+        tbl["availableSeats"] = seats_out
+        tbl["occupies"] = occupies
+        out_tables.append(tbl)
+    return out_tables
+
+
+def loop_has_free_seat(tables):
+    for tbl in tables:
+        if tbl.get("available") is False:
+            continue
+        for seat in tbl.get("availableSeats", []):
+            if seat.get("reservationId") or seat.get("available") is False:
+                continue
+            return True
+    return False
+
+
+def build_matrix(rng):
+    names = ["allow"] * 6 + ["separation"] * 3 + ["forbidden"]
+    size = len(TYPES)
+    rows = [[rng.choice(names) for _ in range(size)] for _ in range(size)]
+    matrix = CompatibilityMatrix()
+    matrix._install({t: i for i, t in enumerate(TYPES)}, rows)
+    return matrix
+
+
+def build_floor(seats, rng, fill=0.4):
+    layout = []
+    occupancy = {}
+    seat_id = 1
+    for table_id in range(1, seats // SEATS_PER_TABLE + 1):
+        seat_rows = [(seat_id + i, i + 1) for i in range(SEATS_PER_TABLE)]
+        seat_id += SEATS_PER_TABLE
+        layout.append(TableLayout(table_id, SEATS_PER_TABLE, True, seat_rows))
+        occ = SlotOccupancy(SEATS_PER_TABLE)
+        for pos in range(SEATS_PER_TABLE):
+            if rng.random() < fill:
+                spirit = {"id": pos, "typeId": rng.choice(TYPES)}
+                occ.add(pos, f"r-{table_id}-{pos}", spirit)
+        occupancy[table_id] = occ
+    return layout, occupancy
+
+
+def bench(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seats", default="10,100,500,1000,2500,5000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    matrix = build_matrix(rng)
+    typeId = TYPES[0]
+
+    header = f"{'seats':>6} | {'payload loop':>12} | {'payload np':>10} | {'free loop':>9} | {'free np':>8}"
+    print(header)
+    print("-" * len(header))
+    for seats in [int(s) for s in args.seats.split(",")]:
+        layout, occupancy = build_floor(max(seats, SEATS_PER_TABLE), rng)
+        floor = FloorArrays(layout)
+
+        expected = loop_evaluate_slot(layout, occupancy, typeId, matrix)
+        actual = BanquetService._evaluate_slot(floor, occupancy, typeId, matrix)
+        assert actual == expected, f"payload mismatch at {seats} seats"
+        assert BanquetService._has_free_seat(
+            floor, occupancy, typeId, matrix
+        ) == loop_has_free_seat(expected)
+
+        payload_loop = bench(
+            lambda: loop_evaluate_slot(layout, occupancy, typeId, matrix), args.repeat
+        )
+        payload_np = bench(
+            lambda: BanquetService._evaluate_slot(floor, occupancy, typeId, matrix),
+            args.repeat,
+        )
+        free_loop = bench(
+            lambda: loop_has_free_seat(
+                loop_evaluate_slot(layout, occupancy, typeId, matrix)
+            ),
+            args.repeat,
+        )
+        free_np = bench(
+            lambda: BanquetService._has_free_seat(floor, occupancy, typeId, matrix),
+            args.repeat,
+        )
+        print(
+            f"{seats:>6} | {payload_loop:>9.3f} ms | {payload_np:>7.3f} ms "
+            f"| {free_loop:>6.3f} ms | {free_np:>5.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
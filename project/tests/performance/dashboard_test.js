@@ -0,0 +1,49 @@
+import http from 'k6/http';
+import { check, sleep } from 'k6';
+
+/**
+ * Benchmark de /dashboard con un salón de banquetes grande
+ *
+ * Crea mesas hasta llegar a TABLES (200 por defecto) y mide la latencia de
+ * /dashboard, cuyo costo dominante es `today_table_availability`.
+ */
+
+const BASE_URL = __ENV.BASE_URL || 'http://localhost:8004';
+const TABLES = parseInt(__ENV.TABLES || '200', 10);
+
+export const options = {
+  scenarios: {
+    dashboard_reads: {
+      executor: 'constant-vus',
+      vus: 5,
+      duration: '1m',
+    },
+  },
+  thresholds: {
+    'http_req_duration{endpoint:dashboard}': ['p(95)<300'],
+    http_req_failed: ['rate<0.01'],
+  },
+};
+
+export function setup() {
+  const res = http.get(`${BASE_URL}/banquet/table/`);
+  const existing = res.status === 200 ? res.json().length : 0;
+  for (let i = existing; i < TABLES; i++) {
+    http.post(`${BASE_URL}/banquet/table/`, JSON.stringify({ capacity: 6 }), {
+      headers: { 'Content-Type': 'application/json' },
+      tags: { type: 'setup' },
+    });
+  }
+}
+
+export default function () {
+  const res = http.get(`${BASE_URL}/dashboard`, {
+    tags: { type: 'read', endpoint: 'dashboard' },
+  });
+  check(res, {
+    'dashboard status 200': (r) => r.status === 200,
+    [`dashboard lists ${TABLES}+ tables`]: (r) =>
+      r.status === 200 && r.json().today_table_availability.length >= TABLES,
+  });
+  sleep(0.2);
+}
@@ -0,0 +1,193 @@
+"""Memory and time of listing items with their stock, at `--reservations` bookings.
+
+Seeds items, services with item intakes and `--reservations` seatless
+bookings spread over the services, then lists the items three ways:
+
+- eager graph: the old `ItemService.list_items` loading, item -> intakes ->
+  service -> reservations, so `len(service.reservations)` could be taken;
+- list_items: Item objects with their `item_stock` counter;
+- list_items_with_quantity: flat ItemRead rows from one item/item_stock scan
+  (what GET /item and the dashboard use);
+- sql counts: the stock recomputed from scratch with GROUP BY counts
+  (`ItemStockService.levels_query`, what the ledger saves on every read).
+
+For each it prints the peak Python allocation (tracemalloc), the time and the
+number of Reservation objects hydrated, and checks that all four agree. Without `--url` it runs on an in-memory
+SQLite database; a Postgres URL must point at a throwaway database (schema
+created from the models, btree_gist and pg_trgm installed). Run from `project/`:
+
+    python tests/performance/item_listing_memory_benchmark.py --reservations 100000
+"""
+
+import argparse
+import asyncio
+import os
+import pathlib
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--reservations", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=12)
+    return parser.parse_args()
+
+
+async def seed(session, args):
+    from sqlalchemy import insert
+    from sqlmodel import select
+    from app.core import seed as fixtures
+    from app.models import Item, ItemIntake, PrivateVenue, Reservation, Service, VenueAccount
+    from app.services.item_stock import ItemStockService
+
+    await fixtures.seed_spirit_types(session)
+    await fixtures.seed_spirits(session)
+    await fixtures.seed_services(session)
+    session.add(PrivateVenue(id=1))
+    for i in range(args.items):
+        session.add(Item(name=f"Item {i}", unit="pcs"))
+    await session.commit()
+    now = datetime.now(timezone.utc)
+    session.add(
+        VenueAccount(
+            id="bench",
+            spiritId=fixtures.spirit_data[0][0],
+            privateVenueId=1,
+            startTime=now,
+            endTime=now + timedelta(days=365),
+            pin="0000",
+        )
+    )
+    service_ids = sorted((await session.exec(select(Service.id))).all())
+    item_ids = sorted((await session.exec(select(Item.id))).all())
+    for i, item_id in enumerate(item_ids):
+        session.add(ItemIntake(itemId=item_id, serviceId=service_ids[i % len(service_ids)], quantity=1))
+    await session.commit()
+
+    # one-hour bookings, back to back per service: no overlaps
+    base = now.replace(minute=0, second=0, microsecond=0)
+    rows = []
+    for k in range(args.reservations):
+        start = base + timedelta(hours=k // len(service_ids))
+        rows.append(
+            {
+                "id": str(uuid.uuid4()),
+                "accountId": "bench",
+                "serviceId": service_ids[k % len(service_ids)],
+                "startTime": start,
+                "endTime": start + timedelta(hours=1),
+                "isRedeemed": False,
+                "isRated": False,
+            }
+        )
+        if len(rows) == 5000:
+            await session.execute(insert(Reservation), rows)
+            rows = []
+    if rows:
+        await session.execute(insert(Reservation), rows)
+    await ItemStockService.rebuild(session)
+    await session.commit()
+
+
+async def eager_graph(session):
+    from sqlalchemy.orm import selectinload
+    from sqlmodel import select
+    from app.models import Item, ItemIntake, Service
+
+    res = await session.exec(
+        select(Item).options(
+            selectinload(Item.inventory_orders),
+            selectinload(Item.intakes)
+            .selectinload(ItemIntake.service)
+            .selectinload(Service.reservations),
+        )
+    )
+    items = res.all()
+    # the old Item.quantity: redeemed orders - intake * len(service.reservations)
+    return items, {
+        item.id: sum(o.quantity for o in item.inventory_orders if o.redeemed)
+        - sum(
+            intake.quantity * (len(intake.service.reservations) if intake.serviceId else 1)
+            for intake in item.intakes
+        )
+        for item in items
+    }
+
+
+async def measure(Session, name, listing):
+    from app.models import Reservation
+
+    async with Session() as session:
+        tracemalloc.start()
+        started = time.perf_counter()
+        # the listed rows stay referenced until counted: the identity map is weak
+        rows, quantities = await listing(session)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        hydrated = sum(isinstance(obj, Reservation) for obj in session.identity_map.values())
+        del rows
+    return name, quantities, peak, elapsed, hydrated
+
+
+async def run(args):
+    from sqlmodel import SQLModel
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    from app.services import ItemService
+    from app.services.item_stock import ItemStockService
+
+    engine = create_async_engine(args.url)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with Session() as session:
+            await seed(session, args)
+            expected = dict((await session.exec(ItemStockService.levels_query())).all())
+
+        async def orm_items(session):
+            items = await ItemService.list_items(session)
+            return items, {i.id: i.quantity for i in items}
+
+        async def flat_rows(session):
+            items = await ItemService.list_items_with_quantity(session)
+            return items, {i.id: i.quantity for i in items}
+
+        async def sql_counts(session):
+            rows = (await session.exec(ItemStockService.levels_query())).all()
+            return rows, dict(rows)
+
+        results = [
+            await measure(Session, "eager graph", eager_graph),
+            await measure(Session, "list_items", orm_items),
+            await measure(Session, "with_quantity", flat_rows),
+            await measure(Session, "sql counts", sql_counts),
+        ]
+    finally:
+        await engine.dispose()
+
+    print(f"{args.reservations} reservations, {args.items} items")
+    print(f"{'listing':<14} | {'peak MB':>8} | {'ms':>8} | {'reservations loaded':>19}")
+    for name, quantities, peak, elapsed, hydrated in results:
+        assert quantities == expected, name
+        print(f"{name:<14} | {peak / 2**20:>8.2f} | {elapsed * 1000:>8.1f} | {hydrated:>19}")
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("DATABASE_URL", args.url)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Throughput of POST /reservation/bulk versus one POST /reservation/ per row.
+
+Books `--rows` seated reservations through `ReservationService.create_reservation`
+(commit + refresh per row) and through `ReservationService.create_reservations`
+(one transaction, one multi-row INSERT ... RETURNING), and prints rows/second
+for both. Without `--url` it runs on an in-memory SQLite database; with a
+Postgres URL (a throwaway database, schema created from the models) network
+round trips make the gap larger. Run from `project/`:
+
+    python tests/performance/reservation_bulk_benchmark.py --rows 200
+"""
+
+import argparse
+import asyncio
+import os
+import pathlib
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--rows", type=int, default=200)
+    return parser.parse_args()
+
+
+async def seed(session, seats):
+    from sqlmodel import select
+    from app.core import seed as fixtures
+    from app.models import BanquetSeat, PrivateVenue, VenueAccount
+
+    await fixtures.seed_spirit_types(session)
+    await fixtures.seed_spirits(session)
+    await fixtures.seed_banquet(seats // 6 + 1, session)
+    session.add(PrivateVenue(id=1))
+    await session.commit()
+    now = datetime.now(timezone.utc)
+    session.add(
+        VenueAccount(
+            id="bench",
+            spiritId=fixtures.spirit_data[0][0],
+            privateVenueId=1,
+            startTime=now,
+            endTime=now + timedelta(days=365),
+            pin="0000",
+        )
+    )
+    await session.commit()
+    return sorted((await session.exec(select(BanquetSeat.id))).all())
+
+
+async def run(args):
+    from sqlmodel import SQLModel
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    from app.models import ReservationCreate
+    from app.services import ReservationService
+
+    engine = create_async_engine(args.url)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with Session() as session:
+            seat_ids = await seed(session, args.rows)
+            base = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+            def batch(day):
+                start = base + timedelta(days=day)
+                return [
+                    ReservationCreate(
+                        accountId="bench",
+                        seatId=seat_id,
+                        startTime=start,
+                        endTime=start + timedelta(hours=1),
+                    )
+                    for seat_id in seat_ids[: args.rows]
+                ]
+
+            started = time.perf_counter()
+            for row in batch(1):
+                await ReservationService.create_reservation(row, session)
+            single = time.perf_counter() - started
+
+            started = time.perf_counter()
+            out = await ReservationService.create_reservations(batch(2), session)
+            bulk = time.perf_counter() - started
+            assert len(out.created) == args.rows and not out.conflicts
+    finally:
+        await engine.dispose()
+
+    print(f"{'path':<12} | {'rows':>5} | {'ms':>8} | {'rows/s':>8}")
+    for name, elapsed in (("per-request", single), ("bulk", bulk)):
+        print(f"{name:<12} | {args.rows:>5} | {elapsed * 1000:>8.1f} | {args.rows / elapsed:>8.0f}")
+    print(f"speed-up: {single / bulk:.1f}x")
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("DATABASE_URL", args.url)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
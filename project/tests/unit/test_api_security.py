@@ -59,3 +59,24 @@ async def test_admin_list_employees_protected(async_session_mock):
     assert isinstance(result, list)
     assert len(result) == 0
 
+
+
+def test_operational_endpoints_require_admin():
+    from app.main import app
+
+    guarded = {
+        ("GET", "/banquet/compatibility/stats"),
+        ("GET", "/reservation/cache/stats"),
+        ("GET", "/reservation/partitions"),
+        ("POST", "/reservation/partitions/maintain"),
+        ("POST", "/item/stock/rebuild"),
+    }
+    found = set()
+    for route in app.routes:
+        for method in getattr(route, "methods", ()):
+            key = (method, route.path.rstrip("/"))
+            if key in guarded:
+                calls = {dep.call for dep in route.dependant.dependencies}
+                assert verify_admin in calls, key
+                found.add(key)
+    assert found == guarded
@@ -35,3 +35,425 @@ async def test_list_tables_and_seats_and_availability():
     past = date(2000, 1, 1)
     slots = await BanquetService.get_available_time_slots("1", past, session)
     assert slots == []
+
+
+def _floor(seat_count=4):
+    from app.models import BanquetTable, BanquetSeat
+
+    table = BanquetTable(id=1, capacity=seat_count)
+    table.availableSeats = [
+        BanquetSeat(id=i, tableId=1, seatNumber=i) for i in range(1, seat_count + 1)
+    ]
+    return table
+
+
+def _seat_reservation(seat_id, start, type_id="2"):
+    from datetime import timedelta
+    from app.models import Reservation, VenueAccount, Spirit, SpiritType
+
+    spirit = Spirit(id=int(type_id), name="s", typeId=type_id, image="x")
+    spirit.type = SpiritType(id=type_id, name="t", kanji="k", dangerScore=1, image="x")
+    account = VenueAccount(id=f"acc-{seat_id}", spiritId=spirit.id, privateVenueId=1,
+                           startTime=start, endTime=start, pin="0")
+    account.spirit = spirit
+    r = Reservation(id=f"r-{seat_id}", accountId=account.id, seatId=seat_id,
+                    startTime=start, endTime=start + timedelta(hours=1))
+    r.account = account
+    return r
+
+
+@pytest.mark.asyncio
+async def test_available_time_slots_single_load(monkeypatch):
+    from datetime import timedelta, timezone
+    from app.services.type_relation import CompatibilityMatrix, TypeRelationService
+    from app.services.banquet_occupancy import occupancy_index
+
+    matrix = CompatibilityMatrix()
+    matrix._install({"1": 0, "2": 1}, [["allow", "separation"], ["separation", "allow"]])
+    matrix._loaded = True
+
+    async def fake_matrix(session):
+        return matrix
+
+    monkeypatch.setattr(TypeRelationService, "get_compatibility_matrix", fake_matrix)
+
+    d = datetime.now(timezone.utc).date() + timedelta(days=3)
+    windows = BanquetService._slot_windows(d)
+    first_slot_start = windows[0][1]
+
+    # one occupied seat at a 4-seat table blocks both neighbours for type "1";
+    # seat 3 stays free, so every slot is still bookable
+    session = MagicMock()
+    session.exec = AsyncMock(side_effect=[
+        DummyResult(["1"]),
+        DummyResult([_floor(4)]),
+        DummyResult([_seat_reservation(1, first_slot_start)]),
+    ])
+    slots = await BanquetService.get_available_time_slots(1, d, session)
+    assert slots == [w[0] for w in windows]
+    assert session.exec.await_count == 3
+
+    # the occupancy index is warm now: only the spirit lookup hits the DB
+    session.exec = AsyncMock(side_effect=[DummyResult(["1"])])
+    slots = await BanquetService.get_available_time_slots(1, d, session)
+    assert slots == [w[0] for w in windows]
+    assert session.exec.await_count == 1
+
+    # a 3-seat table: seat 1 taken and 2/3 blocked by separation in the first slot only
+    occupancy_index.invalidate()
+    session.exec = AsyncMock(side_effect=[
+        DummyResult(["1"]),
+        DummyResult([_floor(3)]),
+        DummyResult([_seat_reservation(1, first_slot_start)]),
+    ])
+    slots = await BanquetService.get_available_time_slots(1, d, session)
+    assert slots == [w[0] for w in windows[1:]]
+    assert session.exec.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_available_time_slots_range_single_query(monkeypatch):
+    from datetime import timedelta, timezone
+    from fastapi import HTTPException
+    from app.routes.banquet import available_time_slots_range_for_spirit
+    from app.services.type_relation import CompatibilityMatrix, TypeRelationService
+
+    matrix = CompatibilityMatrix()
+    matrix._loaded = True
+
+    async def fake_matrix(session):
+        return matrix
+
+    monkeypatch.setattr(TypeRelationService, "get_compatibility_matrix", fake_matrix)
+
+    start = datetime.now(timezone.utc).date() + timedelta(days=2)
+    end = start + timedelta(days=4)
+    busy_day = start + timedelta(days=1)
+    busy = [
+        _seat_reservation(1, w[1]) for w in BanquetService._slot_windows(busy_day)
+    ]
+
+    session = MagicMock()
+    session.exec = AsyncMock(side_effect=[
+        DummyResult(["1"]),
+        DummyResult([_floor(1)]),
+        DummyResult(busy),
+    ])
+    calendar = await BanquetService.get_available_time_slots_range(1, start, end, session)
+    assert session.exec.await_count == 3
+    assert list(calendar) == [(start + timedelta(days=i)).isoformat() for i in range(5)]
+    assert calendar[busy_day.isoformat()] == []
+    assert len(calendar[start.isoformat()]) == len(BanquetService._slot_windows(start))
+
+    # a fully past range never touches the DB
+    session.exec = AsyncMock()
+    past = await BanquetService.get_available_time_slots_range(
+        1, date(2000, 1, 1), date(2000, 1, 3), session
+    )
+    assert past == {"2000-01-01": [], "2000-01-02": [], "2000-01-03": []}
+    session.exec.assert_not_awaited()
+
+    with pytest.raises(HTTPException) as exc:
+        await available_time_slots_range_for_spirit(
+            1, start="2030-01-10", end="2030-01-01", session=session
+        )
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException):
+        await available_time_slots_range_for_spirit(
+            1, start="2030-01-01", end="2030-06-01", session=session
+        )
+
+
+@pytest.mark.asyncio
+async def test_occupancy_index_incremental_updates():
+    from datetime import timedelta, timezone
+    from app.services.banquet_occupancy import BanquetOccupancyIndex
+
+    start = datetime(2030, 1, 1, 14, tzinfo=timezone.utc)
+    window = (start, start + timedelta(hours=1))
+    index = BanquetOccupancyIndex()
+
+    session = MagicMock()
+    session.exec = AsyncMock(side_effect=[
+        DummyResult([_floor(4)]),
+        DummyResult([_seat_reservation(2, start)]),
+    ])
+    occ = (await index.get_windows([window], session))[window][1]
+    assert occ.mask == 0b0010
+    assert occ.first(1)[0] == "r-2"
+
+    # writes are folded into the cached window without another query
+    index.add("r-new", 4, start + timedelta(minutes=30), start + timedelta(hours=2), None)
+    index.add("r-later", 1, start + timedelta(hours=1), start + timedelta(hours=2), None)
+    occ = (await index.get_windows([window], session))[window][1]
+    assert occ.mask == 0b1010
+    assert occ.taken == 2
+    assert session.exec.await_count == 2
+
+    index.remove("r-2")
+    assert occ.mask == 0b1000
+    assert occ.first(1) is None
+
+
+@pytest.mark.asyncio
+async def test_occupant_changes_drop_the_occupancy_index():
+    from datetime import timedelta, timezone
+    from app.models import SpiritTypeUpdate, SpiritUpdate, VenueAccountUpdate
+    from app.services.banquet_occupancy import occupancy_index
+    from app.services.spirit import SpiritService
+    from app.services.spirit_type import SpiritTypeService
+    from app.services.venue_account import VenueAccountService
+
+    start = datetime(2030, 1, 1, 14, tzinfo=timezone.utc)
+    window = (start, start + timedelta(hours=1))
+    writes = [
+        lambda session: SpiritService.update_spirit(1, SpiritUpdate(typeId="2"), session),
+        lambda session: SpiritTypeService.update_spirit_type("2", SpiritTypeUpdate(name="X"), session),
+        lambda session: VenueAccountService.update_account("acc", VenueAccountUpdate(spiritId=2), session),
+        lambda session: SpiritService.delete_spirit(1, session),
+    ]
+    for write in writes:
+        session = MagicMock()
+        session.commit = AsyncMock()
+        session.exec = AsyncMock(side_effect=[
+            DummyResult([_floor(4)]),
+            DummyResult([_seat_reservation(2, start)]),
+            DummyResult([(MagicMock(),)]),  # UPDATE/DELETE ... RETURNING
+        ])
+        await occupancy_index.get_windows([window], session)
+        assert occupancy_index.stats()["windows"] == 1
+        # the cached occupants showed the old spirit / type
+        await write(session)
+        assert occupancy_index.stats()["windows"] == 0
+
+
+@pytest.mark.asyncio
+async def test_record_seat_change_publishes_deltas(monkeypatch):
+    from datetime import timedelta, timezone
+    from app.core import events
+
+    published = []
+
+    async def fake_publish(topic, message):
+        published.append((topic, message))
+
+    monkeypatch.setattr(events, "publish", fake_publish)
+    start = datetime(2030, 1, 1, 14, tzinfo=timezone.utc)
+    end = start + timedelta(hours=1)
+    session = MagicMock()
+    session.exec = AsyncMock(return_value=DummyResult([_floor(4)]))
+
+    # seat move: freed on the old seat, occupied on the new one
+    before = ("r-1", 2, "acc", start, end)
+    after = ("r-1", 4, "acc", start, end)
+    await BanquetService.record_seat_change(before, after, session)
+    assert [m["type"] for _, m in published] == ["seat_freed", "seat_occupied"]
+    topic, moved = published[1]
+    assert topic == BanquetService.SEAT_EVENTS_TOPIC
+    assert moved == {
+        "type": "seat_occupied",
+        "reservationId": "r-1",
+        "seatId": 4,
+        "tableId": 1,
+        "seatNumber": 4,
+        "startTime": start.isoformat(),
+        "endTime": end.isoformat(),
+    }
+
+    # unrelated edits and seatless reservations publish nothing
+    published.clear()
+    await BanquetService.record_seat_change(after, after, session)
+    await BanquetService.record_seat_change(None, ("r-2", None, "acc", start, end), session)
+    assert published == []
+    # the layout is loaded once for locating seats
+    assert session.exec.await_count == 1
+
+
+def test_plan_seating_respects_relations_and_budget():
+    from app.services.banquet_occupancy import TableLayout, SlotOccupancy
+    from app.services.type_relation import CompatibilityMatrix
+
+    matrix = CompatibilityMatrix()
+    # "A" must not share a table with "C"; "A" and "B" cannot sit side by side
+    matrix._install(
+        {"A": 0, "B": 1, "C": 2},
+        [
+            ["allow", "separation", "forbidden"],
+            ["separation", "allow", "allow"],
+            ["forbidden", "allow", "allow"],
+        ],
+    )
+    layout = [
+        TableLayout(1, 4, True, [(i, i) for i in range(1, 5)]),
+        TableLayout(2, 4, True, [(i, i - 4) for i in range(5, 9)]),
+    ]
+    occupancy = {1: SlotOccupancy(4), 2: SlotOccupancy(4)}
+    occupancy[1].add(0, "r-1", {"typeId": "C"})
+
+    guests = [(10, "A"), (11, "B"), (12, "A"), (13, "B")]
+    plan, complete = BanquetService._plan_seating(
+        layout, occupancy, guests, matrix, max_steps=1000
+    )
+    assert complete and len(plan) == 4
+    # every "A" avoids table 1 (where "C" sits)
+    assert plan[10][0] == 1 and plan[12][0] == 1
+    # no "A" is a ring neighbour of a "B" on the same table
+    for a in (10, 12):
+        for b in (11, 13):
+            if plan[a][0] == plan[b][0]:
+                assert abs(plan[a][1] - plan[b][1]) % 4 not in (1, 3)
+
+    # with no budget the search gives up and reports an incomplete plan
+    plan, complete = BanquetService._plan_seating(
+        layout, occupancy, guests, matrix, max_steps=0
+    )
+    assert plan == {} and complete is False
+
+
+def test_plan_seating_backtracks_past_a_placement_that_skips_a_guest():
+    from app.services.banquet_occupancy import TableLayout, SlotOccupancy
+    from app.services.type_relation import CompatibilityMatrix
+
+    matrix = CompatibilityMatrix()
+    # "A"/"B", "B"/"B" and "C"/"D" cannot sit side by side
+    matrix._install(
+        {"A": 0, "B": 1, "C": 2, "D": 3},
+        [
+            ["allow", "separation", "allow", "allow"],
+            ["separation", "separation", "allow", "allow"],
+            ["allow", "allow", "allow", "separation"],
+            ["allow", "allow", "separation", "allow"],
+        ],
+    )
+    layout = [
+        TableLayout(1, 2, True, [(1, 1), (2, 2)]),
+        TableLayout(2, 1, True, [(3, 1)]),
+        TableLayout(3, 2, True, [(4, 1), (5, 2)]),
+    ]
+    occupancy = {1: SlotOccupancy(2), 2: SlotOccupancy(1), 3: SlotOccupancy(2)}
+    occupancy[3].add(0, "r-1", {"typeId": "B"})
+
+    # the first seat tried for "B" leaves one "A" without a seat; a plan
+    # seating everybody exists and must be found, not the partial one
+    guests = [(0, "B"), (1, "A"), (2, "A"), (3, "C")]
+    plan, complete = BanquetService._plan_seating(
+        layout, occupancy, guests, matrix, max_steps=1000
+    )
+    assert complete and len(plan) == 4
+    assert plan[0] == (1, 0)
+
+    # with the single seat taken one guest cannot sit: best plan, incomplete
+    occupancy[2].add(0, "r-2", {"typeId": "D"})
+    plan, complete = BanquetService._plan_seating(
+        layout, occupancy, guests, matrix, max_steps=1000
+    )
+    assert not complete and len(plan) == 3
+
+
+def test_plan_seating_budget_is_spent_on_search_not_on_taken_seats():
+    from app.services.banquet_occupancy import TableLayout, SlotOccupancy
+    from app.services.type_relation import CompatibilityMatrix
+
+    matrix = CompatibilityMatrix()
+    matrix._install({"A": 0, "B": 1}, [["allow", "allow"], ["allow", "allow"]])
+    # 30 tables of 10 seats; two seats of the first table are already booked
+    layout = [
+        TableLayout(t, 10, True, [(t * 10 + i, i + 1) for i in range(10)])
+        for t in range(1, 31)
+    ]
+    occupancy = {t.id: SlotOccupancy(10) for t in layout}
+    occupancy[1].add(0, "r-1", {"typeId": "A"})
+    occupancy[1].add(5, "r-2", None)
+
+    # the largest group the route accepts; it obviously fits
+    guests = [(sid, "AB"[sid % 2]) for sid in range(BanquetService.MAX_SEATING_GROUP)]
+    plan, complete = BanquetService._plan_seating(
+        layout, occupancy, guests, matrix, BanquetService.MAX_SEATING_STEPS
+    )
+    assert complete is True and len(plan) == 200
+    assert len(set(plan.values())) == 200
+    assert (0, 0) not in plan.values() and (0, 5) not in plan.values()
+
+
+def test_evaluate_slot_arrays_match_ring_rules():
+    from app.services.banquet_occupancy import FloorArrays, SlotOccupancy, TableLayout
+    from app.services.type_relation import CompatibilityMatrix
+
+    matrix = CompatibilityMatrix()
+    matrix._install(
+        {"A": 0, "S": 1, "F": 2},
+        [
+            ["allow", "separation", "forbidden"],
+            ["separation", "allow", "allow"],
+            ["forbidden", "allow", "allow"],
+        ],
+    )
+    floor = FloorArrays([
+        TableLayout(1, 5, True, [(i, i) for i in range(1, 6)]),
+        TableLayout(2, 3, True, [(i, i - 5) for i in range(6, 9)]),
+        TableLayout(3, 0, False, []),
+    ])
+    occupancy = {1: SlotOccupancy(5), 2: SlotOccupancy(3), 3: SlotOccupancy(0)}
+    # separation occupant on the last seat blocks seat 4 and wraps to seat 1
+    occupancy[1].add(4, "r-s", {"typeId": "S"})
+    # occupants without a spirit or with an unknown type impose nothing
+    occupancy[1].add(2, "r-none", None)
+    occupancy[2].add(1, "r-f", {"typeId": "F"})
+    occupancy[2].add(0, "r-x", {"typeId": "X"})
+
+    tables = BanquetService._evaluate_slot(floor, occupancy, "A", matrix)
+    first, second, empty = tables
+    assert [s.get("available", True) for s in first["availableSeats"]] == [
+        False, True, False, False, False
+    ]
+    assert "available" not in first
+    assert first["occupies"] == [{"typeId": "S"}]
+    assert first["availableSeats"][2]["spirit"] is None
+    assert second["available"] is False
+    assert [s.get("reservationId") for s in second["availableSeats"]] == ["r-x", "r-f", None]
+    assert empty == {"capacity": 0, "state": False, "id": 3, "availableSeats": [], "occupies": []}
+
+    assert BanquetService._has_free_seat(floor, occupancy, "A", matrix)
+    occupancy[1].add(1, "r-2", None)
+    assert not BanquetService._has_free_seat(floor, occupancy, "A", matrix)
+    # an unknown requesting type sees no relation restrictions
+    assert BanquetService._has_free_seat(floor, occupancy, "Z", matrix)
+
+
+@pytest.mark.asyncio
+async def test_today_table_availability_single_aggregate():
+    session = MagicMock()
+    session.exec = AsyncMock(return_value=DummyResult([(1, 6, 2, 4), (2, 6, 0, 6)]))
+    out = await BanquetService.today_table_availability(session)
+    assert out == [
+        {"id": 1, "capacity": 6, "takenSeats": 2, "availableSeats": 4},
+        {"id": 2, "capacity": 6, "takenSeats": 0, "availableSeats": 6},
+    ]
+    assert session.exec.await_count == 1
+    sql = str(session.exec.await_args.args[0]).lower()
+    assert "group by" in sql and "left outer join reservation" in sql
+
+
+@pytest.mark.asyncio
+async def test_create_tables_bulk_uses_two_inserts():
+    from app.models import BanquetTableCreate
+
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.execute = AsyncMock(side_effect=[
+        DummyResult([(1, 2, True), (2, 0, True)]),
+        DummyResult([(11, 1, 1), (12, 1, 2)]),
+    ])
+    out = await BanquetService.create_tables(
+        [BanquetTableCreate(capacity=2), BanquetTableCreate(capacity=0)], session
+    )
+    assert session.execute.await_count == 2
+    session.commit.assert_awaited_once()
+    # all seat rows go in one statement
+    assert session.execute.await_args_list[1].args[1] == [
+        {"tableId": 1, "seatNumber": 1},
+        {"tableId": 1, "seatNumber": 2},
+    ]
+    assert [t.id for t in out] == [1, 2]
+    assert [s.id for s in out[0].availableSeats] == [11, 12]
+    assert out[1].availableSeats == []
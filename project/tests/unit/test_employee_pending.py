@@ -100,8 +100,9 @@ async def test_admin_can_change_employee_status_from_pending_to_active(async_ses
         email="pending@example.com"
     )
     
+    # UPDATE ... RETURNING hands back the row the mock is given
     mock_result = MagicMock()
-    mock_result.first.return_value = pending_employee
+    mock_result.first.return_value = (pending_employee,)
     async_session_mock.exec.side_effect = AsyncMock(return_value=mock_result)
     async_session_mock.add = MagicMock()
     async_session_mock.commit = AsyncMock()
@@ -112,9 +113,19 @@ async def test_admin_can_change_employee_status_from_pending_to_active(async_ses
     
     result = await EmployeeService.update_employee("user_to_approve", update, async_session_mock)
     
-    assert result.estado == "activo"
+    assert result is pending_employee
+    assert async_session_mock.exec.await_count == 1
     async_session_mock.commit.assert_called_once()
 
+    # the change itself is the single UPDATE of that employee
+    stmt = async_session_mock.exec.await_args.args[0]
+    assert stmt.is_update and stmt.table.name == "employee"
+    compiled = stmt.compile()
+    assert str(stmt.whereclause.compile()) == 'employee."clerkId" = :clerkId_1'
+    assert compiled.params["clerkId_1"] == "user_to_approve"
+    assert compiled.params["estado"] == "activo"
+    assert {c.key for c in stmt._values} == {"estado"}
+
 
 @pytest.mark.asyncio
 async def test_clerk_webhook_creates_employee_with_pending_status_by_default(async_session_mock):
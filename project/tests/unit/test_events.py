@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+
+from app.core.events import InProcessBroker
+
+
+@pytest.mark.asyncio
+async def test_broker_fanout_and_unsubscribe():
+    broker = InProcessBroker()
+    async with broker.subscribe("t") as a, broker.subscribe("t") as b:
+        assert await broker.publish("t", {"type": "x"}) == 2
+        assert await a.get(timeout=0.1) == {"type": "x"}
+        assert await b.get(timeout=0.1) == {"type": "x"}
+        assert await a.get(timeout=0.01) is None
+    assert broker.subscriber_count("t") == 0
+    assert await broker.publish("t", {"type": "x"}) == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_resync():
+    broker = InProcessBroker(queue_size=2)
+    async with broker.subscribe("t") as sub:
+        for i in range(3):
+            await broker.publish("t", {"type": "seat_freed", "n": i})
+        assert await sub.get(timeout=0.1) == {"type": "resync"}
+        assert await sub.get(timeout=0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_seat_stream_emits_named_events(monkeypatch):
+    from app.core import events
+    from app.routes import banquet as banquet_routes
+    from app.services.banquet import BanquetService
+
+    broker = InProcessBroker()
+    monkeypatch.setattr(events, "_broker", broker)
+    monkeypatch.setattr(banquet_routes, "get_broker", lambda: broker)
+
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(side_effect=[False, True])
+    response = await banquet_routes.stream_seat_changes(request)
+    assert response.media_type == "text/event-stream"
+
+    body = response.body_iterator
+    assert await body.__anext__() == ": connected\n\n"
+    await events.publish(
+        BanquetService.SEAT_EVENTS_TOPIC, {"type": "seat_occupied", "seatId": 3}
+    )
+    chunk = await asyncio.wait_for(body.__anext__(), 1)
+    name, data = chunk.strip().split("\n")
+    assert name == "event: seat_occupied"
+    assert json.loads(data[len("data: "):]) == {"type": "seat_occupied", "seatId": 3}
+
+    with pytest.raises(StopAsyncIteration):
+        await body.__anext__()
+    assert broker.subscriber_count(BanquetService.SEAT_EVENTS_TOPIC) == 0
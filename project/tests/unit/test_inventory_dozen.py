@@ -247,17 +247,21 @@ class TestInventoryOrderIntegration:
     @pytest.mark.asyncio
     async def test_redeem_order_updates_stock(self, async_session_mock):
         """RNF-006: Al marcar orden como recibida, el stock debe actualizarse."""
-        existing_order = InventoryOrder(
+        redeemed_order = InventoryOrder(
             id="order_123",
             idOrder=1,
             idItem=1,
             quantity=24,  # 2 docenas
-            redeemed=False
+            redeemed=True
         )
         
+        # la línea antes del cambio, luego UPDATE ... RETURNING con la fila ya
+        # actualizada, luego el contador de item_stock
+        before = MagicMock()
+        before.first.return_value = (1, 24, False)
         mock_result = MagicMock()
-        mock_result.first.return_value = existing_order
-        async_session_mock.exec.side_effect = AsyncMock(return_value=mock_result)
+        mock_result.first.return_value = (redeemed_order,)
+        async_session_mock.exec = AsyncMock(side_effect=[before, mock_result, MagicMock()])
         async_session_mock.add = MagicMock()
         async_session_mock.commit = AsyncMock()
         async_session_mock.refresh = AsyncMock()
@@ -270,4 +274,12 @@ class TestInventoryOrderIntegration:
         )
         
         assert result.redeemed is True
+        assert result.quantity == 24
         async_session_mock.commit.assert_called_once()
+        # la línea se lee bloqueada: dos actualizaciones no suman dos veces
+        before = str(async_session_mock.exec.await_args_list[0].args[0])
+        assert before.endswith("FOR UPDATE")
+        # las 2 docenas recibidas entran al stock del item en la misma transacción
+        ledger = async_session_mock.exec.await_args_list[2].args[0].compile()
+        assert str(ledger).startswith("INSERT INTO item_stock")
+        assert (ledger.params["itemId_m0"], ledger.params["quantity_m0"]) == (1, 24)
@@ -29,28 +29,32 @@ async def test_list_and_quantity_and_update_delete_item():
     res = await ItemService.list_items(session=session)
     assert res == []
 
-    # list_items_with_quantity: we need to simulate several exec calls
-    # call sequence: items_res, inv_q, res_q, int_q
-    # items: one item with id=1
-    item = MagicMock()
-    item.id = 1
-    item.name = "I1"
-    item.image = None
-    item.unit = "u"
-
-    inv_rows = []
-    res_rows = []
-    intakes = []
-
-    session.exec.side_effect = [
-        DummyResult([item]),
-        DummyResult(inv_rows),
-        DummyResult(res_rows),
-        DummyResult(intakes),
-    ]
-
+    # list_items_with_quantity: one query, quantities read from item_stock
+    session.exec.return_value = DummyResult([(1, "I1", None, "u", 7, 12), (2, "I2", None, "u", 0, None)])
+    session.exec.reset_mock()
     qtys = await ItemService.list_items_with_quantity(session=session)
-    assert isinstance(qtys, list)
+    assert [(i.id, i.quantity, i.lowStockThreshold) for i in qtys] == [(1, 7, 12), (2, 0, None)]
+    assert session.exec.await_count == 1
+    sql = str(session.exec.await_args.args[0])
+    assert "LEFT OUTER JOIN item_stock" in sql and "reservation" not in sql
+
+    # quantity-aware mode: only items under the threshold, filtered in SQL
+    session.exec.return_value = DummyResult([(2, "I2", None, "u", 0, None)])
+    low = await ItemService.list_items_with_quantity(session=session, below=12)
+    assert [i.id for i in low] == [2]
+    stmt = session.exec.await_args.args[0]
+    sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert "WHERE coalesce(item_stock.quantity, 0) < 12" in sql
+
+    # low-stock set: items under their own threshold, read from item_stock
+    session.exec.return_value = DummyResult([(3, "I3", None, "u", 5, 6)])
+    session.exec.reset_mock()
+    low = await ItemService.list_low_stock(session=session)
+    assert [(i.id, i.quantity, i.lowStockThreshold) for i in low] == [(3, 5, 6)]
+    assert session.exec.await_count == 1
+    sql = str(session.exec.await_args.args[0])
+    assert "FROM item_stock JOIN item" in sql
+    assert "WHERE item_stock.quantity < item_stock.threshold" in sql
 
     # clear side_effect and set exec to return empty for subsequent calls
     session.exec.side_effect = None
@@ -63,6 +67,25 @@ async def test_list_and_quantity_and_update_delete_item():
 
     upd = await ItemService.update_item(999, Upd(), session=session)
     assert upd is None
+    session.commit.assert_not_awaited()
+
+    # a new threshold goes to the item's counter, in the item's transaction
+    class UpdThreshold:
+        def dict(self, exclude_unset=True):
+            return {"lowStockThreshold": 30}
+
+    item = MagicMock()
+    session.exec.reset_mock()
+    session.exec.return_value = DummyResult([item])
+    upd = await ItemService.update_item(5, UpdThreshold(), session=session)
+    assert upd is item
+    assert session.exec.await_count == 2
+    stmt = session.exec.await_args.args[0]
+    assert str(stmt).endswith('DO UPDATE SET threshold = excluded.threshold')
+    params = stmt.compile().params
+    assert (params["itemId"], params["threshold"]) == (5, 30)
+    session.commit.assert_awaited_once()
+    session.exec.return_value = DummyResult([])
 
     d = await ItemService.delete_item(999, session=session)
     assert d is False
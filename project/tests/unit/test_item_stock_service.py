@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.item_stock import ItemStockService
+
+
+def _session(dialect="postgresql"):
+    session = MagicMock()
+    session.exec = AsyncMock()
+    session.get_bind.return_value.dialect.name = dialect
+    return session
+
+
+@pytest.mark.asyncio
+async def test_add_is_one_sorted_upsert_and_skips_zero_deltas():
+    session = _session()
+    await ItemStockService.add(session, {3: -2, 1: 24, 2: 0})
+    assert session.exec.await_count == 1
+    stmt = session.exec.await_args.args[0].compile(dialect=postgresql.dialect())
+    sql = str(stmt)
+    assert sql.startswith('INSERT INTO item_stock ("itemId", quantity) VALUES')
+    assert 'ON CONFLICT ("itemId") DO UPDATE SET quantity = (item_stock.quantity + excluded.quantity)' in sql
+    # ordered by item id so concurrent writers lock counters in the same order
+    rows = [(stmt.params[f"itemId_m{i}"], stmt.params[f"quantity_m{i}"]) for i in range(2)]
+    assert rows == [(1, 24), (3, -2)]
+
+    session.exec.reset_mock()
+    await ItemStockService.add(session, {1: 0})
+    await ItemStockService.book(session, {None: 1, "svc-a": 0})
+    session.exec.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_book_sums_the_services_intakes_in_the_database():
+    session = _session("sqlite")
+    await ItemStockService.book(session, {"svc-a": 2, "svc-b": -1})
+    assert session.exec.await_count == 1
+    sql = str(session.exec.await_args.args[0])
+    assert sql.startswith('INSERT INTO item_stock ("itemId", quantity) SELECT item_intake."itemId"')
+    assert 'CASE item_intake."serviceId" WHEN' in sql
+    assert 'GROUP BY item_intake."itemId"' in sql and "ON CONFLICT" in sql
+
+
+@pytest.mark.asyncio
+async def test_low_stock_count_and_rebuild_keep_to_the_item_stock_rows():
+    session = _session()
+    session.exec.return_value = MagicMock(rowcount=3)
+    session.exec.return_value.one.return_value = 4
+    assert await ItemStockService.count_low(session) == 4
+    sql = str(session.exec.await_args.args[0])
+    # the predicate of the ix_item_stock_low partial index
+    assert sql.endswith("FROM item_stock \nWHERE item_stock.quantity < item_stock.threshold")
+
+    session.exec.reset_mock()
+    assert await ItemStockService.rebuild(session) == 3
+    sql = str(session.exec.await_args.args[0].compile(dialect=postgresql.dialect()))
+    # counters are upserted: the items' thresholds survive a rebuild
+    assert sql.startswith('INSERT INTO item_stock ("itemId", quantity) SELECT item.id')
+    assert sql.endswith('ON CONFLICT ("itemId") DO UPDATE SET quantity = excluded.quantity')
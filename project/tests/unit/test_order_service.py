@@ -32,15 +32,22 @@ async def test_list_get_and_redeem_order():
     got = await OrderService.get_order(1, session=session)
     assert got is None
 
-    # redeem_order: create fake order with items
+    # redeem_order: one UPDATE for the lines, then the order is read back
     item1 = MagicMock()
-    item1.redeemed = False
+    item1.redeemed = True
     item2 = MagicMock()
-    item2.redeemed = False
+    item2.redeemed = True
     fake_order = MagicMock()
     fake_order.items = [item1, item2]
 
-    session.exec.return_value = DummyResult([fake_order])
+    session.exec.side_effect = [MagicMock(), DummyResult([fake_order])]
     r = await OrderService.redeem_order(1, session=session)
     assert r is not None
     assert all(getattr(i, "redeemed", False) for i in r.items)
+    stmt = session.exec.await_args_list[-2].args[0]
+    assert str(stmt).startswith("UPDATE inventory_order SET redeemed=")
+    session.commit.assert_awaited_once()
+
+    # redeem_order: unknown order
+    session.exec.side_effect = [MagicMock(), DummyResult([])]
+    assert await OrderService.redeem_order(2, session=session) is None
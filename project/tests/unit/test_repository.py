@@ -0,0 +1,77 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.models import Deposit
+from app.services.deposit import DepositService
+from app.services.repository import Repository
+
+
+class DummyResult:
+    def __init__(self, items):
+        self._items = items
+
+    def all(self):
+        return self._items
+
+    def first(self):
+        return self._items[0] if self._items else None
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_are_one_returning_statement():
+    session = MagicMock()
+    session.exec = AsyncMock()
+    session.commit = AsyncMock()
+    updated = Deposit(id="dep-1", accountId="acc-1", amount=30)
+
+    session.exec.return_value = DummyResult([(updated,)])
+    out = await DepositService.update_returning("dep-1", {"amount": 30}, session)
+    assert out is updated
+    stmt = str(session.exec.await_args.args[0])
+    assert stmt.startswith("UPDATE deposit SET amount=") and "RETURNING" in stmt
+    assert session.exec.await_count == 1
+    session.commit.assert_awaited_once()
+
+    # the caller may keep the transaction open
+    await DepositService.update_returning("dep-1", {"amount": 40}, session, commit=False)
+    session.commit.assert_awaited_once()
+
+    removed = await DepositService.delete_returning("dep-1", session)
+    assert removed is updated
+    stmt = str(session.exec.await_args.args[0])
+    assert stmt.startswith("DELETE FROM deposit") and "RETURNING" in stmt
+    assert session.commit.await_count == 2
+
+    # nothing matched: no commit
+    session.exec.return_value = DummyResult([])
+    assert await DepositService.update_returning("no", {"amount": 1}, session) is None
+    assert await DepositService.delete_returning("no", session) is None
+    assert session.commit.await_count == 2
+
+    # nothing to set: the row is only read
+    session.exec.return_value = DummyResult([updated])
+    assert await DepositService.update_returning("dep-1", {}, session) is updated
+    assert str(session.exec.await_args.args[0]).startswith("SELECT")
+
+
+def test_services_share_the_repository():
+    from app.services import (
+        DepositService,
+        EmployeeService,
+        InventoryOrderService,
+        OrderService,
+        ReservationService,
+        SpiritTypeService,
+    )
+
+    for service in (
+        DepositService,
+        EmployeeService,
+        InventoryOrderService,
+        OrderService,
+        ReservationService,
+        SpiritTypeService,
+    ):
+        assert issubclass(service, Repository)
+    # the key is the mapped primary key, whatever it is called
+    assert EmployeeService._key().name == "clerkId"
@@ -0,0 +1,123 @@
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlmodel import SQLModel
+
+from app.models import (
+    Reservation,
+    Service,
+    ServiceUpdate,
+    Spirit,
+    SpiritType,
+    SpiritUpdate,
+    VenueAccount,
+)
+from app.services.service import ServiceService
+from app.services.spirit import SpiritService
+from app.services.reservation import ReservationService
+from app.services.reservation_cache import ReservationReadCache, days_between, reservation_cache
+
+
+def test_cache_evicts_lru_and_invalidates_only_touched_days():
+    cache = ReservationReadCache(max_entries=2)
+    d1, d2, d3 = date(2030, 1, 1), date(2030, 1, 2), date(2030, 1, 3)
+    cache.put("a", (d1,), [1], cache.generation)
+    cache.put("b", (d2,), [2], cache.generation)
+    assert cache.get("a") == [1]
+    cache.put("c", (d3,), [3], cache.generation)
+    # "b" was least recently used
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate_days([d1])
+    assert cache.get("a") is None
+    assert cache.get("c") == [3]
+
+    # a read that started before a write is not stored
+    stale = cache.generation
+    cache.invalidate_days([d2])
+    cache.put("b", (d2,), [2], stale)
+    assert cache.get("b") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 3 and stats["invalidations"] == 1
+
+    late = datetime(2030, 1, 1, 23, 30, tzinfo=timezone.utc)
+    assert days_between(late, late + timedelta(hours=1)) == (d1, d2)
+
+
+@pytest.mark.asyncio
+async def test_day_filtered_list_is_cached_until_a_write_on_that_day(async_session_mock):
+    start = datetime(2030, 1, 1, 14, tzinfo=timezone.utc)
+    row = Reservation(id="res_1", accountId="acc_1", serviceId="svc_1",
+                      startTime=start, endTime=start + timedelta(hours=1))
+    mock_result = MagicMock()
+    mock_result.all.return_value = [row]
+    mock_result.first.return_value = (row,)  # as returned by DELETE ... RETURNING
+    async_session_mock.exec = AsyncMock(return_value=mock_result)
+    filters = {"datetime": "2030-01-01"}
+
+    first = await ReservationService.list_reservations(filters, async_session_mock)
+    second = await ReservationService.list_reservations(filters, async_session_mock)
+    assert first == second == [ReservationService._detach(row)]
+    assert async_session_mock.exec.await_count == 1
+
+    # a booking on another day keeps the bucket warm
+    other = Reservation(id="res_2", accountId="acc_1", serviceId="svc_1",
+                        startTime=start + timedelta(days=1), endTime=start + timedelta(days=1, hours=1))
+    ReservationService._invalidate_days(other.startTime)
+    await ReservationService.list_reservations(filters, async_session_mock)
+    assert async_session_mock.exec.await_count == 1
+
+    # deleting a reservation of that day drops it
+    async_session_mock.exec = AsyncMock(return_value=mock_result)
+    assert await ReservationService.delete_reservation("res_1", async_session_mock)
+    await ReservationService.list_reservations(filters, async_session_mock)
+    # delete lookup + item_stock counters of svc_1 + fresh list
+    assert async_session_mock.exec.await_count == 3
+
+    stats = ReservationService.cache_stats()
+    assert stats["hits"] == 2 and stats["invalidations"] == 1
+    assert reservation_cache.stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_rows_are_plain_and_dropped_on_related_updates(async_session_mock):
+    start = datetime(2030, 1, 1, 14, tzinfo=timezone.utc)
+    spirit = Spirit(id=1, name="Ana", typeId="type_a")
+    spirit.type = SpiritType(id="type_a", name="A")
+    row = Reservation(id="res_1", accountId="acc_1", serviceId="svc_1",
+                      startTime=start, endTime=start + timedelta(hours=1))
+    row.service = Service(id="svc_1", name="Sauna")
+    row.account = VenueAccount(id="acc_1", spiritId=1, privateVenueId=1, pin="0000",
+                               startTime=start, endTime=start + timedelta(days=1))
+    row.account.spirit = spirit
+    mock_result = MagicMock()
+    mock_result.all.return_value = [row]
+    async_session_mock.exec = AsyncMock(return_value=mock_result)
+    filters = {"datetime": "2030-01-01"}
+
+    (cached,) = await ReservationService.list_reservations(filters, async_session_mock)
+    # nothing in the entry is an ORM instance of the loading session
+    assert isinstance(cached, dict)
+    assert cached["service"] == row.service.model_dump()
+    assert cached["account"]["spirit"]["type"] == spirit.type.model_dump()
+    assert not any(isinstance(v, SQLModel) for v in cached.values())
+    row.service.name = "Renamed in another session"
+    (again,) = await ReservationService.list_reservations(filters, async_session_mock)
+    assert again["service"]["name"] == "Sauna"
+    assert async_session_mock.exec.await_count == 1
+
+    update_result = MagicMock()
+    update_result.first.return_value = (row.service,)  # UPDATE ... RETURNING
+    async_session_mock.exec = AsyncMock(return_value=update_result)
+    await ServiceService.update_service("svc_1", ServiceUpdate(name="Spa"), async_session_mock)
+    assert reservation_cache.stats()["entries"] == 0
+
+    async_session_mock.exec = AsyncMock(return_value=mock_result)
+    await ReservationService.list_reservations(filters, async_session_mock)
+    update_result.first.return_value = (spirit,)
+    async_session_mock.exec = AsyncMock(return_value=update_result)
+    await SpiritService.update_spirit(1, SpiritUpdate(name="Eva"), async_session_mock)
+    assert reservation_cache.stats()["entries"] == 0
@@ -45,15 +45,183 @@ async def test_list_reservations_by_account(async_session_mock):
     assert result[0].accountId == "acc_123"
 
 @pytest.mark.asyncio
-async def test_update_reservation_redeem(async_session_mock):
-    # Mock get existing
-    mock_res_obj = Reservation(id="res_1", isRedeemed=False)
-    
+async def test_list_reservations_page_keyset(async_session_mock):
+    start = datetime(2030, 1, 1, 14, tzinfo=timezone.utc)
+    rows = [
+        Reservation(id=f"res_{i}", accountId="acc_123", startTime=start + timedelta(hours=i),
+                    endTime=start + timedelta(hours=i + 1))
+        for i in range(3)
+    ]
     mock_result = MagicMock()
-    mock_result.first.return_value = mock_res_obj
-    
-    # Override side_effect
+    mock_result.all.return_value = rows
     async_session_mock.exec.side_effect = AsyncMock(return_value=mock_result)
+
+    # one extra row beyond the limit means there is a next page
+    items, cursor = await ReservationService.list_reservations_page(
+        {"accountId": "acc_123"}, async_session_mock, limit=2
+    )
+    assert [r.id for r in items] == ["res_0", "res_1"]
+    assert ReservationService._decode_cursor(cursor) == (rows[1].startTime, "res_1")
+
+    sql = str(async_session_mock.exec.call_args.args[0])
+    assert "ORDER BY reservation.\"startTime\", reservation.id" in sql
+    assert "LIMIT" in sql
+
+    mock_result.all.return_value = rows[2:]
+    items, cursor = await ReservationService.list_reservations_page(
+        None, async_session_mock, limit=2, cursor=cursor
+    )
+    assert [r.id for r in items] == ["res_2"]
+    assert cursor is None
+    sql = str(async_session_mock.exec.call_args.args[0])
+    assert '(reservation."startTime", reservation.id) >' in sql
+
+    with pytest.raises(ValueError):
+        await ReservationService.list_reservations_page(None, async_session_mock, cursor="not-a-cursor")
+
+@pytest.mark.asyncio
+async def test_list_reservations_compact_view_selects_columns(async_session_mock):
+    from types import SimpleNamespace
+
+    start = datetime(2030, 1, 1, 14, tzinfo=timezone.utc)
+    rows = [
+        SimpleNamespace(_mapping={"id": f"res_{i}", "accountId": "acc_1", "serviceId": None,
+                                  "seatId": 3, "startTime": start + timedelta(hours=i),
+                                  "endTime": start + timedelta(hours=i + 1), "isRedeemed": False,
+                                  "updatedAt": start})
+        for i in range(3)
+    ]
+    mock_result = MagicMock()
+    mock_result.all.return_value = rows
+    async_session_mock.execute = AsyncMock(return_value=mock_result)
+
+    items, cursor = await ReservationService.list_reservations_page(
+        None, async_session_mock, limit=2, view="compact"
+    )
+    assert [i["id"] for i in items] == ["res_0", "res_1"]
+    assert ReservationService._decode_cursor(cursor) == (start + timedelta(hours=1), "res_1")
+
+    # one flat SELECT: no entities, no relationship loaders
+    async_session_mock.exec.assert_not_called()
+    stmt = async_session_mock.execute.call_args.args[0]
+    assert [c.name for c in stmt.selected_columns] == [
+        "id", "accountId", "serviceId", "seatId", "startTime", "endTime", "isRedeemed", "updatedAt"
+    ]
+    assert not stmt._with_options
+
+    with pytest.raises(ValueError):
+        await ReservationService.list_reservations(None, async_session_mock, view="huge")
+
+@pytest.mark.asyncio
+async def test_create_reservations_bulk_reports_conflicts(async_session_mock):
+    start = datetime(2030, 1, 1, 14, tzinfo=timezone.utc)
+    hour = timedelta(hours=1)
+
+    def booking(account, seat, offset=timedelta(0)):
+        return ReservationCreate(accountId=account, seatId=seat,
+                                 startTime=start + offset, endTime=start + offset + hour)
+
+    rows = [
+        booking("acc_1", 1),
+        booking("acc_2", 2),                      # seat 2 already booked in the DB
+        booking("acc_3", 1, timedelta(minutes=30)),  # overlaps row 0
+        booking("ghost", 3),                      # unknown account
+        booking("acc_1", 1, hour),                # back to back with row 0
+    ]
+
+    def result(items):
+        m = MagicMock()
+        m.all.return_value = items
+        return m
+
+    async_session_mock.exec.side_effect = [
+        result(["acc_1", "acc_2", "acc_3"]),      # known accounts
+        result([1, 2, 3]),                        # known seats
+        result([(2, None, start, start + hour)]), # existing bookings
+        result([]),                               # floor layout for seat events
+    ]
+    async_session_mock.get_bind = MagicMock()
+    async_session_mock.get_bind.return_value.dialect.name = "sqlite"
+
+    async def fake_execute(stmt, params):
+        assert len(params) == 2
+        return result([(p["id"], start, start) for p in params])
+
+    async_session_mock.execute = AsyncMock(side_effect=fake_execute)
+
+    out = await ReservationService.create_reservations(rows, async_session_mock)
+
+    # one multi-row INSERT and a single commit for the whole batch
+    async_session_mock.execute.assert_awaited_once()
+    async_session_mock.commit.assert_awaited_once()
+    async_session_mock.add.assert_not_called()
+    assert [(r.accountId, r.startTime) for r in out.created] == [
+        ("acc_1", start), ("acc_1", start + hour)
+    ]
+    assert [(c.index, c.detail.split()[0]) for c in out.conflicts] == [
+        (1, "Seat"), (2, "Seat"), (3, "Unknown")
+    ]
+
+@pytest.mark.asyncio
+async def test_create_reservations_bulk_rechecks_after_a_cross_month_race(async_session_mock):
+    from sqlalchemy.exc import IntegrityError
+
+    start = datetime(2030, 2, 1, 0, tzinfo=timezone.utc)
+    hour = timedelta(hours=1)
+    rows = [
+        ReservationCreate(accountId="acc_1", seatId=1, startTime=start, endTime=start + hour),
+        ReservationCreate(accountId="acc_1", seatId=2, startTime=start, endTime=start + hour),
+    ]
+
+    def result(items):
+        m = MagicMock()
+        m.all.return_value = items
+        return m
+
+    racer = (1, None, start - hour, start + hour)  # committed in January's partition
+    async_session_mock.exec.side_effect = [
+        result(["acc_1"]), result([1, 2]), result([]),        # first check: clear
+        result(["acc_1"]), result([1, 2]), result([racer]),   # second check
+        result([]),                                           # floor layout for seat events
+    ]
+    async_session_mock.get_bind = MagicMock()
+    async_session_mock.get_bind.return_value.dialect.name = "postgresql"
+    async_session_mock.rollback = AsyncMock()
+
+    # the cross-month trigger raises instead of letting DO NOTHING skip the row
+    orig = Exception('conflicting key value violates exclusion constraint "reservation_seat_no_overlap"')
+    orig.sqlstate = "23P01"
+    inserted = []
+
+    async def fake_execute(stmt, params):
+        inserted.append([p["seatId"] for p in params])
+        if len(inserted) == 1:
+            raise IntegrityError("INSERT INTO reservation ...", {}, orig)
+        return result([(p["id"], start, start) for p in params])
+
+    async_session_mock.execute = AsyncMock(side_effect=fake_execute)
+
+    out = await ReservationService.create_reservations(rows, async_session_mock)
+
+    assert inserted == [[1, 2], [2]]
+    async_session_mock.rollback.assert_awaited_once()
+    async_session_mock.commit.assert_awaited_once()
+    assert [r.seatId for r in out.created] == [2]
+    assert [(c.index, c.detail.split()[0]) for c in out.conflicts] == [(0, "Seat")]
+
+@pytest.mark.asyncio
+async def test_update_reservation_redeem(async_session_mock):
+    start = datetime(2030, 1, 1, 14, tzinfo=timezone.utc)
+    updated = Reservation(id="res_1", accountId="acc_1", startTime=start,
+                          endTime=start + timedelta(hours=1), isRedeemed=True)
+
+    # the old seat/time/service snapshot, then the row returned by UPDATE ... RETURNING;
+    # the service is unchanged, so the item_stock counters are not touched
+    snapshot = MagicMock()
+    snapshot.first.return_value = ("res_1", None, "acc_1", start, start + timedelta(hours=1), None)
+    returned = MagicMock()
+    returned.first.return_value = (updated,)
+    async_session_mock.exec.side_effect = [snapshot, returned]
     
     async_session_mock.add = MagicMock()
     async_session_mock.commit = AsyncMock()
@@ -62,16 +230,24 @@ async def test_update_reservation_redeem(async_session_mock):
     update_data = ReservationUpdate(isRedeemed=True)
     result = await ReservationService.update_reservation("res_1", update_data, async_session_mock)
     
-    assert result is not None
+    assert result is updated
     assert result.isRedeemed is True
+    # the snapshot row stays locked until the ledger delta is committed
+    assert str(async_session_mock.exec.await_args_list[0].args[0]).endswith("FOR UPDATE")
+    stmt = async_session_mock.exec.await_args_list[1].args[0]
+    assert str(stmt).startswith('UPDATE reservation SET "isRedeemed"=')
+    assert "RETURNING" in str(stmt)
+    async_session_mock.add.assert_not_called()
+    async_session_mock.refresh.assert_not_called()
     async_session_mock.commit.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_delete_reservation(async_session_mock):
     mock_res_obj = Reservation(id="res_1")
     
+    # DELETE ... RETURNING hands back the removed row
     mock_result = MagicMock()
-    mock_result.first.return_value = mock_res_obj
+    mock_result.first.return_value = (mock_res_obj,)
     
     # Override side_effect
     async_session_mock.exec.side_effect = AsyncMock(return_value=mock_result)
@@ -82,5 +258,47 @@ async def test_delete_reservation(async_session_mock):
     result = await ReservationService.delete_reservation("res_1", async_session_mock)
     
     assert result is True
-    async_session_mock.delete.assert_called_once_with(mock_res_obj)
+    assert str(async_session_mock.exec.await_args.args[0]).startswith("DELETE FROM reservation")
+    async_session_mock.delete.assert_not_called()
     async_session_mock.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_list_changes_pages_by_updated_at_with_tombstones(async_session_mock):
+    from fastapi import HTTPException
+
+    since = datetime.now(timezone.utc) - timedelta(hours=1)
+    stamp = since + timedelta(minutes=5)
+    # three rows written by one statement share a timestamp
+    rows = [
+        Reservation(id=f"res_{i}", accountId="acc_1", startTime=stamp, endTime=stamp + timedelta(hours=1),
+                    updatedAt=stamp)
+        for i in range(3)
+    ]
+    mock_result = MagicMock()
+    mock_result.all.return_value = rows
+    async_session_mock.exec.side_effect = AsyncMock(return_value=mock_result)
+    tombstones = MagicMock()
+    tombstones.all.return_value = [("res_gone", since + timedelta(minutes=1))]
+    async_session_mock.execute = AsyncMock(return_value=tombstones)
+
+    changes, deleted, cursor, has_more = await ReservationService.list_changes(
+        since, async_session_mock, limit=2
+    )
+    assert [r.id for r in changes] == ["res_0", "res_1"]
+    assert deleted == ["res_gone"] and has_more
+    # resumes after the last row handed out, not after its timestamp
+    assert ReservationService._decode_cursor(cursor) == (stamp, "res_1")
+    # deletes past the page end wait for the page that reaches them
+    assert '"deletedAt" <=' in str(async_session_mock.execute.call_args.args[0])
+    # writes younger than the settle lag may still be committing: held back
+    row_sql = str(async_session_mock.exec.call_args.args[0])
+    assert 'reservation."updatedAt" < now() - :param_' in row_sql
+    tomb_sql = str(async_session_mock.execute.call_args.args[0])
+    assert 'reservation_tombstone."deletedAt" < now() - :param_' in tomb_sql
+
+    with pytest.raises(ValueError):
+        await ReservationService.list_changes(None, async_session_mock)
+    with pytest.raises(HTTPException) as exc:
+        await ReservationService.list_changes(since - timedelta(days=31), async_session_mock)
+    assert exc.value.status_code == 410
@@ -0,0 +1,54 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.db import get_session
+from app.main import app
+from app.models import Reservation
+from app.services.reservation import DEFAULT_PAGE_SIZE
+
+START = datetime(2030, 1, 1, 14, tzinfo=timezone.utc)
+ROW = Reservation(id="res_1", accountId="acc_1", startTime=START,
+                  endTime=START + timedelta(hours=1), createdAt=START, updatedAt=START)
+
+
+@pytest.fixture
+def client():
+    async def no_session():
+        yield None
+
+    app.dependency_overrides[get_session] = no_session
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_session, None)
+
+
+def test_list_without_paging_params_is_a_bare_list(client):
+    with patch(
+        "app.services.ReservationService.list_reservations", AsyncMock(return_value=[ROW])
+    ) as listed, patch("app.services.ReservationService.list_reservations_page") as paged:
+        body = client.get("/reservation/", params={"accountId": "acc_1"}).json()
+        compact = client.get("/reservation/", params={"view": "compact"}).json()
+    # the pre-paging contract: every match, no {items, next_cursor} wrapper
+    assert isinstance(body, list) and [r["id"] for r in body] == ["res_1"]
+    assert body[0]["account"] is None and "createdAt" in body[0]
+    assert isinstance(compact, list) and "createdAt" not in compact[0]
+    assert listed.await_args_list[0].args[0]["accountId"] == "acc_1"
+    assert listed.await_args.kwargs["view"] == "compact"
+    paged.assert_not_called()
+
+
+def test_limit_or_cursor_returns_one_page(client):
+    page = AsyncMock(return_value=([ROW], "next"))
+    with patch("app.services.ReservationService.list_reservations_page", page):
+        body = client.get("/reservation/", params={"limit": 1}).json()
+        assert body["next_cursor"] == "next" and [r["id"] for r in body["items"]] == ["res_1"]
+        assert page.await_args.kwargs["limit"] == 1
+
+        body = client.get("/reservation/", params={"cursor": "next", "view": "compact"}).json()
+        assert set(body) == {"items", "next_cursor"}
+        assert page.await_args.kwargs["cursor"] == "next"
+        assert page.await_args.kwargs["limit"] == DEFAULT_PAGE_SIZE
+
+    assert client.get("/reservation/", params={"limit": 0}).status_code == 422
@@ -8,6 +8,7 @@ from app.models.service import ServiceCreate
 class DummyResult:
     def __init__(self, items):
         self._items = items
+        self.rowcount = len(items)
 
     def all(self):
         return self._items
@@ -41,12 +42,12 @@ async def test_list_and_create_and_get_update_delete_service():
     got = await ServiceService.get_service("no-id", session=session)
     assert got is None
 
-    # simulate existing service for update/delete
+    # simulate existing service for update/delete: UPDATE/DELETE ... RETURNING rows
     fake_svc = MagicMock()
     fake_svc.id = "svc-1"
-    fake_svc.name = "Old"
+    fake_svc.name = "New"
     fake_svc.eiltRate = 1.0
-    session.exec.return_value = DummyResult([fake_svc])
+    session.exec.return_value = DummyResult([(fake_svc,)])
 
     # update_service
     class _Upd:
@@ -58,7 +59,7 @@ async def test_list_and_create_and_get_update_delete_service():
     assert getattr(updated, "name") == "New"
 
     # delete_service returns True when found
-    session.exec.return_value = DummyResult([fake_svc])
+    session.exec.return_value = DummyResult([(fake_svc,)])
     ok = await ServiceService.delete_service("svc-1", session=session)
     assert ok is True
 
@@ -67,3 +68,132 @@ async def test_list_and_create_and_get_update_delete_service():
     ok2 = await ServiceService.delete_service("missing", session=session)
     assert ok2 is False
 
+
+@pytest.mark.asyncio
+async def test_delete_service_drops_cached_reservation_reads():
+    from datetime import date
+    from app.services.reservation_cache import reservation_cache
+
+    session = MagicMock()
+    session.exec = AsyncMock()
+    session.commit = AsyncMock()
+    day = date(2030, 1, 1)
+    reservation_cache.put(("list", day), (day,), ["cached row"], reservation_cache.generation)
+
+    # the UPDATE detaches one booking; the DELETE ... RETURNING finds the service
+    session.exec.side_effect = [DummyResult([1]), MagicMock(), DummyResult([(MagicMock(),)])]
+    assert await ServiceService.delete_service("svc-1", session=session) is True
+    # the cached day still showed the booking's serviceId
+    assert reservation_cache.get(("list", day)) is None
+
+
+@pytest.mark.asyncio
+async def test_available_time_slots_batch_single_reservation_query():
+    from datetime import datetime, timedelta, timezone
+    from app.services.banquet import BanquetService
+
+    d = datetime.now(timezone.utc).date() + timedelta(days=3)
+    windows = BanquetService._slot_windows(d)
+    first_start = windows[0][1]
+
+    session = MagicMock()
+    session.exec = AsyncMock(side_effect=[
+        DummyResult(["svc-a", "svc-b"]),
+        DummyResult([("svc-a", first_start, first_start + timedelta(hours=1))]),
+    ])
+    slots = await ServiceService.get_available_time_slots_batch(d.isoformat(), session)
+    assert slots == {
+        "svc-a": [w[0] for w in windows[1:]],
+        "svc-b": [w[0] for w in windows],
+    }
+    # one query for the services, one for the day's bookings of all of them
+    assert session.exec.await_count == 2
+
+    # the single-service endpoint goes through the same path
+    session.exec = AsyncMock(side_effect=[DummyResult([])])
+    assert await ServiceService.get_available_time_slots("svc-b", d.isoformat(), session) == [
+        w[0] for w in windows
+    ]
+    assert session.exec.await_count == 1
+
+    # past dates need no query at all
+    session.exec = AsyncMock()
+    past = (d - timedelta(days=10)).isoformat()
+    assert await ServiceService.get_available_time_slots_batch(past, session, ["svc-a"]) == {
+        "svc-a": []
+    }
+    session.exec.assert_not_awaited()
+
+    with pytest.raises(ValueError):
+        await ServiceService.get_available_time_slots_batch("not-a-date", session)
+
+
+@pytest.mark.asyncio
+async def test_check_availability_batch_is_one_query_over_the_stock_ledger():
+    session = MagicMock()
+    session.exec = AsyncMock(return_value=DummyResult([
+        # serviceId, itemId, item name, required per booking, available stock
+        ("svc-a", 1, "Towel", 2, 5),
+        ("svc-a", 2, "Soap", 3, 1),
+        ("svc-b", None, None, None, None),  # a service that needs nothing
+        ("svc-c", 9, None, 1, 4),  # intake pointing at a vanished item
+    ]))
+    report = await ServiceService.check_availability_batch(session)
+
+    assert report["svc-a"]["isAvailable"] is False
+    assert report["svc-a"]["insufficientItems"] == [
+        {"itemId": 2, "itemName": "Soap", "requiredQuantity": 3, "availableQuantity": 1}
+    ]
+    assert report["svc-a"]["message"] == "1 item(s) have insufficient stock"
+    assert report["svc-b"] == {
+        "isAvailable": True, "insufficientItems": [], "message": "All items are in stock"
+    }
+    assert report["svc-c"]["insufficientItems"][0]["itemName"] == "Unknown Item 9"
+    assert session.exec.await_count == 1
+    sql = str(session.exec.await_args.args[0])
+    # stock comes from the item_stock counters, not from summing orders and bookings
+    assert "LEFT OUTER JOIN item_stock" in sql and "reservation" not in sql
+
+    # a single service goes through the same query; unknown ids give None
+    session.exec = AsyncMock(return_value=DummyResult([]))
+    assert await ServiceService.check_availability("missing", session) is None
+
+
+@pytest.mark.asyncio
+async def test_today_reservations_per_service_counts_in_sql():
+    from app.models.service import Service
+
+    busy = Service(id="svc-a", name="Spa", eiltRate=2.0)
+    idle = Service(id="svc-b", name="Tour", eiltRate=1.0)
+    session = MagicMock()
+    session.exec = AsyncMock(return_value=DummyResult([(busy, 3), (idle, 0)]))
+
+    out = await ServiceService.today_reservations_per_service(session)
+    assert [(o.service.id, o.reservations_count) for o in out] == [("svc-a", 3), ("svc-b", 0)]
+    assert out[0].service.name == "Spa"
+    # one grouped query; no reservation rows are loaded
+    assert session.exec.await_count == 1
+    sql = str(session.exec.await_args.args[0])
+    assert "LEFT OUTER JOIN reservation" in sql and "GROUP BY service.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_search_services_is_ranked_limited_and_slim():
+    from sqlalchemy.dialects import postgresql
+
+    session = MagicMock()
+    session.exec = AsyncMock(return_value=DummyResult([("svc-a", "Spa Day", 2.0, None)]))
+    session.get_bind.return_value.dialect = postgresql.dialect()
+
+    out = await ServiceService.search_services("  SPA_ ", session, limit=500)
+    assert [(m.id, m.name) for m in out] == [("svc-a", "Spa Day")]
+    stmt = session.exec.await_args.args[0]
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    sql, params = str(compiled), list(compiled.params.values())
+    # lowercased, wildcards escaped, ranked by match position, no full rows
+    assert "%spa\\_%" in params and "spa_" in params and 50 in params
+    assert "ORDER BY strpos(lower(service.name)" in sql
+    assert "LIMIT" in sql and "service.description" not in sql
+    session.exec.reset_mock()
+    assert await ServiceService.search_services("   ", session) == []
+    session.exec.assert_not_awaited()
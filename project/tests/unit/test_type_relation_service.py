@@ -61,3 +61,51 @@ async def test_list_create_get_update_delete_and_relation_between():
 
     d = await TypeRelationService.delete_type_relation(1, session=session)
     assert d is False
+
+
+@pytest.mark.asyncio
+async def test_compatibility_matrix_lookup_and_invalidation():
+    from app.services.type_relation import CompatibilityMatrix, compatibility_matrix
+
+    session = MagicMock()
+    session.exec = AsyncMock()
+    session.exec.return_value = DummyResult(
+        [
+            MagicMock(source_type_id="1", target_type_id="2", relation="forbidden"),
+            MagicMock(source_type_id="3", target_type_id="1", relation="separation"),
+            MagicMock(source_type_id="2", target_type_id="1", relation="allow"),
+        ]
+    )
+
+    matrix = CompatibilityMatrix()
+    await matrix.ensure_loaded(session)
+    # direct row wins over the inverse one
+    assert matrix.relation("1", "2") == "forbidden"
+    assert matrix.relation("2", "1") == "allow"
+    # inverse lookup and unknown pairs
+    assert matrix.relation("1", "3") == "separation"
+    assert matrix.relation("2", "3") == "allow"
+    assert matrix.relation("9", "1") == "allow"
+
+    # further lookups never hit the DB
+    await matrix.ensure_loaded(session)
+    assert session.exec.await_count == 1
+    assert matrix.stats()["hits"] == 5
+    assert matrix.stats()["reloads"] == 1
+
+    matrix.invalidate()
+    await matrix.ensure_loaded(session)
+    assert matrix.stats()["reloads"] == 2
+
+    # writes through the service invalidate the shared matrix
+    class In:
+        def dict(self):
+            return {"source_type_id": "a", "target_type_id": "b", "relation": "allow"}
+
+    session.add = MagicMock()
+    session.commit = AsyncMock()
+    session.refresh = AsyncMock()
+    await compatibility_matrix.ensure_loaded(session)
+    assert compatibility_matrix.loaded
+    await TypeRelationService.create_type_relation(In(), session=session)
+    assert not compatibility_matrix.loaded